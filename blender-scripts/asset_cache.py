@@ -0,0 +1,369 @@
+"""
+Content-addressed cache for generated GLBs
+Key = SHA-256 of the script source (plus the sibling modules it imports), the bytes of
+every input model and the normalized arguments. A hit copies the stored GLB to the
+requested output without starting Blender (and records it in asset_catalog.py).
+Runs under plain Python
+Usage:
+  python asset_cache.py run --script generate_tree -- --type oak --seed 42 --output oak.glb
+  python asset_cache.py stats
+  python asset_cache.py clear
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import lod_chain
+import script_defaults
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'BLENDER_CACHE_DIR',
+    os.path.join(os.path.dirname(jobs.SCRIPTS_DIR), '.cache', 'blender-assets')
+)
+
+# Arguments naming input files - their content is hashed, not their path
+INPUT_ARGS = {'models', 'input', 'batch'}
+# Input arguments that may hold their value inline (JSON) instead - inline values are key args
+INLINE_INPUT_ARGS = {'batch'}
+# Arguments naming output files - stored in the cache entry, not part of the key
+OUTPUT_ARGS = ('output', 'base-output')
+# Instrumentation (stage_log.py) and catalog (asset_catalog.py) arguments - they do not change the output
+IGNORED_ARGS = {'job-id', 'stage-log', 'profile-dir', 'entity-id'}
+# Values equal to these are dropped, so "--rescale 1.0" and no --rescale share a key
+NEUTRAL_DEFAULTS = {
+    'color-replacements': [],
+    'material-replacements': [],
+    'additional-hue-shift': 0,
+    'rescale': 1,
+    'recolor': {},
+    'asset-class': script_defaults.DEFAULT_ASSET_CLASS,
+    'material-tolerance': script_defaults.MERGE_TOLERANCE,
+    'variants': 1,
+    'scatter': 0,
+    'lod-ratios': lod_chain.DEFAULT_RATIOS,
+    'lod-coverage': lod_chain.DEFAULT_COVERAGE,
+}
+
+# Index written next to variant libraries (variant_library.INDEX_SUFFIX)
+VARIANT_INDEX_SUFFIX = '.variants.json'
+
+# Suffix of a variant file exported on its own (template_models.separate_path)
+VARIANT_FILE_RE = re.compile(r'_v\d+\.glb$')
+
+IMPORT_RE = re.compile(r'^\s*(?:import|from)\s+(\w+)', re.MULTILINE)
+# Data directories read by a module - their files are part of the key like its source
+DATA_DIRS = {'part_templates': 'templates'}
+
+def separate_files(index_path):
+    """Variant files listed in an index (--separate exports), empty for packed libraries"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            variants = json.load(f).get('variants', [])
+    except (OSError, json.JSONDecodeError):
+        return []
+    directory = os.path.dirname(index_path)
+    return [os.path.join(directory, record['file']) for record in variants if 'file' in record]
+
+def companion_files(output_path):
+    """Files written next to an output: its LOD chain, variant index and separate variant files"""
+    files = lod_chain.chain_files(output_path)
+    index = os.path.splitext(output_path)[0] + VARIANT_INDEX_SUFFIX
+    if os.path.exists(index):
+        # Variant files first, the index is the last file a separate export writes
+        files.extend(path for path in separate_files(index) if os.path.exists(path))
+        files.append(index)
+    return files
+
+def retarget_companions(output_path):
+    """Point copied manifests (LOD chain, variant index) at the files next to output_path"""
+    if os.path.exists(lod_chain.manifest_path(output_path)):
+        lod_chain.retarget_manifest(lod_chain.manifest_path(output_path), output_path)
+    index = os.path.splitext(output_path)[0] + VARIANT_INDEX_SUFFIX
+    if not os.path.exists(index):
+        return
+    with open(index, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    stem, ext = os.path.splitext(os.path.basename(output_path))
+    for record in data.get('variants', []):
+        if 'file' in record:
+            # template_models.separate_path naming
+            record['file'] = f"{stem}_v{record['index']}{ext}"
+    with open(index, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+def hash_file(path, digest=None):
+    """Stream a file into a SHA-256 digest"""
+    digest = digest or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest
+
+def script_sources(script):
+    """Script file plus every blender-scripts module it imports (and their data files), recursively"""
+    seen = []
+    pending = [os.path.splitext(os.path.basename(script))[0]]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(jobs.SCRIPTS_DIR, f"{name}.py")
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.append(name)
+        with open(path, 'r', encoding='utf-8') as f:
+            pending.extend(IMPORT_RE.findall(f.read()))
+    sources = [os.path.join(jobs.SCRIPTS_DIR, f"{name}.py") for name in sorted(seen)]
+    for name in sorted(set(seen) & set(DATA_DIRS)):
+        for dirpath, _, filenames in sorted(os.walk(os.path.join(jobs.SCRIPTS_DIR, DATA_DIRS[name]))):
+            sources.extend(os.path.join(dirpath, filename) for filename in sorted(filenames))
+    return sources
+
+def argv_to_dict(argv):
+    """Parse "--flag value" pairs back into a dict (bare flags become True)"""
+    args = {}
+    key = None
+    for item in argv:
+        if item.startswith('--'):
+            key = item[2:].replace('_', '-')
+            args[key] = True
+        elif key is not None:
+            args[key] = item
+            key = None
+    return args
+
+def normalize_value(value):
+    """Decode JSON/number strings and round floats so equal inputs hash equally"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), 6)
+    if isinstance(value, list):
+        return [normalize_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: normalize_value(v) for k, v in value.items()}
+    return value
+
+def normalize_args(args, script=None):
+    """
+    Job args (dict or argv list) → (key args, input paths, output paths)
+    script: drops that script's parser defaults too (script_defaults.SCRIPT_DEFAULTS)
+    """
+    if isinstance(args, (list, tuple)):
+        args = argv_to_dict(args)
+    else:
+        args = argv_to_dict(jobs.job_to_argv(args))
+    defaults = dict(NEUTRAL_DEFAULTS)
+    if script:
+        defaults.update(script_defaults.SCRIPT_DEFAULTS.get(os.path.splitext(os.path.basename(script))[0], {}))
+
+    key_args, inputs, outputs = {}, [], {}
+    for name, value in args.items():
+        if name in IGNORED_ARGS:
+            continue
+        if name in OUTPUT_ARGS:
+            outputs[name] = value
+        elif name in INLINE_INPUT_ARGS and not os.path.isfile(str(value)):
+            key_args[name] = normalize_value(value)
+        elif name in INPUT_ARGS:
+            paths = [p for p in str(value).split(',') if p and p != 'none']
+            inputs.extend(paths)
+            key_args[name] = len(paths)
+        else:
+            value = normalize_value(value)
+            if name in defaults and value == normalize_value(defaults[name]):
+                continue
+            key_args[name] = value
+    return key_args, inputs, outputs
+
+class AssetCache:
+    """GLB store keyed by job content, with hit/miss statistics"""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def job_key(self, script, args):
+        """Cache key for running script with args"""
+        key_args, inputs, _ = normalize_args(args, script)
+        digest = hashlib.sha256()
+        for path in script_sources(script):
+            digest.update(os.path.relpath(path, jobs.SCRIPTS_DIR).encode('utf-8'))
+            hash_file(path, digest)
+        for path in inputs:
+            # Order matters - models are joined in argument order
+            digest.update(hash_file(path).digest())
+        digest.update(json.dumps(key_args, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def companions(self, entry, name):
+        """Stored companion files of one output as {suffix: path}"""
+        pattern = re.compile(rf"{re.escape(name)}(_lod\d+\.glb|_v\d+\.glb|\.lod\.json|{re.escape(VARIANT_INDEX_SUFFIX)})$")
+        if not os.path.isdir(entry):
+            return {}
+        return {
+            match.group(1): os.path.join(entry, match.group(0))
+            for match in map(pattern.match, os.listdir(entry)) if match
+        }
+
+    def complete(self, entry, name):
+        """True when the entry holds output name: its GLB, or the index and files of a separate export"""
+        if os.path.exists(os.path.join(entry, f"{name}.glb")):
+            return True
+        # The stored index still names the original files, they are stored as <name>_v<i>.glb
+        files = separate_files(os.path.join(entry, name + VARIANT_INDEX_SUFFIX))
+        stored = self.companions(entry, name)
+        matches = [VARIANT_FILE_RE.search(path) for path in files]
+        return bool(files) and all(match and match.group(0) in stored for match in matches)
+
+    def get(self, key, args):
+        """Copy the cached outputs (and their companions) to the paths in args, returns True on a hit"""
+        _, _, outputs = normalize_args(args)
+        entry = self.entry_dir(key)
+        hit = bool(outputs) and all(self.complete(entry, name) for name in outputs)
+        if hit:
+            for name, path in outputs.items():
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                if os.path.exists(os.path.join(entry, f"{name}.glb")):
+                    shutil.copyfile(os.path.join(entry, f"{name}.glb"), path)
+                stem = os.path.splitext(path)[0]
+                for suffix, stored in self.companions(entry, name).items():
+                    shutil.copyfile(stored, stem + suffix)
+                retarget_companions(path)
+
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+
+    def put(self, key, args):
+        """Store the output files written for args, with their companions"""
+        _, _, outputs = normalize_args(args)
+        entry = self.entry_dir(key)
+        os.makedirs(entry, exist_ok=True)
+        for name, path in outputs.items():
+            stem = os.path.splitext(path)[0]
+            # Companions first, the main GLB (or the index of a separate export) marks the entry as complete
+            for companion in companion_files(path):
+                self.store(entry, companion, name + companion[len(stem):])
+            if os.path.exists(path):
+                self.store(entry, path, f"{name}.glb")
+
+    def store(self, entry, path, name):
+        # Copy then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=entry, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, os.path.join(entry, name))
+
+    def stats_path(self):
+        return os.path.join(self.root, 'stats.json')
+
+    def load_stats(self):
+        try:
+            with open(self.stats_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {'hits': 0, 'misses': 0}
+
+    def flush_stats(self):
+        """Add this session's hits/misses to the persisted totals"""
+        with self.lock:
+            stats = self.load_stats()
+            stats['hits'] += self.hits
+            stats['misses'] += self.misses
+            self.hits = self.misses = 0
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.stats_path(), 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=2)
+        return stats
+
+    def stats(self):
+        """Persisted totals plus unflushed session counts, with hit rate and size"""
+        stats = self.load_stats()
+        hits = stats['hits'] + self.hits
+        misses = stats['misses'] + self.misses
+        entries, size = 0, 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.glb'):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(dirpath, filename))
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            'files': entries,
+            'bytes': size,
+        }
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+def run_cached(cache, script, argv, blender_path):
+    """Run one script job through the cache, Blender only starts on a miss"""
+    key = cache.job_key(script, argv)
+    if cache.get(key, argv):
+        print(f"[Cache] Hit {key[:12]} for {script}")
+        # Imported here: asset_catalog imports this module
+        import asset_catalog
+        asset_catalog.record_job(script, argv, source_hash=key)
+        return {'ok': True, 'cached': True, 'key': key}
+
+    print(f"[Cache] Miss {key[:12]} for {script}, running Blender")
+    script_path = os.path.join(jobs.SCRIPTS_DIR, f"{os.path.splitext(script)[0]}.py")
+    completed = subprocess.run(
+        [blender_path, '--background', '--python', script_path, '--', *argv]
+    )
+    if completed.returncode != 0:
+        return {'ok': False, 'cached': False, 'key': key,
+                'error': f"Blender exited with {completed.returncode}"}
+
+    cache.put(key, argv)
+    return {'ok': True, 'cached': False, 'key': key}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['run', 'stats', 'clear'])
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--script', type=str, default=None)
+    parser.add_argument('--blender', type=str, default=os.environ.get('BLENDER_PATH', 'blender'))
+    args = parser.parse_args(sys.argv[1:sys.argv.index('--')] if '--' in sys.argv else sys.argv[1:])
+
+    cache = AssetCache(args.cache_dir)
+
+    if args.command == 'stats':
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == 'clear':
+        cache.clear()
+        print(f"[Cache] Cleared {args.cache_dir}")
+    else:
+        if not args.script:
+            parser.error("run needs --script")
+        result = run_cached(cache, args.script, jobs.script_argv(), args.blender)
+        cache.flush_stats()
+        print(json.dumps(result))
+        sys.exit(0 if result['ok'] else 1)
+
+if __name__ == "__main__":
+    main()
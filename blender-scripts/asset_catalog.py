@@ -0,0 +1,366 @@
+"""
+Asset catalog: one SQLite row per generated GLB (no Blender needed)
+Each row holds the entity (type, id, era), LOD level, variant, export profile,
+compression, source hash (the asset_cache.py job key), triangle/vertex/material
+counts, byte size, AABB and bounding sphere. Stats come from inspect_glb.inspect(),
+so only the JSON chunk of each model is read.
+jobs.py records the outputs of every successful job, asset_cache.py those of cache
+hits; the catalog is then exported to <models root>/catalog.json
+({"columns": [...], "rows": [[...], ...]}) for the game and the TS generator, once per
+job for single runs and once per manifest or pool run otherwise.
+The database is BLENDER_ASSET_CATALOG (default .cache/asset-catalog.sqlite), paths are
+relative to the models root (public/models); outputs outside it are not recorded.
+BLENDER_ASSET_CATALOG=off disables recording, BLENDER_CATALOG_EXPORT=off only the export
+(set for pool workers, their parent exports once for all of them).
+Usage:
+  python asset_catalog.py rebuild [--prune]                 # add every model below the root
+  python asset_catalog.py query --type npc --id 3 [--era 2]
+  python asset_catalog.py export
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import lod_chain
+import inspect_glb
+import asset_cache
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CATALOG = os.environ.get(
+    'BLENDER_ASSET_CATALOG',
+    os.path.join(REPO_DIR, '.cache', 'asset-catalog.sqlite')
+)
+DEFAULT_MODELS_ROOT = os.path.join(REPO_DIR, 'public', 'models')
+EXPORT_NAME = 'catalog.json'
+# Set to "off" in processes whose parent exports the catalog after their jobs
+EXPORT_ENV = 'BLENDER_CATALOG_EXPORT'
+# Written next to variant libraries (variant_library.INDEX_SUFFIX)
+VARIANT_INDEX_SUFFIX = '.variants.json'
+
+# Entity type of scripts that do not take --asset-class
+SCRIPT_TYPES = {
+    'generate_tree': 'tree',
+    'generate_rock': 'rock',
+    'generate_npc': 'npc',
+    'generate_item': 'item',
+}
+# Entity type of models found by a rebuild, from their first directory
+DIRECTORY_TYPES = {'npcs': 'npc', 'items': 'item'}
+
+COLUMNS = (
+    ('path', 'TEXT PRIMARY KEY'),
+    ('entity_type', 'TEXT NOT NULL'),
+    ('entity_id', 'TEXT NOT NULL'),
+    ('era', 'INTEGER NOT NULL DEFAULT 0'),
+    ('lod', 'INTEGER NOT NULL DEFAULT 0'),
+    ('variant', 'INTEGER'),
+    ('profile', 'TEXT'),
+    ('compression', 'TEXT'),
+    ('source_hash', 'TEXT'),
+    ('script', 'TEXT'),
+    ('triangles', 'INTEGER'),
+    ('vertices', 'INTEGER'),
+    ('materials', 'INTEGER'),
+    ('bytes', 'INTEGER'),
+    ('min_x', 'REAL'), ('min_y', 'REAL'), ('min_z', 'REAL'),
+    ('max_x', 'REAL'), ('max_y', 'REAL'), ('max_z', 'REAL'),
+    ('center_x', 'REAL'), ('center_y', 'REAL'), ('center_z', 'REAL'),
+    ('radius', 'REAL'),
+    ('mtime', 'REAL'),
+    ('updated', 'REAL'),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+# Columns left out of catalog.json (build bookkeeping)
+EXPORT_COLUMNS = tuple(name for name in COLUMN_NAMES if name not in ('mtime', 'updated'))
+
+def enabled(catalog_path=DEFAULT_CATALOG):
+    return bool(catalog_path) and catalog_path.lower() != 'off'
+
+def model_key(path, models_root=DEFAULT_MODELS_ROOT):
+    """Path relative to the models root with / separators, None when outside it"""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(models_root))
+    if relative.startswith('..') or os.path.isabs(relative):
+        return None
+    return relative.replace(os.sep, '/')
+
+def bounds_row(bounds):
+    """AABB columns plus the sphere around it"""
+    if not bounds:
+        return {name: None for name in ('min_x', 'min_y', 'min_z', 'max_x', 'max_y', 'max_z',
+                                        'center_x', 'center_y', 'center_z', 'radius')}
+    lo, hi = bounds['min'], bounds['max']
+    center = [(a + b) / 2 for a, b in zip(lo, hi)]
+    radius = sum((b - a) ** 2 for a, b in zip(lo, hi)) ** 0.5 / 2
+    row = dict(zip(('min_x', 'min_y', 'min_z'), lo))
+    row.update(zip(('max_x', 'max_y', 'max_z'), hi))
+    row.update(zip(('center_x', 'center_y', 'center_z'), (round(c, 4) for c in center)))
+    row['radius'] = round(radius, 4)
+    return row
+
+class AssetCatalog:
+    """SQLite catalog of the models below one root"""
+
+    def __init__(self, path=DEFAULT_CATALOG, models_root=DEFAULT_MODELS_ROOT):
+        self.path = path
+        self.models_root = models_root
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Pool workers update the catalog concurrently - wait for the write lock
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        columns = ', '.join(f"{name} {kind}" for name, kind in COLUMNS)
+        with self.db:
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS assets ({columns})")
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS assets_entity ON assets (entity_type, entity_id, era, lod)"
+            )
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, path, entity_type, entity_id, era=0, lod=0, variant=None, profile=None,
+               source_hash=None, script=None):
+        """Insert or replace the row of one model file, returns the row (None when not catalogued)"""
+        key = model_key(path, self.models_root)
+        if key is None or not os.path.exists(path):
+            return None
+        stats = inspect_glb.inspect(path)
+        if 'error' in stats:
+            print(f"[Catalog] Skipping {key}: {stats['error']}")
+            return None
+        row = {
+            'path': key,
+            'entity_type': str(entity_type),
+            'entity_id': str(entity_id),
+            'era': int(era or 0),
+            'lod': int(lod),
+            'variant': variant,
+            'profile': profile,
+            'compression': ','.join(stats['compression']) or None,
+            'source_hash': source_hash,
+            'script': script,
+            'triangles': stats['triangles'],
+            'vertices': stats['vertices'],
+            'materials': stats['materials'],
+            'bytes': stats['bytes'],
+            **bounds_row(stats['bounds']),
+            'mtime': os.path.getmtime(path),
+            'updated': time.time(),
+        }
+        with self.db:
+            self.db.execute(
+                f"INSERT OR REPLACE INTO assets ({', '.join(COLUMN_NAMES)}) "
+                f"VALUES ({', '.join('?' * len(COLUMN_NAMES))})",
+                [row[name] for name in COLUMN_NAMES]
+            )
+        return row
+
+    def find(self, entity_type=None, entity_id=None, era=None, lod=None):
+        """Rows matching the given fields, smallest era/lod/variant first"""
+        filters = {'entity_type': entity_type, 'entity_id': entity_id, 'era': era, 'lod': lod}
+        where = [(f"{name} = ?", str(value) if name == 'entity_id' else value)
+                 for name, value in filters.items() if value is not None]
+        query = "SELECT * FROM assets"
+        if where:
+            query += " WHERE " + " AND ".join(clause for clause, _ in where)
+        query += " ORDER BY entity_type, entity_id, era, lod, variant, path"
+        return [dict(row) for row in self.db.execute(query, [value for _, value in where])]
+
+    def has(self, entity_type, entity_id, era=0):
+        """True when a base (LOD0) model of the entity exists at that era"""
+        return bool(self.find(entity_type, entity_id, era, lod=0))
+
+    def remove(self, keys):
+        with self.db:
+            self.db.executemany("DELETE FROM assets WHERE path = ?", [(key,) for key in keys])
+
+    def prune(self):
+        """Drop rows whose file is gone, returns their paths"""
+        missing = [
+            row['path'] for row in self.db.execute("SELECT path FROM assets")
+            if not os.path.exists(os.path.join(self.models_root, row['path']))
+        ]
+        self.remove(missing)
+        return missing
+
+    def export(self, output=None):
+        """Write the compact column/row JSON the game loads, returns its path"""
+        output = output or os.path.join(self.models_root, EXPORT_NAME)
+        rows = self.db.execute(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM assets ORDER BY path")
+        data = {
+            'version': 1,
+            'generated': round(time.time(), 3),
+            'columns': list(EXPORT_COLUMNS),
+            'rows': [list(row) for row in rows],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        # Readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output)), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, output)
+        return output
+
+def option_values(args):
+    """Job arguments (argparse namespace, dict or argv list) → {name_with_underscores: value}"""
+    if isinstance(args, argparse.Namespace):
+        return vars(args)
+    if isinstance(args, (list, tuple)):
+        values, key = {}, None
+        for item in args:
+            if str(item).startswith('--'):
+                key = item[2:].replace('-', '_')
+                values[key] = True
+            elif key is not None:
+                values[key] = item
+                key = None
+        return values
+    return {key.replace('-', '_'): value for key, value in (args or {}).items()}
+
+def entity_of(script, values, path):
+    """(entity type, entity id) of a job output"""
+    entity_type = values.get('asset_class') or SCRIPT_TYPES.get(script) or 'model'
+    entity_id = values.get('entity_id') or values.get('type') or os.path.splitext(os.path.basename(path))[0]
+    return entity_type, entity_id
+
+def output_files(path):
+    """
+    (file, lod, variant, entity id or None) of everything one output wrote: the GLB and
+    its LOD levels, or the variant files its index lists (--separate exports)
+    """
+    stem = path[:-len(VARIANT_INDEX_SUFFIX)] if path.endswith(VARIANT_INDEX_SUFFIX) else os.path.splitext(path)[0]
+    index = stem + VARIANT_INDEX_SUFFIX
+    files = []
+    if os.path.exists(index):
+        with open(index, 'r', encoding='utf-8') as f:
+            variants = json.load(f).get('variants', [])
+        directory = os.path.dirname(path)
+        files.extend(
+            (os.path.join(directory, record['file']), 0, record['index'], record.get('template'))
+            for record in variants if 'file' in record
+        )
+    if path.endswith(VARIANT_INDEX_SUFFIX):
+        return files
+
+    files.append((path, 0, None, None))
+    manifest = lod_chain.manifest_path(path)
+    if os.path.exists(manifest):
+        with open(manifest, 'r', encoding='utf-8') as f:
+            levels = json.load(f)['levels']
+        files.extend((lod_chain.level_path(path, record['level']), record['level'], None, None)
+                     for record in levels if record['level'] > 0)
+    return files
+
+def job_hash(script, args):
+    """asset_cache.py key of a job given as a dict or argv (None for a parsed namespace)"""
+    if isinstance(args, argparse.Namespace):
+        return None
+    try:
+        return asset_cache.AssetCache().job_key(script, args)
+    except OSError:
+        # An input model was removed after the run
+        return None
+
+def record_job(script, args, source_hash=None, catalog_path=DEFAULT_CATALOG, models_root=DEFAULT_MODELS_ROOT,
+               export=None):
+    """
+    Catalog every file a finished job wrote below the models root and re-export catalog.json
+    args: the job arguments (namespace, dict or argv)
+    source_hash: the job's asset_cache key when the caller has it, else it is computed here
+    export: False leaves catalog.json to a later export_catalog() (batches), the default
+    exports unless BLENDER_CATALOG_EXPORT=off
+    Returns the recorded rows
+    """
+    if not enabled(catalog_path):
+        return []
+    script = os.path.splitext(os.path.basename(script))[0]
+    values = option_values(args)
+    outputs = [(values.get('output'), values.get('era', 0)), (values.get('base_output'), 0)]
+    outputs = [(str(path), era) for path, era in outputs if path and path is not True]
+    if not any(model_key(path, models_root) for path, _ in outputs):
+        return []
+
+    source_hash = source_hash or job_hash(script, args)
+    rows = []
+    with AssetCatalog(catalog_path, models_root) as catalog:
+        for output, era in outputs:
+            entity_type, entity_id = entity_of(script, values, output)
+            for path, lod, variant, template in output_files(output):
+                row = catalog.record(path, entity_type, template or entity_id, era=era, lod=lod, variant=variant,
+                                     profile=values.get('export_profile'), source_hash=source_hash, script=script)
+                if row:
+                    rows.append(row)
+        if rows and (export if export is not None else os.environ.get(EXPORT_ENV, '').lower() != 'off'):
+            catalog.export()
+    return rows
+
+def export_catalog(catalog_path=DEFAULT_CATALOG, models_root=DEFAULT_MODELS_ROOT):
+    """Export catalog.json once after a batch of record_job(export=False), returns its path (None when off)"""
+    if not enabled(catalog_path) or not os.path.exists(catalog_path):
+        return None
+    with AssetCatalog(catalog_path, models_root) as catalog:
+        return catalog.export()
+
+def rebuild(catalog, prune=False):
+    """
+    Catalog every model below the root: rows of unchanged files are kept (with their
+    entity and source hash), new or changed files are inspected and typed by directory
+    """
+    known = {row['path']: row for row in catalog.find()}
+    recorded = 0
+    for path in inspect_glb.model_files([catalog.models_root]):
+        key = model_key(path, catalog.models_root)
+        row = known.get(key)
+        if row and row['mtime'] == os.path.getmtime(path):
+            continue
+        if row:
+            entity = {name: row[name] for name in ('entity_type', 'entity_id', 'era', 'lod', 'variant',
+                                                     'profile', 'source_hash', 'script')}
+        else:
+            parts = key.split('/')
+            entity = {
+                'entity_type': DIRECTORY_TYPES.get(parts[0], 'model') if len(parts) > 1 else 'model',
+                'entity_id': os.path.splitext(parts[-1])[0],
+            }
+        if catalog.record(path, **entity):
+            recorded += 1
+    removed = catalog.prune() if prune else []
+    return recorded, removed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['rebuild', 'query', 'export'])
+    parser.add_argument('--catalog', type=str, default=DEFAULT_CATALOG)
+    parser.add_argument('--models-root', type=str, default=DEFAULT_MODELS_ROOT)
+    parser.add_argument('--prune', action='store_true', help='rebuild: drop rows of deleted files')
+    parser.add_argument('--type', type=str, default=None)
+    parser.add_argument('--id', type=str, default=None)
+    parser.add_argument('--era', type=int, default=None)
+    parser.add_argument('--lod', type=int, default=None)
+    args = parser.parse_args()
+
+    with AssetCatalog(args.catalog, args.models_root) as catalog:
+        if args.command == 'rebuild':
+            start = time.perf_counter()
+            recorded, removed = rebuild(catalog, args.prune)
+            output = catalog.export()
+            print(f"[Catalog] {recorded} models recorded, {len(removed)} removed in "
+                  f"{time.perf_counter() - start:.2f}s, exported {output}")
+        elif args.command == 'query':
+            print(json.dumps(catalog.find(args.type, args.id, args.era, args.lod), indent=2))
+        else:
+            print(f"[Catalog] Exported {catalog.export()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Blender Pipeline Benchmark
+Times each pipeline stage (import, recolor, hue shift, join, material merge, materials, subdivision,
+effects, export) per fixture and era, hybrid_modify --reexport and glb_transform per fixture,
+plus generate_tree per tree type, and records wall time, peak memory, geometry counts and
+output size as JSON
+Usage:
+  blender --background --python benchmark.py -- [--fixtures "public/models/*.glb"] [--synthetic 3,5,6] [--eras 0,6,9,12] [--repeat 3] --output bench.json
+  python benchmark.py --compare baseline.json bench.json [--threshold 0.1]   (no Blender needed)
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+try:
+    import bpy
+except ImportError:
+    # --compare runs under plain Python
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+from stage_log import StageLog
+
+REPO_ROOT = os.path.dirname(jobs.SCRIPTS_DIR)
+DEFAULT_FIXTURES = os.path.join(REPO_ROOT, 'public', 'models', '*.glb')
+DEFAULT_ERAS = '0,6,9,12'
+DEFAULT_SYNTHETIC = '3,5,6'
+# RS palette IDs swapped during the recolor stage (typical NPC outfit size)
+BENCH_REPLACEMENTS = [[6798 + i * 131, 43072 + i * 17] for i in range(12)]
+# hybrid_modify --recolor of the hybrid stages
+BENCH_RECOLOR = {'from': 'auto', 'to': 'hue:30'}
+
+def evaluated_counts(objects):
+    """Vertex/face counts after modifiers (forces subdivision to be computed)"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    vertices = faces = 0
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        vertices += len(mesh.vertices)
+        faces += len(mesh.polygons)
+        evaluated.to_mesh_clear()
+    return {'vertices': vertices, 'faces': faces}
+
+def stage_timer(fixture, era):
+    """Stage log that keeps the records in memory, tagged with fixture and era"""
+    return StageLog(f"{fixture}@{era}", 'benchmark', extra={'fixture': fixture, 'era': era})
+
+def build_synthetic(subdivisions):
+    """Icosphere with per-face colors from the bench palette and four materials"""
+    import numpy as np
+    from primitives import icosphere
+    from mesh_build import mesh_from_arrays, object_from_mesh, flat_material
+    from rs_palette import rs_colors_to_rgb
+
+    sphere = icosphere(subdivisions)
+    face_count = len(sphere.indices)
+    rng = np.random.default_rng(subdivisions)
+    ids = np.array([pair[0] for pair in BENCH_REPLACEMENTS] + [127, 960, 22464, 33000])
+    face_colors = rs_colors_to_rgb(ids[rng.integers(0, len(ids), face_count)])
+
+    mesh = mesh_from_arrays(f"Synthetic_{subdivisions}", sphere.positions, sphere.indices, sphere.uvs,
+                            face_colors=face_colors, material_indices=rng.integers(0, 4, face_count))
+    materials = [flat_material(f"Synthetic_{i}", rs_colors_to_rgb(ids[i])) for i in range(4)]
+    return [object_from_mesh(mesh.name, mesh, materials)]
+
+def bench_pipeline(fixture, era, output_dir):
+    """One full composite + evolution pass, stage by stage"""
+    import composite_entity
+    import evolution_transformer
+    from scene_reset import reset_scene
+
+    reset_scene(verbose=False)
+    timer = stage_timer(os.path.basename(fixture) if os.path.exists(fixture) else fixture, era)
+
+    with timer.stage('import'):
+        if fixture.startswith('synthetic:'):
+            objects = build_synthetic(int(fixture.split(':')[1]))
+        else:
+            bpy.ops.import_scene.gltf(filepath=fixture)
+            objects = list(bpy.context.selected_objects)
+
+    with timer.stage('recolor'):
+        composite_entity.apply_color_replacements(objects, BENCH_REPLACEMENTS)
+
+    with timer.stage('hue_shift'):
+        composite_entity.apply_additional_hue_shift(objects, 30)
+
+    with timer.stage('join'):
+        objects = composite_entity.join_objects(objects)
+
+    with timer.stage('merge_materials'):
+        composite_entity.merge_materials(objects)
+
+    era_config = evolution_transformer.get_era_config(era)
+    with timer.stage('materials'):
+        evolution_transformer.apply_evolution_materials(objects, era_config)
+
+    with timer.stage('subdivision') as record:
+        evolution_transformer.apply_evolution_geometry(objects, era_config)
+        counts = evaluated_counts(objects)
+        record['evaluated_vertices'] = counts['vertices']
+        record['evaluated_faces'] = counts['faces']
+
+    with timer.stage('effects'):
+        evolution_transformer.apply_evolution_effects(objects, era_config)
+
+    output_path = os.path.join(output_dir, f"bench_{era}.glb")
+    with timer.stage('export', output=output_path):
+        evolution_transformer.export_evolved(output_path)
+
+    return timer.records
+
+def bench_hybrid(fixture, output_dir):
+    """The same recolor + rescale through Blender (hybrid_modify --reexport) and in place (glb_transform)"""
+    import export_profiles
+    import glb_transform
+    import hybrid_modify
+    from scene_reset import reset_scene
+
+    timer = stage_timer(os.path.basename(fixture) if os.path.exists(fixture) else fixture, None)
+    if fixture.startswith('synthetic:'):
+        # Both paths start from a GLB, written untimed
+        reset_scene(verbose=False)
+        build_synthetic(int(fixture.split(':')[1]))
+        fixture = os.path.join(output_dir, f"synthetic_{fixture.split(':')[1]}.glb")
+        export_profiles.export_gltf(fixture, 'raw', use_selection=False)
+
+    output_path = os.path.join(output_dir, 'hybrid_modify.glb')
+    args = hybrid_modify.build_parser().parse_args([
+        '--input', fixture, '--output', output_path, '--recolor', json.dumps(BENCH_RECOLOR),
+        '--rescale', '1.5', '--reexport',
+    ])
+    with timer.stage('hybrid_modify', output=output_path):
+        hybrid_modify.run(args)
+
+    output_path = os.path.join(output_dir, 'glb_transform.glb')
+    with timer.stage('glb_transform', output=output_path):
+        glb_transform.transform_glb(fixture, output_path, rescale=1.5, recolor=BENCH_RECOLOR)
+    return timer.records
+
+def bench_trees(output_dir):
+    """generate_tree per tree type (generation and export are one call)"""
+    import generate_tree
+    from scene_reset import reset_scene
+
+    records = []
+    for tree_type in ('oak', 'willow', 'yew', 'maple'):
+        reset_scene(verbose=False)
+        timer = stage_timer(f"tree:{tree_type}", None)
+        output_path = os.path.join(output_dir, f"tree_{tree_type}.glb")
+        with timer.stage('generate_tree', output=output_path):
+            generate_tree.generate_tree(tree_type, 5, 42, output_path)
+        records.extend(timer.records)
+    return records
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+def merge_repeats(runs):
+    """Collapse repeated runs into one record per (fixture, era, stage) with the median time"""
+    merged = {}
+    for record in (r for run in runs for r in run):
+        key = (record['fixture'], record['era'], record['stage'])
+        if key not in merged:
+            merged[key] = dict(record, runs=[])
+        merged[key]['runs'].append(record['duration'])
+        if record.get('peak_rss') is not None:
+            merged[key]['peak_rss'] = max(merged[key].get('peak_rss') or 0, record['peak_rss'])
+    for record in merged.values():
+        record['duration'] = median(record['runs'])
+    return list(merged.values())
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(args):
+    fixtures = sorted(glob.glob(args.fixtures)) if args.fixtures else []
+    fixtures += [f"synthetic:{s}" for s in args.synthetic.split(',') if s]
+    eras = [int(e) for e in args.eras.split(',') if e]
+
+    output_dir = tempfile.mkdtemp(prefix='rsc-bench-')
+    runs = []
+    for repeat in range(args.repeat):
+        records = []
+        for fixture in fixtures:
+            for era in eras:
+                print(f"[Bench] {fixture} era {era} (run {repeat + 1}/{args.repeat})")
+                records.extend(bench_pipeline(fixture, era, output_dir))
+            if not args.skip_hybrid:
+                records.extend(bench_hybrid(fixture, output_dir))
+        if not args.skip_trees:
+            records.extend(bench_trees(output_dir))
+        runs.append(records)
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+    report = {
+        'commit': git_commit(),
+        'blender': bpy.app.version_string,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': args.repeat,
+        'results': merge_repeats(runs),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[Bench] {len(report['results'])} stage results written to {args.output}")
+
+def compare(baseline_path, current_path, threshold):
+    """Print per-stage time changes, returns the number of regressions above threshold"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['fixture'], r['era'], r['stage']): r for r in json.load(f)['results']}
+    with open(current_path, 'r', encoding='utf-8') as f:
+        current = json.load(f)['results']
+
+    regressions = 0
+    print(f"{'fixture':<28} {'era':>4} {'stage':<14} {'base s':>10} {'now s':>10} {'change':>8}")
+    for record in current:
+        key = (record['fixture'], record['era'], record['stage'])
+        if key not in baseline:
+            continue
+        before, after = baseline[key]['duration'], record['duration']
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > threshold:
+            regressions += 1
+            flag = '  REGRESSION'
+        era = '' if record['era'] is None else record['era']
+        print(f"{record['fixture'][:28]:<28} {era:>4} {record['stage']:<14} "
+              f"{before:>10.4f} {after:>10.4f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    argv = jobs.script_argv() if bpy is not None else sys.argv[1:]
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fixtures', type=str, default=DEFAULT_FIXTURES, help='Glob of GLB fixtures')
+    parser.add_argument('--synthetic', type=str, default=DEFAULT_SYNTHETIC,
+                        help='Icosphere subdivision levels for synthetic meshes (20 × 4^n faces)')
+    parser.add_argument('--eras', type=str, default=DEFAULT_ERAS)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--skip-trees', action='store_true')
+    parser.add_argument('--skip-hybrid', action='store_true', help='Skip the hybrid_modify/glb_transform stages')
+    parser.add_argument('--output', type=str, default='bench.json')
+    parser.add_argument('--compare', type=str, nargs=2, metavar=('BASELINE', 'CURRENT'), default=None)
+    parser.add_argument('--threshold', type=float, default=0.1, help='Relative slowdown reported as regression')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(args.compare[0], args.compare[1], args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    if bpy is None:
+        parser.error("Benchmarks run inside Blender: blender --background --python benchmark.py -- ...")
+    run_benchmark(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Blender Process Pool
+Runs a job manifest across N persistent Blender workers (blender_worker.py), one per core by default
+Runs under plain Python - it only starts Blender, it does not need bpy
+Usage: python blender_pool.py --manifest jobs.jsonl [--workers 32] [--timeout 300] [--report report.json] [--blender /path/to/blender] [--cache]
+
+Jobs use the manifest format from jobs.py and must name their "script"
+(or pass --script to use one script for every job without one).
+A job that exceeds --timeout kills its worker; the worker is restarted for the next job.
+With --cache, jobs already in the asset cache (asset_cache.py) are copied instead of run.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import asset_catalog
+from asset_cache import AssetCache, DEFAULT_CACHE_DIR
+from blender_worker import RESULT_PREFIX
+
+WORKER_SCRIPT = os.path.join(jobs.SCRIPTS_DIR, 'blender_worker.py')
+DEFAULT_BLENDER = os.environ.get('BLENDER_PATH', 'blender')
+
+class WorkerProcess:
+    """One Blender running blender_worker.py on stdin/stdout"""
+
+    def __init__(self, blender_path, name):
+        self.blender_path = blender_path
+        self.name = name
+        self.process = None
+        self.results = queue.Queue()
+        self.log = []
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [self.blender_path, '--background', '--factory-startup', '--python', WORKER_SCRIPT],
+            # The pool/scheduler exports catalog.json once for the jobs of every worker
+            env=dict(os.environ, **{asset_catalog.EXPORT_ENV: 'off'}),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+        )
+        self.results = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self.process, self.results), daemon=True).start()
+
+    def _read_stdout(self, process, results):
+        """Split result records from Blender's log output"""
+        for line in process.stdout:
+            if line.startswith(RESULT_PREFIX):
+                results.put(json.loads(line[len(RESULT_PREFIX):]))
+            else:
+                self.log.append(line.rstrip())
+                # Keep only the tail, it is attached to failures
+                del self.log[:-50]
+        # EOF - Blender exited
+        results.put(None)
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, job, timeout):
+        """Send one job and wait for its result record"""
+        if not self.alive():
+            self.start()
+
+        try:
+            self.process.stdin.write(json.dumps(job) + '\n')
+            self.process.stdin.flush()
+        except OSError as e:
+            # Blender exited before reading the job (e.g. it failed to start)
+            self.kill()
+            return {'ok': False, 'error': f"Blender exited: {e}", 'log': self.log[-20:]}
+
+        try:
+            result = self.results.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            return {'ok': False, 'error': f"Timed out after {timeout}s"}
+
+        if result is None:
+            return {'ok': False, 'error': 'Blender exited', 'log': self.log[-20:]}
+        return result
+
+    def kill(self):
+        if self.alive():
+            self.process.kill()
+            self.process.wait()
+
+    def stop(self):
+        """Ask the worker to exit cleanly, kill it if it does not"""
+        if not self.alive():
+            return
+        try:
+            self.process.stdin.write(json.dumps({'command': 'shutdown'}) + '\n')
+            self.process.stdin.flush()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+def run_on_worker(worker, job, timeout, cache=None, key=None):
+    """
+    Run one job on a worker, or copy it from the cache on a hit, and return its record
+    key: the job's cache key when the caller already has it
+    """
+    start = time.perf_counter()
+    key = key or (cache.job_key(job['script'], job['args']) if cache else None)
+    if cache and cache.get(key, job['args']):
+        record = {'ok': True, 'cached': True}
+        # The worker records what it writes, hits are recorded here
+        asset_catalog.record_job(job['script'], job['args'], source_hash=key, export=False)
+    else:
+        # The worker catalogs the outputs under the key computed here
+        record = worker.run(dict(job, source_hash=key) if key else job, timeout)
+        if cache and record['ok']:
+            cache.put(key, job['args'])
+    record.setdefault('id', job['id'])
+    record.setdefault('script', job.get('script'))
+    record['worker'] = worker.name
+    record['wall_time'] = round(time.perf_counter() - start, 4)
+    return record
+
+def run_pool(pool_jobs, workers=None, timeout=300, blender_path=DEFAULT_BLENDER, on_result=None, cache=None):
+    """
+    Run jobs on a shared queue across N workers and return the merged report
+    on_result: optional callback(record) as each job finishes
+    cache: optional AssetCache, hits skip Blender and successful jobs are stored
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pool_jobs) or 1))
+    pending = queue.Queue()
+    for index, job in enumerate(pool_jobs):
+        job.setdefault('id', index)
+        pending.put((index, job))
+
+    results = [None] * len(pool_jobs)
+    lock = threading.Lock()
+
+    def worker_loop(worker):
+        try:
+            while True:
+                try:
+                    index, job = pending.get_nowait()
+                except queue.Empty:
+                    break
+
+                job_start = time.perf_counter()
+                try:
+                    record = run_on_worker(worker, job, timeout, cache)
+                except Exception as e:
+                    # e.g. a missing input while computing the cache key
+                    record = {'ok': False, 'error': str(e) or e.__class__.__name__, 'id': job['id'],
+                              'script': job.get('script'), 'worker': worker.name,
+                              'wall_time': round(time.perf_counter() - job_start, 4)}
+                results[index] = record
+
+                if on_result:
+                    with lock:
+                        on_result(record)
+        finally:
+            worker.stop()
+
+    print(f"[Pool] Running {len(pool_jobs)} jobs on {workers} Blender workers")
+    start = time.perf_counter()
+    threads = []
+    for i in range(workers):
+        worker = WorkerProcess(blender_path, f"worker-{i}")
+        thread = threading.Thread(target=worker_loop, args=(worker,), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    jobs.export_catalog()
+
+    report = {
+        'workers': workers,
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['ok']),
+        'failed': sum(1 for r in results if not r['ok']),
+        'duration': round(time.perf_counter() - start, 4),
+        'job_time': round(sum(r.get('duration', r['wall_time']) for r in results), 4),
+        'results': results,
+    }
+    if cache:
+        cache.flush_stats()
+        report['cache'] = cache.stats()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--manifest', type=str, required=True)
+    parser.add_argument('--script', type=str, default=None,
+                        help='Script for jobs that do not name one')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of Blender processes (default: one per core)')
+    parser.add_argument('--timeout', type=float, default=300,
+                        help='Seconds per job before its worker is killed')
+    parser.add_argument('--report', type=str, default=None)
+    parser.add_argument('--blender', type=str, default=DEFAULT_BLENDER)
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, default=None,
+                        help='Use the asset cache (optionally at this directory)')
+    parser.add_argument('--stage-log', type=str, default=None,
+                        help='Stage log (JSONL) every worker appends to')
+    parser.add_argument('--profile-dir', type=str, default=None,
+                        help='cProfile dump per job')
+    args = parser.parse_args()
+
+    # Workers inherit the environment, stage_log.py reads these
+    if args.stage_log:
+        os.environ['BLENDER_STAGE_LOG'] = os.path.abspath(args.stage_log)
+    if args.profile_dir:
+        os.environ['BLENDER_PROFILE_DIR'] = os.path.abspath(args.profile_dir)
+
+    pool_jobs = jobs.load_manifest(args.manifest)
+    for job in pool_jobs:
+        if not job.get('script'):
+            if not args.script:
+                parser.error(f"Job {job.get('id')} has no 'script' and --script was not given")
+            job['script'] = args.script
+        # The worker expects args under "args"
+        job['args'] = jobs.job_args(job)
+
+    def print_result(record):
+        status = 'ok' if record['ok'] else f"FAILED: {record['error']}"
+        if record.get('cached'):
+            status = 'cached'
+        print(f"[Pool] {record['worker']} {record['id']} ({record['wall_time']}s) {status}")
+
+    cache = AssetCache(args.cache) if args.cache else None
+    report = run_pool(pool_jobs, args.workers, args.timeout, args.blender, print_result, cache)
+    report['manifest'] = args.manifest
+
+    report_path = args.report or os.path.splitext(args.manifest)[0] + '.report.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"[Pool] {report['succeeded']}/{report['total']} succeeded in {report['duration']}s "
+          f"({report['job_time']}s of job time), report written to {report_path}")
+    sys.exit(0 if report['failed'] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Blender Python Script: Persistent Job Worker
+Keeps one Blender interpreter alive and runs blender-scripts jobs in it, so each
+job skips the Blender startup cost
+Usage:
+  blender --background --python blender_worker.py                               (jobs on stdin)
+  blender --background --python blender_worker.py -- --socket 127.0.0.1:8765  (jobs over TCP)
+
+Protocol: one JSON record per line (see jobs.py for the job format)
+  {"id": "oak-1", "script": "generate_tree", "args": {"type": "oak", "seed": 1, "output": "oak.glb"}}
+  {"command": "ping"} / {"command": "reset"} / {"command": "shutdown"}
+Each request gets one JSON result line. On stdout the line starts with RESULT_PREFIX,
+because Blender and the scripts also print their own logs there.
+"""
+
+import os
+import sys
+import json
+import argparse
+import socketserver
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+
+RESULT_PREFIX = '@@blender-worker '
+
+def handle_line(line):
+    """Handle one request line, returns (result record, keep running)"""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {'ok': False, 'error': f"Invalid JSON: {e}"}, True
+
+    command = request.get('command')
+    if command == 'ping':
+        return {'id': request.get('id'), 'ok': True, 'pong': True, 'pid': os.getpid()}, True
+    if command == 'reset':
+        # Imported here so the worker protocol can be exercised without bpy
+        from scene_reset import reset_scene
+        return {'id': request.get('id'), 'ok': True, **reset_scene()}, True
+    if command == 'shutdown':
+        return {'id': request.get('id'), 'ok': True, 'shutdown': True}, False
+    if command is not None:
+        return {'id': request.get('id'), 'ok': False, 'error': f"Unknown command: {command}"}, True
+    if 'script' not in request:
+        return {'id': request.get('id'), 'ok': False, 'error': "Job has no 'script'"}, True
+
+    return jobs.run_job(request), True
+
+def serve_stdin():
+    """Read jobs from stdin until EOF or shutdown"""
+    print(f"[Worker] Ready on stdin (pid {os.getpid()})")
+    sys.stdout.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        result, keep_running = handle_line(line)
+        sys.stdout.write(RESULT_PREFIX + json.dumps(result) + '\n')
+        sys.stdout.flush()
+        if not keep_running:
+            break
+
+class JobRequestHandler(socketserver.StreamRequestHandler):
+    """One connection may send any number of jobs, one per line"""
+
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            result, keep_running = handle_line(line)
+            self.wfile.write((json.dumps(result) + '\n').encode('utf-8'))
+            self.wfile.flush()
+            if not keep_running:
+                self.server.stopping = True
+                break
+
+def serve_socket(address):
+    """Serve jobs over a local TCP socket, one connection at a time (bpy is single-threaded)"""
+    host, _, port = address.rpartition(':')
+    server = socketserver.TCPServer((host or '127.0.0.1', int(port)), JobRequestHandler)
+    server.stopping = False
+
+    print(f"[Worker] Listening on {host or '127.0.0.1'}:{port} (pid {os.getpid()})")
+    sys.stdout.flush()
+
+    with server:
+        while not server.stopping:
+            server.handle_request()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--socket', type=str, default=None,
+                        help='host:port to listen on instead of stdin')
+    args = parser.parse_args(jobs.script_argv())
+
+    if args.socket:
+        serve_socket(args.socket)
+    else:
+        serve_stdin()
+
+    print("[Worker] Shutting down")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Vectorized color operations shared by the Blender scripts and the GLB tools (no Blender needed)
+Colors are float arrays (N, 3) or (N, 4); alpha is left untouched
+"""
+
+import numpy as np
+
+from rs_palette import rs_colors_to_rgb
+
+# Colors come from the exact RS palette, 8-bit color attributes may be a step off after
+# rounding. In sRGB steps: linear colors are matched after converting them back (dark shades
+# would collapse otherwise), and neighbouring palette shades sit two steps apart
+REPLACEMENT_TOLERANCE = 1.5 / 255
+
+def srgb_to_linear(srgb):
+    """sRGB channel values (0..1) → linear, as glTF stores material and vertex colors"""
+    srgb = np.asarray(srgb, dtype=np.float32)
+    return np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+def linear_to_srgb(linear):
+    """Linear channel values (0..1) → sRGB, the inverse of srgb_to_linear"""
+    linear = np.clip(np.asarray(linear, dtype=np.float32), 0, None)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055).astype(np.float32)
+
+def build_replacement_table(replacements, linear=False):
+    """
+    [[oldColorId, newColorId], ...] → (old_rgb (K, 3), new_rgb (K, 3)), sRGB like the palette
+    linear: converted for glTF / Blender colors (match them with replace_colors(linear=True))
+    """
+    pairs = np.asarray(replacements, dtype=np.int64).reshape(-1, 2)
+    old_rgb, new_rgb = rs_colors_to_rgb(pairs[:, 0]), rs_colors_to_rgb(pairs[:, 1])
+    if linear:
+        return srgb_to_linear(old_rgb), srgb_to_linear(new_rgb)
+    return old_rgb, new_rgb
+
+def replace_colors(colors, old_rgb, new_rgb, tolerance=REPLACEMENT_TOLERANCE, linear=False):
+    """
+    Replace every color within tolerance of old_rgb[k] by new_rgb[k] (first match wins)
+    Colors are matched once per unique value, then mapped back through the inverse index,
+    so the cost is O(N log N + unique × K) instead of N × K Python comparisons
+    linear: colors and the table are linear (glTF, Blender), they are matched in sRGB
+    Returns (new colors array, number of replaced entries)
+    """
+    colors = np.asarray(colors, dtype=np.float32)
+    if colors.size == 0 or len(old_rgb) == 0:
+        return colors, 0
+    match_rgb = linear_to_srgb(colors[:, :3]) if linear else colors[:, :3]
+    old_rgb = linear_to_srgb(old_rgb) if linear else np.asarray(old_rgb, dtype=np.float32)
+
+    # Quantize to 8 bits per channel and pack into one key to find the (few) distinct colors
+    quantized = np.clip(np.round(match_rgb * 255), 0, 255).astype(np.int32)
+    keys = (quantized[:, 0] << 16) | (quantized[:, 1] << 8) | quantized[:, 2]
+    unique, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    unique_rgb = np.stack([(unique >> 16) & 0xFF, (unique >> 8) & 0xFF, unique & 0xFF], axis=1).astype(np.float32) / 255.0
+
+    within = np.abs(unique_rgb[:, None, :] - old_rgb[None, :, :]).max(axis=2) < tolerance
+    unique_hit = within.any(axis=1)
+    if not unique_hit.any():
+        return colors, 0
+    unique_target = np.asarray(new_rgb, dtype=np.float32)[within.argmax(axis=1)]
+
+    hit = unique_hit[inverse]
+    result = colors.copy()
+    result[hit, :3] = unique_target[inverse[hit]]
+    return result, int(hit.sum())
+
+def rgb_to_hsv(rgb):
+    """Vectorized RGB → HSV, all channels in 0..1"""
+    rgb = np.asarray(rgb, dtype=np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = rgb.max(axis=-1)
+    minc = rgb.min(axis=-1)
+    delta = maxc - minc
+    safe = np.where(delta == 0, 1, delta)
+
+    h = np.where(maxc == r, (g - b) / safe,
+        np.where(maxc == g, 2.0 + (b - r) / safe, 4.0 + (r - g) / safe))
+    h = np.where(delta == 0, 0.0, (h / 6.0) % 1.0)
+    s = np.where(maxc == 0, 0.0, delta / np.where(maxc == 0, 1, maxc))
+    return np.stack([h, s, maxc], axis=-1)
+
+def hsv_to_rgb(hsv):
+    """Vectorized HSV → RGB, all channels in 0..1"""
+    hsv = np.asarray(hsv, dtype=np.float32)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = np.floor(h * 6.0).astype(np.int32) % 6
+    f = h * 6.0 - np.floor(h * 6.0)
+    p = v * (1 - s)
+    q = v * (1 - s * f)
+    t = v * (1 - s * (1 - f))
+    choices = [
+        np.stack([v, t, p], -1), np.stack([q, v, p], -1), np.stack([p, v, t], -1),
+        np.stack([p, q, v], -1), np.stack([t, p, v], -1), np.stack([v, p, q], -1),
+    ]
+    return np.choose(i[..., None], choices).astype(np.float32)
+
+def shift_hue(colors, degrees):
+    """Rotate the hue of colors by degrees, keeps alpha"""
+    colors = np.asarray(colors, dtype=np.float32)
+    if degrees == 0 or colors.size == 0:
+        return colors
+    hsv = rgb_to_hsv(colors[..., :3])
+    hsv[..., 0] = (hsv[..., 0] + degrees / 360.0) % 1.0
+    result = colors.copy()
+    result[..., :3] = hsv_to_rgb(hsv)
+    return result
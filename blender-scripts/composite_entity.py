@@ -1,136 +1,283 @@
 """
 Blender Python Script: Composite Entity from Multiple Models
 Applies Jagex color/material replacements
-Usage: blender --background --python composite_entity.py -- --models m1.gltf,m2.gltf --color-replacements [[...]] --output output.glb
+Usage: blender --background --python composite_entity.py -- --models m1.rsmesh,m2.gltf --color-replacements [[...]] --output output.glb
+Batch: blender --background --python composite_entity.py -- --manifest jobs.jsonl [--summary summary.json]
 """
 
 import bpy
+import os
 import sys
 import json
 import argparse
+import numpy as np
 
-def cleanup_scene():
-    """Remove all objects"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+import export_profiles
+import rsmesh
+from color_ops import build_replacement_table, replace_colors, shift_hue, srgb_to_linear
+from scene_reset import cleanup_scene
+from script_defaults import MERGE_TOLERANCE
+from material_ops import (RS_MATERIAL_PROPERTY, merge_mesh_materials, remove_orphan_materials,
+                          bake_vertex_colors, rs_material, vertex_color_material)
+from mesh_build import flat_material, mesh_from_arrays, object_from_mesh
+
+# Material of .rsmesh parts without face colors
+RSMESH_MATERIAL = 'RS_Part'
+
+def load_rsmesh(path):
+    """
+    Build an .rsmesh model through the data API, returns the new object
+    Face colors (sRGB RS palette bytes) go into the color attribute as linear values, like
+    imported glTF colors. Each RS material id gets its own slot (rs_material()), so the ids
+    are exported and material replacements can swap them
+    """
+    data = rsmesh.read_rsmesh(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    face_colors = None
+    if data.face_colors is not None:
+        face_colors = data.face_colors.astype(np.float32) / 255.0
+        face_colors[:, :3] = srgb_to_linear(face_colors[:, :3])
+    # Colors live in the attribute, one shared material reads them
+    if face_colors is not None:
+        base = vertex_color_material()
+    else:
+        base = bpy.data.materials.get(RSMESH_MATERIAL) or flat_material(RSMESH_MATERIAL, (1.0, 1.0, 1.0))
+    materials, material_indices = [base], None
+    if data.face_materials is not None:
+        ids, material_indices = np.unique(data.face_materials, return_inverse=True)
+        materials = [base if material_id == rsmesh.NO_MATERIAL else rs_material(base, material_id) for material_id in ids]
+    mesh = mesh_from_arrays(name, data.positions, data.indices, uvs=data.uvs, face_colors=face_colors,
+                            material_indices=material_indices, normals=data.normals, y_up=True)
+    obj = object_from_mesh(name, mesh, materials)
+    obj.select_set(True)
+    return obj
 
 def load_models(model_paths):
-    """Load multiple GLTF models"""
+    """Load the models by file type: .rsmesh through the data API, .obj and glTF through the importers"""
     all_objects = []
     for path in model_paths:
-        bpy.ops.import_scene.gltf(filepath=path)
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.rsmesh':
+            all_objects.append(load_rsmesh(path))
+            continue
+        if ext == '.obj':
+            bpy.ops.wm.obj_import(filepath=path)
+        else:
+            bpy.ops.import_scene.gltf(filepath=path)
         all_objects.extend(bpy.context.selected_objects)
     return all_objects
 
+def unique_meshes(objects):
+    """Mesh datablocks of the objects, each once (imported parts may share meshes)"""
+    meshes = {}
+    for obj in objects:
+        if obj.type == 'MESH':
+            meshes[obj.data.name] = obj.data
+    return list(meshes.values())
+
+def unique_materials(objects):
+    """Node-based materials of the objects, each once"""
+    materials = {}
+    for mesh in unique_meshes(objects):
+        for mat in mesh.materials:
+            if mat is not None and mat.use_nodes:
+                materials[mat.name] = mat
+    return list(materials.values())
+
+def recolor_color_attributes(mesh, old_rgb, new_rgb):
+    """Replace per-face/vertex colors of every color attribute in bulk (linear table), returns replaced count"""
+    replaced = 0
+    for attr in mesh.color_attributes:
+        count = len(attr.data)
+        if count == 0:
+            continue
+        colors = np.empty(count * 4, dtype=np.float32)
+        attr.data.foreach_get('color', colors)
+        colors, hits = replace_colors(colors.reshape(-1, 4), old_rgb, new_rgb, linear=True)
+        if hits:
+            attr.data.foreach_set('color', colors.ravel())
+            replaced += hits
+    if replaced:
+        mesh.update()
+    return replaced
+
+def recolor_materials(materials, old_rgb, new_rgb):
+    """Replace Principled BSDF base colors (linear table), all materials matched in one call"""
+    nodes = [
+        node
+        for mat in materials
+        for node in mat.node_tree.nodes
+        if node.type == 'BSDF_PRINCIPLED'
+    ]
+    if not nodes:
+        return 0
+    colors = np.array([node.inputs['Base Color'].default_value[:] for node in nodes], dtype=np.float32)
+    new_colors, hits = replace_colors(colors, old_rgb, new_rgb, linear=True)
+    if hits:
+        for node, color, old in zip(nodes, new_colors, colors):
+            if not np.array_equal(color, old):
+                node.inputs['Base Color'].default_value = (*color[:3], 1.0)
+    return hits
+
 def apply_color_replacements(objects, replacements):
     """
     Apply Jagex color replacements
     replacements: [[oldColor, newColor], ...]
-    Colors are RS color IDs, need to convert to RGB
+    Colors are RS color IDs, converted to RGB through the RS palette and matched against both the mesh
+    color attributes (where RSC/RS models keep per-face colors) and material base colors,
+    which Blender holds as linear values
     """
-    # RS color palette (simplified - full palette has 65536 colors)
-    # In production, load full palette from RSMV
-    def rs_color_to_rgb(color_id):
-        # Simplified conversion - actual RS colors are more complex
-        r = ((color_id >> 10) & 0x1F) / 31.0
-        g = ((color_id >> 5) & 0x1F) / 31.0
-        b = (color_id & 0x1F) / 31.0
-        return (r, g, b)
+    old_rgb, new_rgb = build_replacement_table(replacements, linear=True)
     
-    color_map = {}
-    for old, new in replacements:
-        color_map[rs_color_to_rgb(old)] = rs_color_to_rgb(new)
-    
-    # Apply replacements
-    for obj in objects:
-        if obj.type == 'MESH' and obj.data.materials:
-            for mat in obj.data.materials:
-                if mat.use_nodes:
-                    for node in mat.node_tree.nodes:
-                        if node.type == 'BSDF_PRINCIPLED':
-                            base_color = tuple(node.inputs['Base Color'].default_value[:3])
-                            # Check if this color should be replaced
-                            for old_color, new_color in color_map.items():
-                                # Approximate match (RS colors aren't exact)
-                                if all(abs(a - b) < 0.05 for a, b in zip(base_color, old_color)):
-                                    node.inputs['Base Color'].default_value = (*new_color, 1.0)
-                                    break
+    attribute_hits = sum(recolor_color_attributes(mesh, old_rgb, new_rgb) for mesh in unique_meshes(objects))
+    material_hits = recolor_materials(unique_materials(objects), old_rgb, new_rgb)
+    print(f"[Blender] Recolored {attribute_hits} color attribute entries, {material_hits} materials")
 
 def apply_material_replacements(objects, replacements):
     """
     Apply Jagex material replacements
     replacements: [[oldMaterial, newMaterial], ...]
+    RS material ids are the slot materials of .rsmesh parts (rs_material()), a replaced id
+    swaps the slot to the material of the new id; imported glTF/OBJ parts carry no ids
     """
-    # Material IDs map to specific textures/properties in RS
-    # For now, simplified implementation
-    print(f"[Blender] Material replacements: {len(replacements)} (simplified)")
-    # TODO: Implement full material replacement logic
+    replaced = 0
+    skipped = 0
+    for mesh in unique_meshes(objects):
+        slots = list(mesh.materials)
+        tagged = [slot for slot, mat in enumerate(slots) if mat is not None and RS_MATERIAL_PROPERTY in mat]
+        if not tagged:
+            skipped += 1
+            continue
+        ids, _ = rsmesh.replace_materials([slots[slot][RS_MATERIAL_PROPERTY] for slot in tagged], replacements)
+        indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', indices)
+        faces = np.bincount(indices, minlength=len(slots))
+        for slot, material_id in zip(tagged, ids):
+            if material_id != slots[slot][RS_MATERIAL_PROPERTY]:
+                mesh.materials[slot] = rs_material(slots[slot], material_id)
+                replaced += int(faces[slot])
+    if not replaced:
+        print(f"[Blender] Warning: no face uses a replaced RS material id ({len(replacements)} replacements)")
+    print(f"[Blender] Replaced the material of {replaced} faces ({skipped} meshes without RS material ids)")
+    return replaced
 
 def apply_additional_hue_shift(objects, hue_shift):
-    """Apply additional hue shift on top of Jagex replacements"""
+    """Apply additional hue shift on top of Jagex replacements (face colors and materials)"""
     if hue_shift == 0:
         return
     
-    from mathutils import Color
-    hue_offset = hue_shift / 360.0
+    for mesh in unique_meshes(objects):
+        for attr in mesh.color_attributes:
+            colors = np.empty(len(attr.data) * 4, dtype=np.float32)
+            attr.data.foreach_get('color', colors)
+            attr.data.foreach_set('color', shift_hue(colors.reshape(-1, 4), hue_shift).ravel())
+        mesh.update()
     
-    for obj in objects:
-        if obj.type == 'MESH' and obj.data.materials:
-            for mat in obj.data.materials:
-                if mat.use_nodes:
-                    for node in mat.node_tree.nodes:
-                        if node.type == 'BSDF_PRINCIPLED':
-                            color = Color(node.inputs['Base Color'].default_value[:3])
-                            color.h = (color.h + hue_offset) % 1.0
-                            node.inputs['Base Color'].default_value = (*color, 1.0)
+    for mat in unique_materials(objects):
+        for node in mat.node_tree.nodes:
+            if node.type == 'BSDF_PRINCIPLED':
+                color = shift_hue(np.array(node.inputs['Base Color'].default_value[:3]), hue_shift)
+                node.inputs['Base Color'].default_value = (*color, 1.0)
+
+def merge_materials(objects, tolerance=MERGE_TOLERANCE):
+    """Merge identical / near-identical material slots after the join, returns (slots before, after)"""
+    before = after = 0
+    dropped = []
+    for mesh in unique_meshes(objects):
+        slots_before, slots_after, mesh_dropped = merge_mesh_materials(mesh, tolerance)
+        before += slots_before
+        after += slots_after
+        dropped.extend(mesh_dropped)
+    removed = remove_orphan_materials(dropped)
+    print(f"[Blender] Material slots: {before} → {after} ({removed} materials removed)")
+    return before, after
+
+def apply_vertex_colors(objects):
+    """Bake flat material colors into vertex colors, one shared material per mesh"""
+    baked = skipped = 0
+    dropped = []
+    for mesh in unique_meshes(objects):
+        slots = [mat for mat in mesh.materials if mat is not None]
+        if bake_vertex_colors(mesh):
+            baked += 1
+            dropped.extend(slots)
+        else:
+            skipped += 1
+    remove_orphan_materials(dropped)
+    print(f"[Blender] Baked vertex colors into {baked} meshes ({skipped} textured meshes kept)")
 
 def apply_rescale(objects, scale):
     """Rescale all objects"""
     for obj in objects:
         obj.scale = (scale, scale, scale)
 
-def main():
-    # Parse arguments
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
-    
-    parser = argparse.ArgumentParser()
+def add_composite_arguments(parser):
+    """Composite inputs, shared with generate_entity.py"""
     parser.add_argument('--models', type=str, required=True)
     parser.add_argument('--color-replacements', type=str, default='[]')
     parser.add_argument('--material-replacements', type=str, default='[]')
     parser.add_argument('--additional-hue-shift', type=float, default=0.0)
     parser.add_argument('--rescale', type=float, default=1.0)
+    parser.add_argument('--material-tolerance', type=float, default=MERGE_TOLERANCE,
+                        help='Merge materials whose parameters differ by less than this')
+    parser.add_argument('--keep-materials', action='store_true', help='Skip material merging')
+    parser.add_argument('--vertex-colors', action='store_true',
+                        help='Bake material colors into vertex colors with one shared material')
+
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
+    parser = argparse.ArgumentParser()
+    add_composite_arguments(parser)
     parser.add_argument('--output', type=str, required=True)
-    
-    args = parser.parse_args(argv)
-    
+    export_profiles.add_arguments(parser)
+    stage_log.add_arguments(parser)
+    return parser
+
+def join_objects(objects):
+    """Join all objects into one, returns the surviving objects (left selected)"""
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.context.view_layer.objects.active = objects[0]
+    if len(objects) > 1:
+        bpy.ops.object.join()
+        print("[Blender] Joined all objects into composite entity")
+        # Joined objects are removed, only the active one survives
+        objects = [bpy.context.view_layer.objects.active]
+    return objects
+
+def build_composite(args):
+    """Load, recolor and join the models, returns the composite objects (left selected)"""
     print(f"[Blender] Compositing entity from {args.models}")
     
-    cleanup_scene()
+    with stage_log.stage('reset'):
+        cleanup_scene()
     
     # Load all models
     model_paths = args.models.split(',')
-    objects = load_models(model_paths)
+    with stage_log.stage('import'):
+        objects = load_models(model_paths)
     print(f"[Blender] Loaded {len(objects)} objects from {len(model_paths)} models")
     
     # Apply Jagex color replacements
     color_replacements = json.loads(args.color_replacements)
     if color_replacements:
-        apply_color_replacements(objects, color_replacements)
+        with stage_log.stage('recolor'):
+            apply_color_replacements(objects, color_replacements)
         print(f"[Blender] Applied {len(color_replacements)} color replacements")
     
     # Apply Jagex material replacements
     material_replacements = json.loads(args.material_replacements)
     if material_replacements:
-        apply_material_replacements(objects, material_replacements)
+        with stage_log.stage('material_replace'):
+            apply_material_replacements(objects, material_replacements)
         print(f"[Blender] Applied {len(material_replacements)} material replacements")
     
     # Apply additional modifications
     if args.additional_hue_shift != 0:
-        apply_additional_hue_shift(objects, args.additional_hue_shift)
+        with stage_log.stage('hue_shift'):
+            apply_additional_hue_shift(objects, args.additional_hue_shift)
         print(f"[Blender] Applied additional hue shift: {args.additional_hue_shift}°")
     
     if args.rescale != 1.0:
@@ -138,20 +285,39 @@ def main():
         print(f"[Blender] Rescaled to {args.rescale}x")
     
     # Join all objects into one
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.context.view_layer.objects.active = objects[0]
-    if len(objects) > 1:
-        bpy.ops.object.join()
-        print("[Blender] Joined all objects into composite entity")
+    with stage_log.stage('join'):
+        objects = join_objects(objects)
+    
+    # One slot per distinct material, so the entity draws as few primitives as possible
+    if not args.keep_materials:
+        with stage_log.stage('merge_materials') as record:
+            record['slots_before'], record['slots_after'] = merge_materials(objects, args.material_tolerance)
+    
+    return objects
+
+def export_composite(output_path, stage='export', profile=export_profiles.DEFAULT_PROFILE):
+    """Export the selected composite as GLB"""
+    with stage_log.stage(stage, output=output_path):
+        # Extras carry the RS material ids of the materials
+        export_profiles.export_gltf(output_path, profile, use_selection=True, export_extras=True)
+
+def run(args):
+    """Composite one entity and return the output path"""
+    objects = build_composite(args)
+    
+    if args.vertex_colors:
+        with stage_log.stage('vertex_colors'):
+            apply_vertex_colors(objects)
     
     # Export as GLB
-    bpy.ops.export_scene.gltf(
-        filepath=args.output,
-        export_format='GLB',
-        use_selection=True
-    )
+    export_composite(args.output, profile=args.export_profile)
     
     print(f"[Blender] Exported composite entity to {args.output}")
+    return args.output
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
 
 if __name__ == "__main__":
     main()
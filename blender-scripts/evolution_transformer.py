@@ -9,26 +9,55 @@ Evolution Stages:
   Era 7-9:   Medieval → Renaissance - Polished, detailed
   Era 10-11: Ancient Technology - High-tech, glowing accents, futuristic
   Era 12+:   Deity/Godhood - Bloom, divine glow, hovering, particle effects
+
+Usage: blender --background --python evolution_transformer.py -- --input base.glb --era 12 --output evolved.glb [--lod-ratios 1.0,0.5,0.25,0.1]
+Batch: blender --background --python evolution_transformer.py -- --manifest jobs.jsonl [--summary summary.json]
 """
 
 import bpy
+import os
 import sys
-import json
 import argparse
-from mathutils import Vector, Color
-import math
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+import lod_chain
+import export_profiles
+import script_defaults
+from scene_reset import cleanup_scene
+
+# Exported triangle budget per asset class (entityType of HybridContentGenerator),
+# for eras 0-3, 4-6, 7-9, 10-11 and 12+
+TRIANGLE_BUDGETS = {
+    'item': (800, 2000, 5000, 8000, 12000),
+    'loc': (2000, 6000, 15000, 30000, 45000),
+    'npc': (3000, 8000, 20000, 35000, 50000),
+    'player': (5000, 12000, 30000, 50000, 75000),
+}
+DEFAULT_ASSET_CLASS = script_defaults.DEFAULT_ASSET_CLASS
+DEFAULT_EXPORT_PROFILE = script_defaults.EVOLUTION_EXPORT_PROFILE
 
-def cleanup_scene():
-    """Remove all objects"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+def era_band(era):
+    """Index of the era band used by the per-era tables"""
+    if era <= 3:
+        return 0
+    if era <= 6:
+        return 1
+    if era <= 9:
+        return 2
+    if era <= 11:
+        return 3
+    return 4
 
-def get_era_config(era):
+def get_era_config(era, asset_class=DEFAULT_ASSET_CLASS, triangle_budget=None):
     """
     Get visual transformation config for era
     
     Note: RSC/OSRS/RS3 progression already exists in cache
     This just adds smoothing + divine effects for high eras
+    triangle_budget overrides the asset class budget for this era
     """
     
     # Smoothing levels (subdivision)
@@ -43,6 +72,20 @@ def get_era_config(era):
     else:
         subdiv = 4  # Godhood - ultra smooth
     
+    # Material family and base color tint per stage
+    if era <= 1:
+        material_type, tint = 'stone', (0.9, 0.88, 0.85)
+    elif era <= 3:
+        material_type, tint = 'crude', (0.95, 0.93, 0.9)
+    elif era <= 6:
+        material_type, tint = 'metal', (1.0, 0.97, 0.92)
+    elif era <= 9:
+        material_type, tint = 'polished', (1.0, 1.0, 1.0)
+    elif era <= 11:
+        material_type, tint = 'tech', (0.9, 0.97, 1.05)
+    else:
+        material_type, tint = 'divine', (1.1, 1.05, 0.9)
+    
     # Divine effects only for high eras
     effects = []
     emission = 0.0
@@ -55,16 +98,41 @@ def get_era_config(era):
         effects.extend(['divine_bloom', 'levitation', 'particle_aura', 'divine_rays'])
         emission = 5.0
     
+    if triangle_budget is None:
+        budgets = TRIANGLE_BUDGETS.get(asset_class, TRIANGLE_BUDGETS[DEFAULT_ASSET_CLASS])
+        triangle_budget = budgets[era_band(era)]
+    
     return {
+        'material_type': material_type,
+        'base_color_tint': tint,
         'geometry_subdiv': subdiv,
+        'triangle_budget': triangle_budget,
         'emission_strength': emission,
         'effects': effects,
         'roughness': max(0.05, 0.95 - (era * 0.075)),  # Smoother at higher eras
         'metallic': min(0.98, era * 0.08)  # More metallic at higher eras
     }
 
+def tint_color_attribute(mesh, node, tint):
+    """Multiply the colors of the attribute a Color Attribute node reads by tint, returns True if tinted"""
+    if node.type != 'VERTEX_COLOR':
+        return False
+    attr = mesh.color_attributes.get(node.layer_name) if node.layer_name else mesh.color_attributes.active_color
+    if attr is None or len(attr.data) == 0:
+        return False
+    colors = np.empty(len(attr.data) * 4, dtype=np.float32)
+    attr.data.foreach_get('color', colors)
+    colors = colors.reshape(-1, 4)
+    colors[:, :3] *= np.asarray(tint, dtype=np.float32)
+    attr.data.foreach_set('color', colors.ravel())
+    mesh.update()
+    return True
+
 def apply_evolution_materials(objects, era_config):
     """Apply era-specific materials to objects"""
+    tint = era_config['base_color_tint']
+    # Meshes whose color attribute is already tinted (shared meshes and materials tint once)
+    tinted = set()
     for obj in objects:
         if obj.type != 'MESH':
             continue
@@ -80,7 +148,6 @@ def apply_evolution_materials(objects, era_config):
                 mat.use_nodes = True
             
             nodes = mat.node_tree.nodes
-            links = mat.node_tree.links
             
             # Get or create Principled BSDF
             bsdf = nodes.get("Principled BSDF")
@@ -88,10 +155,16 @@ def apply_evolution_materials(objects, era_config):
                 bsdf = nodes.new("ShaderNodeBsdfPrincipled")
             
             # Apply base color tint
-            orig_color = bsdf.inputs['Base Color'].default_value[:3]
-            tint = era_config['base_color_tint']
-            new_color = tuple(orig_color[i] * tint[i] for i in range(3))
-            bsdf.inputs['Base Color'].default_value = (*new_color, 1.0)
+            base_color = bsdf.inputs['Base Color']
+            if base_color.is_linked:
+                # Vertex-color material: the colors live in the mesh's color attribute
+                new_color = tint
+                if obj.data.name not in tinted and tint_color_attribute(obj.data, base_color.links[0].from_node, tint):
+                    tinted.add(obj.data.name)
+            else:
+                orig_color = base_color.default_value[:3]
+                new_color = tuple(orig_color[i] * tint[i] for i in range(3))
+                base_color.default_value = (*new_color, 1.0)
             
             # Material properties
             bsdf.inputs['Roughness'].default_value = era_config['roughness']
@@ -103,17 +176,58 @@ def apply_evolution_materials(objects, era_config):
                 # Tint emission color
                 bsdf.inputs['Emission Color'].default_value = (*new_color, 1.0)
 
+def subdivided_triangles(mesh, level):
+    """Exported triangle count of mesh after Catmull-Clark subdivision at level"""
+    corners = len(mesh.loops)
+    if level == 0:
+        # An n-gon triangulates into n - 2 triangles
+        return corners - 2 * len(mesh.polygons)
+    # Level 1 turns every face corner into a quad, later levels split each quad in four
+    return 2 * corners * 4 ** (level - 1)
+
+def choose_subdivision_levels(meshes, max_level, budget):
+    """
+    Highest level per mesh (up to max_level) that keeps the total within budget
+    Small meshes pick first, their unused share carries over to denser ones, so a
+    mesh already over budget stays at level 0
+    """
+    base = {name: subdivided_triangles(mesh, 0) for name, mesh in meshes.items()}
+    levels = {}
+    remaining = budget - sum(base.values())
+    for index, name in enumerate(sorted(meshes, key=lambda n: base[n])):
+        share = max(0, remaining) / (len(meshes) - index)
+        level = 0
+        while level < max_level and subdivided_triangles(meshes[name], level + 1) - base[name] <= share:
+            level += 1
+        levels[name] = level
+        remaining -= subdivided_triangles(meshes[name], level) - base[name]
+    return levels
+
 def apply_evolution_geometry(objects, era_config):
-    """Apply geometry modifications based on era"""
-    subdiv_levels = era_config['geometry_subdiv']
+    """
+    Smooth the meshes within the era triangle budget
+    Returns the chosen levels and the triangle count they export
+    """
+    max_level = era_config['geometry_subdiv']
+    budget = era_config['triangle_budget']
+    # The edge glow shell (SOLIDIFY, added with the effects) exports every triangle twice
+    shells = 2 if 'tech_glow' in era_config['effects'] else 1
+    
+    meshes = {obj.data.name: obj.data for obj in objects if obj.type == 'MESH'}
+    levels = choose_subdivision_levels(meshes, max_level, budget // shells) if max_level > 0 else {}
+    triangles = shells * sum(subdivided_triangles(mesh, levels.get(name, 0)) for name, mesh in meshes.items())
     
-    if subdiv_levels > 0:
-        for obj in objects:
-            if obj.type == 'MESH':
-                # Add subdivision modifier for smoother geometry
-                subdiv_mod = obj.modifiers.new(name="Evolution_Subdiv", type='SUBSURF')
-                subdiv_mod.levels = subdiv_levels
-                subdiv_mod.render_levels = subdiv_levels
+    for obj in objects:
+        level = levels.get(obj.data.name, 0) if obj.type == 'MESH' else 0
+        if level > 0:
+            # Add subdivision modifier for smoother geometry
+            subdiv_mod = obj.modifiers.new(name="Evolution_Subdiv", type='SUBSURF')
+            subdiv_mod.levels = level
+            subdiv_mod.render_levels = level
+    
+    print(f"[Evolution] Subdivision levels {sorted(set(levels.values())) or [0]} "
+          f"(era max {max_level}): {triangles} triangles, budget {budget}")
+    return {'levels': levels, 'triangles': triangles, 'triangle_budget': budget}
 
 def apply_evolution_effects(objects, era_config):
     """Apply special effects based on era"""
@@ -205,7 +319,7 @@ def add_divine_particles(objects):
             continue
         
         # Add particle system
-        particle_mod = obj.modifiers.new(name="Divine_Aura", type='PARTICLE_SYSTEM')
+        obj.modifiers.new(name="Divine_Aura", type='PARTICLE_SYSTEM')
         psys = obj.particle_systems[-1]
         settings = psys.settings
         
@@ -217,47 +331,132 @@ def add_divine_particles(objects):
         settings.particle_size = 0.05
         settings.render_type = 'HALO'
 
-def main():
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
-    
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
     parser = argparse.ArgumentParser()
     parser.add_argument('--input', type=str, required=True)
     parser.add_argument('--era', type=int, required=True)
+    parser.add_argument('--entity-id', type=str, default=None, help='Entity id recorded in the asset catalog')
     parser.add_argument('--output', type=str, required=True)
+    add_budget_arguments(parser)
+    add_lod_arguments(parser)
+    export_profiles.add_arguments(parser, DEFAULT_EXPORT_PROFILE)
+    stage_log.add_arguments(parser)
+    return parser
+
+def add_budget_arguments(parser):
+    """Triangle budget selection, shared with generate_entity.py"""
+    parser.add_argument('--asset-class', type=str, default=DEFAULT_ASSET_CLASS, choices=sorted(TRIANGLE_BUDGETS))
+    parser.add_argument('--triangle-budget', type=int, default=None,
+                        help='Exported triangle budget (default: per asset class and era)')
+
+def add_lod_arguments(parser):
+    """LOD chain settings, shared with generate_entity.py"""
+    parser.add_argument('--lod-ratios', type=str, default=lod_chain.DEFAULT_RATIOS,
+                        help='Decimation ratio per LOD level, "1.0" exports no chain')
+    parser.add_argument('--lod-coverage', type=str, default=lod_chain.DEFAULT_COVERAGE,
+                        help='Minimum screen coverage per LOD level')
+
+def evolve_objects(objects, era, asset_class=DEFAULT_ASSET_CLASS, triangle_budget=None):
+    """Apply the full era transformation to objects already in the scene"""
+    # Get era configuration
+    era_config = get_era_config(era, asset_class, triangle_budget)
+    print(f"[Evolution] Material type: {era_config['material_type']}")
     
-    args = parser.parse_args(argv)
+    # Apply evolution transformations
+    with stage_log.stage('materials'):
+        apply_evolution_materials(objects, era_config)
+    with stage_log.stage('subdivision') as record:
+        geometry = apply_evolution_geometry(objects, era_config)
+        record['triangles'] = geometry['triangles']
+        record['triangle_budget'] = geometry['triangle_budget']
+    with stage_log.stage('effects'):
+        apply_evolution_effects(objects, era_config)
     
+    print(f"[Evolution] Applied era {era} transformation")
+    return era_config
+
+def export_evolved(output_path, stage='export', profile=DEFAULT_EXPORT_PROFILE):
+    """Export the whole scene (effects may add objects) as GLB"""
+    with stage_log.stage(stage, output=output_path):
+        export_profiles.export_gltf(
+            output_path,
+            profile,
+            use_selection=False,
+            # Ship the budgeted subdivision, not the base cage
+            export_apply=True
+        )
+
+def evaluated_triangles(objects):
+    """Triangle count of the objects after modifiers"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    triangles = 0
+    for obj in objects:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        mesh.calc_loop_triangles()
+        triangles += len(mesh.loop_triangles)
+        evaluated.to_mesh_clear()
+    return triangles
+
+def export_lod_chain(objects, output_path, levels, profile=DEFAULT_EXPORT_PROFILE):
+    """
+    Export LOD0 to output_path and each further level, decimated, next to it
+    levels: [(ratio, screen_coverage), ...] from lod_chain.parse_levels
+    Writes the LOD manifest when there is more than one level
+    """
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    records = []
+    for level, (ratio, coverage) in enumerate(levels):
+        decimators = []
+        if level > 0:
+            for obj in meshes:
+                # Last in the stack: collapses the subdivided (and glow shell) result
+                decimate = obj.modifiers.new(name="Evolution_LOD", type='DECIMATE')
+                decimate.decimate_type = 'COLLAPSE'
+                decimate.ratio = ratio
+                decimators.append((obj, decimate))
+        
+        export_evolved(lod_chain.level_path(output_path, level), f"export_lod{level}" if level else 'export', profile)
+        if len(levels) > 1:
+            records.append({'ratio': ratio, 'screen_coverage': coverage, 'triangles': evaluated_triangles(meshes)})
+        
+        for obj, decimate in decimators:
+            obj.modifiers.remove(decimate)
+    
+    if len(levels) == 1:
+        # No chain - drop the manifest of an earlier export to the same path
+        if os.path.exists(lod_chain.manifest_path(output_path)):
+            os.remove(lod_chain.manifest_path(output_path))
+    else:
+        path = lod_chain.write_manifest(output_path, records)
+        summary = ', '.join(f"LOD{i} {r['triangles']}" for i, r in enumerate(records))
+        print(f"[Evolution] LOD chain: {summary} triangles, manifest {path}")
+
+def run(args):
+    """Transform one model to the requested era and return the output path"""
     print(f"[Evolution] Transforming to Era {args.era}")
+    levels = lod_chain.parse_levels(args.lod_ratios, args.lod_coverage)
     
-    cleanup_scene()
+    with stage_log.stage('reset'):
+        cleanup_scene()
     
     # Load base model
-    bpy.ops.import_scene.gltf(filepath=args.input)
-    objects = list(bpy.context.selected_objects)
+    with stage_log.stage('import'):
+        bpy.ops.import_scene.gltf(filepath=args.input)
+        objects = list(bpy.context.selected_objects)
     
-    # Get era configuration
-    era_config = get_era_config(args.era)
-    print(f"[Evolution] Material type: {era_config['material_type']}")
+    evolve_objects(objects, args.era, args.asset_class, args.triangle_budget)
     
-    # Apply evolution transformations
-    apply_evolution_materials(objects, era_config)
-    apply_evolution_geometry(objects, era_config)
-    apply_evolution_effects(objects, era_config)
-    
-    print(f"[Evolution] Applied era {args.era} transformation")
-    
-    # Export
-    bpy.ops.export_scene.gltf(
-        filepath=args.output,
-        export_format='GLB',
-        use_selection=False
-    )
+    # Export (with the LOD chain)
+    export_lod_chain(objects, args.output, levels, args.export_profile)
     
     print(f"[Evolution] Exported evolved model to {args.output}")
+    return args.output
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
 
 if __name__ == "__main__":
     main()
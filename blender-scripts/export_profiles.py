@@ -0,0 +1,307 @@
+"""
+Named glTF export profiles (compression + quantization bits per attribute)
+  classic-lowpoly  Draco, coarse quantization for flat-colored RSC-style models
+  hero             Draco, fine quantization for subdivided/evolved models
+  terrain          meshopt + KHR_mesh_quantization through gltfpack (Draco without it)
+  raw              uncompressed floats (the old behaviour)
+Every script exports through export_gltf(). Blender's exporter only writes Draco, so
+meshopt profiles run gltfpack (GLTFPACK_PATH or gltfpack on PATH) on the raw export.
+The client (drei useGLTF) decodes both.
+
+Report (inside Blender): exports each fixture with every profile and compares size,
+decode time (reimport) and max vertex position error against the raw export.
+Blender cannot import meshopt, so those files are unpacked by gltfpack first (its time is
+part of the decode time, not the client's meshopt decoder); records without numbers say why
+Usage: blender --background --python export_profiles.py -- --input model.glb[,more.glb] [--profiles hero,terrain] --output report.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+
+PROFILES = {
+    'raw': {
+        'compression': None,
+    },
+    'classic-lowpoly': {
+        'compression': 'draco',
+        'level': 7,
+        'quantization': {'position': 11, 'normal': 8, 'texcoord': 10, 'color': 8, 'generic': 8},
+    },
+    'hero': {
+        'compression': 'draco',
+        'level': 6,
+        'quantization': {'position': 14, 'normal': 10, 'texcoord': 12, 'color': 10, 'generic': 12},
+    },
+    'terrain': {
+        # Large extents: 16-bit positions, meshopt decodes big meshes faster than Draco
+        'compression': 'meshopt',
+        'level': 6,
+        'quantization': {'position': 16, 'normal': 8, 'texcoord': 12, 'color': 8, 'generic': 12},
+    },
+}
+DEFAULT_PROFILE = 'classic-lowpoly'
+
+def add_arguments(parser, default=DEFAULT_PROFILE):
+    """--export-profile, added to every exporting script"""
+    parser.add_argument('--export-profile', type=str, default=default, choices=sorted(PROFILES))
+
+def draco_options(profile):
+    """export_scene.gltf keyword arguments for a Draco profile"""
+    bits = profile['quantization']
+    return {
+        'export_draco_mesh_compression_enable': True,
+        'export_draco_mesh_compression_level': profile['level'],
+        'export_draco_position_quantization': bits['position'],
+        'export_draco_normal_quantization': bits['normal'],
+        'export_draco_texcoord_quantization': bits['texcoord'],
+        'export_draco_color_quantization': bits['color'],
+        'export_draco_generic_quantization': bits['generic'],
+    }
+
+def gltfpack_path():
+    return shutil.which(os.environ.get('GLTFPACK_PATH', 'gltfpack'))
+
+def gltfpack_argv(profile, input_path, output_path):
+    """gltfpack call: meshopt compression, quantized attributes, names and extras kept"""
+    bits = profile['quantization']
+    return [
+        gltfpack_path(), '-i', input_path, '-o', output_path, '-cc',
+        '-vp', str(bits['position']), '-vt', str(bits['texcoord']),
+        '-vn', str(bits['normal']), '-vc', str(bits['color']),
+        '-kn', '-km', '-ke',
+    ]
+
+def output_compression(name):
+    """Compression export_gltf() actually writes for a profile (meshopt falls back to Draco)"""
+    compression = PROFILES[name]['compression']
+    if compression == 'meshopt' and not gltfpack_path():
+        return 'draco'
+    return compression
+
+def export_gltf(filepath, profile=DEFAULT_PROFILE, **options):
+    """Export the scene as GLB with a named profile, options go to export_scene.gltf"""
+    name = profile
+    profile = PROFILES[name]
+    compression = output_compression(name)
+
+    if compression != profile['compression']:
+        print(f"[Export] gltfpack not found, exporting profile {name} with Draco")
+
+    if compression == 'draco':
+        options.update(draco_options(profile))
+    if compression == 'meshopt':
+        raw_path = f"{filepath}.{os.getpid()}.raw.glb"
+        bpy.ops.export_scene.gltf(filepath=raw_path, export_format='GLB', **options)
+        try:
+            subprocess.run(gltfpack_argv(profile, raw_path, filepath), check=True, capture_output=True)
+        finally:
+            os.remove(raw_path)
+        return filepath
+
+    bpy.ops.export_scene.gltf(filepath=filepath, export_format='GLB', **options)
+    return filepath
+
+def world_positions(objects):
+    """World-space vertex positions of the mesh objects as an (N, 3) array"""
+    import numpy as np
+
+    chunks = []
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+        obj.data.vertices.foreach_get('co', co)
+        co = co.reshape(-1, 3)
+        matrix = np.array(obj.matrix_world)
+        chunks.append(co @ matrix[:3, :3].T + matrix[:3, 3])
+    return np.concatenate(chunks) if chunks else np.zeros((0, 3))
+
+def unpack_meshopt(path):
+    """
+    Uncompressed, unquantized copy of a meshopt GLB through gltfpack (Blender's importer
+    cannot read EXT_meshopt_compression), returns (seconds, path) or (None, None)
+    """
+    if not gltfpack_path():
+        return None, None
+    unpacked = f"{os.path.splitext(path)[0]}.unpacked.glb"
+    start = time.perf_counter()
+    completed = subprocess.run([gltfpack_path(), '-i', path, '-o', unpacked, '-noq', '-kn', '-km', '-ke'],
+                               capture_output=True)
+    if completed.returncode != 0 or not os.path.exists(unpacked):
+        print(f"[Export] gltfpack cannot decode {os.path.basename(path)}: {completed.stderr.decode(errors='replace').strip()}")
+        return None, None
+    return time.perf_counter() - start, unpacked
+
+def decode(path, compression=None):
+    """
+    Reimport a GLB into an empty scene, returns (seconds, world positions, note);
+    meshopt files are unpacked by gltfpack first and its time is included
+    """
+    from scene_reset import reset_scene
+
+    unpack_seconds = 0.0
+    note = None
+    if compression == 'meshopt':
+        unpack_seconds, unpacked = unpack_meshopt(path)
+        if unpacked is None:
+            return None, None, 'meshopt output not decoded: needs a gltfpack that reads EXT_meshopt_compression'
+        path = unpacked
+        note = 'decoded by gltfpack, then reimported'
+
+    reset_scene(verbose=False)
+    start = time.perf_counter()
+    try:
+        bpy.ops.import_scene.gltf(filepath=path)
+    except RuntimeError as e:
+        print(f"[Export] Cannot decode {os.path.basename(path)}: {e}")
+        return None, None, f"reimport failed: {e}"
+    seconds = time.perf_counter() - start + unpack_seconds
+    return seconds, world_positions(bpy.context.scene.objects), note
+
+def nearest_distances(reference, positions, chunk=4_000_000):
+    """
+    Squared distance from each position to its nearest reference vertex (NumPy only,
+    Blender ships without SciPy): candidates come from the 27 grid cells around each
+    position, the few positions farther than one cell from every candidate are brute-forced
+    """
+    import numpy as np
+
+    origin = reference.min(axis=0)
+    extent = float((reference.max(axis=0) - origin).max()) or 1.0
+    # Start at about one vertex per cell, refine while vertices crowd a few cells (surfaces)
+    size = extent / max(1.0, len(reference) ** (1 / 3))
+    for _ in range(8):
+        ref_cells = np.floor((reference - origin) / size).astype(np.int64)
+        dims = ref_cells.max(axis=0) + 3
+        keys = ((ref_cells[:, 0] + 1) * dims[1] + ref_cells[:, 1] + 1) * dims[2] + ref_cells[:, 2] + 1
+        occupied = np.unique(keys)
+        if len(reference) <= 4 * len(occupied):
+            break
+        size /= 2
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    cells = np.floor((positions - origin) / size).astype(np.int64)
+    query_keys = ((cells[:, 0] + 1) * dims[1] + cells[:, 1] + 1) * dims[2] + cells[:, 2] + 1
+    # Keys are linear in the cell, so every neighbour offset keeps this order (fast searchsorted)
+    query_order = np.argsort(query_keys, kind='stable')
+    cells, query_keys = cells[query_order], query_keys[query_order]
+    positions = positions[query_order]
+
+    best = np.full(len(positions), np.inf)
+    for offset in np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1]), axis=-1).reshape(-1, 3):
+        neighbour = cells + offset
+        inside = ((neighbour >= -1) & (neighbour <= dims - 2)).all(axis=1)
+        keys = query_keys + (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        starts = np.searchsorted(sorted_keys, keys, side='left')
+        counts = np.where(inside, np.searchsorted(sorted_keys, keys, side='right') - starts, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        queries = np.repeat(np.arange(len(positions)), counts)
+        first = np.cumsum(counts) - counts
+        candidates = order[np.repeat(starts - first, counts) + np.arange(total)]
+        distances = ((positions[queries] - reference[candidates]) ** 2).sum(axis=1)
+        # Candidates are grouped by position, one reduction per position with any
+        hit = counts > 0
+        best[hit] = np.minimum(best[hit], np.minimum.reduceat(distances, first[hit]))
+
+    # Exact only when the nearest candidate lies within one cell
+    far = np.flatnonzero(best > size * size)
+    step = max(1, chunk // len(reference))
+    for start in range(0, len(far), step):
+        block = far[start:start + step]
+        best[block] = ((positions[block, None, :] - reference[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+
+    result = np.empty_like(best)
+    result[query_order] = best
+    return result
+
+def max_position_error(reference, positions):
+    """Largest distance from a decoded vertex to the nearest reference vertex"""
+    import numpy as np
+
+    reference = np.asarray(reference, dtype=np.float64).reshape(-1, 3)
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    if not len(positions) or not len(reference):
+        return 0.0
+    return float(nearest_distances(reference, positions).max() ** 0.5)
+
+def profile_report(fixture, profiles, work_dir):
+    """Size, decode time and position error per profile for one fixture"""
+    from scene_reset import reset_scene
+
+    reset_scene(verbose=False)
+    bpy.ops.import_scene.gltf(filepath=fixture)
+    stem = os.path.splitext(os.path.basename(fixture))[0]
+    paths = {}
+    for name in ['raw'] + [p for p in profiles if p != 'raw']:
+        paths[name] = export_gltf(os.path.join(work_dir, f"{stem}.{name}.glb"), name)
+
+    raw_seconds, reference, _ = decode(paths['raw'])
+    extent = float((reference.max(axis=0) - reference.min(axis=0)).max()) if len(reference) else 0.0
+    records = []
+    for name, path in paths.items():
+        if name == 'raw':
+            seconds, positions, note = raw_seconds, reference, None
+        else:
+            seconds, positions, note = decode(path, output_compression(name))
+        error = max_position_error(reference, positions) if positions is not None else None
+        records.append({
+            'fixture': os.path.basename(fixture),
+            'profile': name,
+            'bytes': os.path.getsize(path),
+            'size_ratio': round(os.path.getsize(path) / os.path.getsize(paths['raw']), 4),
+            'decode_seconds': round(seconds, 6) if seconds is not None else None,
+            'vertices': len(positions) if positions is not None else None,
+            'max_position_error': error,
+            'relative_error': error / extent if error is not None and extent else None,
+            'note': note,
+        })
+    return records
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', type=str, required=True, help='Comma-separated GLB fixtures')
+    parser.add_argument('--profiles', type=str, default=','.join(p for p in PROFILES if p != 'raw'))
+    parser.add_argument('--output', type=str, default='export_profiles.json')
+    args = parser.parse_args(jobs.script_argv())
+
+    profiles = [p for p in args.profiles.split(',') if p]
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"Unknown profiles: {', '.join(unknown)}")
+
+    work_dir = tempfile.mkdtemp(prefix='rsc-export-')
+    results = []
+    for fixture in args.input.split(','):
+        results.extend(profile_report(fixture, profiles, work_dir))
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'fixture':<28} {'profile':<16} {'bytes':>10} {'ratio':>7} {'decode s':>9} {'max error':>10}")
+    for r in results:
+        decode_s = f"{r['decode_seconds']:.4f}" if r['decode_seconds'] is not None else 'n/a'
+        error = f"{r['max_position_error']:.2e}" if r['max_position_error'] is not None else 'n/a'
+        print(f"{r['fixture'][:28]:<28} {r['profile']:<16} {r['bytes']:>10} {r['size_ratio']:>7.3f} {decode_s:>9} {error:>10}"
+              + (f"  ({r['note']})" if r['note'] else ''))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'gltfpack': gltfpack_path(), 'results': results}, f, indent=2)
+    print(f"[Export] Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
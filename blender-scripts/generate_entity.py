@@ -0,0 +1,73 @@
+"""
+Blender Python Script: Composite + Evolution in one pass
+Runs composite_entity.py and evolution_transformer.py on the same scene, so the
+composite never goes through an intermediate GLB export/import
+Usage: blender --background --python generate_entity.py -- --models m1.gltf,m2.gltf --color-replacements [[...]] --era 12 --output evolved.glb [--base-output base.glb]
+Batch: blender --background --python generate_entity.py -- --manifest jobs.jsonl [--summary summary.json]
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+import composite_entity
+import evolution_transformer
+import lod_chain
+import export_profiles
+
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
+    parser = argparse.ArgumentParser()
+    composite_entity.add_composite_arguments(parser)
+    parser.add_argument('--era', type=int, default=0)
+    parser.add_argument('--entity-id', type=str, default=None, help='Entity id recorded in the asset catalog')
+    evolution_transformer.add_budget_arguments(parser)
+    evolution_transformer.add_lod_arguments(parser)
+    parser.add_argument('--base-output', type=str, default=None,
+                        help='Also write the un-evolved composite (for caching)')
+    parser.add_argument('--output', type=str, required=True)
+    # Default: hero when evolved, classic-lowpoly for plain composites
+    export_profiles.add_arguments(parser, default=None)
+    stage_log.add_arguments(parser)
+    return parser
+
+def run(args):
+    """Composite and evolve one entity, returns the output path"""
+    levels = lod_chain.parse_levels(args.lod_ratios, args.lod_coverage)
+    base_profile = args.export_profile or export_profiles.DEFAULT_PROFILE
+    evolved_profile = args.export_profile or evolution_transformer.DEFAULT_EXPORT_PROFILE
+    objects = composite_entity.build_composite(args)
+
+    if args.base_output:
+        composite_entity.export_composite(args.base_output, 'export_base', base_profile)
+        print(f"[Blender] Exported composite entity to {args.base_output}")
+
+    # Era 0 is the untouched composite, same as HybridContentGenerator.applyEvolutionTransform
+    if args.era == 0:
+        if args.vertex_colors:
+            with stage_log.stage('vertex_colors'):
+                composite_entity.apply_vertex_colors(objects)
+        composite_entity.export_composite(args.output, profile=base_profile)
+        print(f"[Blender] Exported composite entity to {args.output}")
+        return args.output
+
+    print(f"[Evolution] Transforming to Era {args.era}")
+    evolution_transformer.evolve_objects(objects, args.era, args.asset_class, args.triangle_budget)
+    if args.vertex_colors:
+        # After evolution, which tints the material colors being baked
+        with stage_log.stage('vertex_colors'):
+            composite_entity.apply_vertex_colors(objects)
+    evolution_transformer.export_lod_chain(objects, args.output, levels, evolved_profile)
+
+    print(f"[Evolution] Exported evolved model to {args.output}")
+    return args.output
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
+
+if __name__ == "__main__":
+    main()
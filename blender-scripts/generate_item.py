@@ -0,0 +1,29 @@
+"""
+Blender Python Script: Generate Item Models from Templates
+Templates: templates/item/<name>.json (see part_templates.py)
+Usage: blender --background --python generate_item.py -- --type sword --complexity 4 --seed 42 --output item.glb
+Variants: blender --background --python generate_item.py -- --type rune_sword --variants 6 [--separate] --output items.glb
+Batch: blender --background --python generate_item.py -- --manifest jobs.jsonl [--summary summary.json]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import template_models
+
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
+    return template_models.build_parser('item', 'sword', 4)
+
+def run(args):
+    """Generate the requested item variants and return the output path"""
+    return template_models.run('item', args)
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Blender Python Script: Generate NPC Models from Templates
+Templates: templates/npc/<name>.json (see part_templates.py)
+Usage: blender --background --python generate_npc.py -- --type humanoid --complexity 8 --seed 42 --output npc.glb
+Variants: blender --background --python generate_npc.py -- --type goblin --variants 12 [--separate] --output npcs.glb
+Batch: blender --background --python generate_npc.py -- --manifest jobs.jsonl [--summary summary.json]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import template_models
+
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
+    return template_models.build_parser('npc', 'humanoid', 8)
+
+def run(args):
+    """Generate the requested npc variants and return the output path"""
+    return template_models.run('npc', args)
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
+
+if __name__ == "__main__":
+    main()
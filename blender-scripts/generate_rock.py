@@ -0,0 +1,107 @@
+"""
+Blender Python Script: Generate Rock / Ore Node
+Usage: blender --background --python generate_rock.py -- --type copper --complexity 5 --seed 42 --output rock.glb
+Library: blender --background --python generate_rock.py -- --type iron --variants 6 [--scatter 30] --output iron_library.glb
+Batch: blender --background --python generate_rock.py -- --manifest jobs.jsonl [--summary summary.json]
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+import export_profiles
+import script_defaults
+import variant_library
+import rock_geometry
+from material_ops import vertex_color_material
+from mesh_build import mesh_from_arrays, object_from_mesh
+from scene_reset import cleanup_scene
+
+def build_rock(rock_type, complexity, seed, jitter=0.0):
+    """
+    Build a noise-displaced rock in the scene, returns the rock object (origin at its base)
+    rock_type: 'rock' or an ore (rock_geometry.ORES), ore patches are face colors
+    complexity 1-10 sets the triangle count (rock_geometry.triangle_count)
+    """
+    arrays = rock_geometry.rock_arrays(rock_type, complexity, seed, jitter)
+    mesh = mesh_from_arrays(f'Rock_{rock_type}', arrays.positions, arrays.indices,
+                            face_colors=arrays.face_colors)
+    
+    # One shared vertex-color material, every rock and ore is a single draw call
+    rock = object_from_mesh(f'Rock_{rock_type}', mesh, [vertex_color_material(roughness=0.9)])
+    rock.select_set(True)
+    return rock
+
+def export_rock(output_path, profile=export_profiles.DEFAULT_PROFILE):
+    """Export the selected rock as GLB"""
+    with stage_log.stage('export', output=output_path):
+        export_profiles.export_gltf(output_path, profile, use_selection=True)
+
+def generate_rock(rock_type, complexity, seed, output_path, profile=export_profiles.DEFAULT_PROFILE):
+    """Generate one rock using Blender"""
+    with stage_log.stage('build'):
+        build_rock(rock_type, complexity, seed)
+    
+    export_rock(output_path, profile)
+    variant_library.remove_index(output_path)
+    
+    print(f"[Blender] Rock exported to {output_path}")
+
+def generate_library(rock_type, complexity, seed, variants, output_path,
+                     profile=export_profiles.DEFAULT_PROFILE, jitter=0.2, scatter=0):
+    """Generate seeded variants of one rock type into a single GLB plus a bounds index"""
+    with stage_log.stage('build'):
+        rocks = []
+        for index in range(variants):
+            variant_seed = variant_library.variant_seed(seed, index)
+            rock = build_rock(rock_type, complexity, variant_seed, jitter)
+            rock.name = rock.data.name = f'Rock_{rock_type}_v{index}'
+            rocks.append((rock, variant_seed))
+        records = variant_library.assemble_library(f'Rock_{rock_type}', rocks, scatter, seed=seed)
+    
+    with stage_log.stage('export', output=output_path):
+        variant_library.export_library(output_path, profile)
+    index = variant_library.write_index(output_path, rock_type, records, seed=seed, complexity=complexity,
+                                        jitter=jitter, instances=scatter)
+    
+    print(f"[Blender] {variants} {rock_type} variants exported to {output_path}, index {index}")
+
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--type', type=str, default='rock', choices=sorted(rock_geometry.ORES))
+    parser.add_argument('--complexity', type=int, default=5, help='1-10, sets the triangle count')
+    parser.add_argument('--seed', type=int, default=script_defaults.DEFAULT_SEED)
+    parser.add_argument('--variants', type=int, default=1,
+                        help='Seeded variants in one GLB (library with a bounds index)')
+    parser.add_argument('--jitter', type=float, default=0.2, help='Relative size variation between variants')
+    parser.add_argument('--scatter', type=int, default=0,
+                        help='Scattered GPU instances of the variants to include')
+    parser.add_argument('--output', type=str, required=True)
+    export_profiles.add_arguments(parser)
+    stage_log.add_arguments(parser)
+    return parser
+
+def run(args):
+    """Generate one rock (or a variant library) and return the output path"""
+    print(f"[Blender] Generating rock: type={args.type}, complexity={args.complexity}, seed={args.seed} "
+          f"({rock_geometry.triangle_count(args.complexity)} triangles)")
+    
+    with stage_log.stage('reset'):
+        cleanup_scene()
+    if args.variants > 1:
+        generate_library(args.type, args.complexity, args.seed, args.variants, args.output,
+                         args.export_profile, args.jitter, args.scatter)
+    else:
+        generate_rock(args.type, args.complexity, args.seed, args.output, args.export_profile)
+    return args.output
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
+
+if __name__ == "__main__":
+    main()
@@ -1,130 +1,121 @@
 """
 Blender Python Script: Generate Procedural Tree
 Usage: blender --background --python generate_tree.py -- --type oak --complexity 5 --seed 42 --output tree.glb
+Library: blender --background --python generate_tree.py -- --type oak --variants 8 [--scatter 50] --output oak_library.glb
+Batch: blender --background --python generate_tree.py -- --manifest jobs.jsonl [--summary summary.json]
 """
 
 import bpy
+import os
 import sys
-import random
 import argparse
-from math import pi
 
-def cleanup_scene():
-    """Remove all objects from the scene"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+import export_profiles
+import script_defaults
+import variant_library
+import tree_geometry
+from mesh_build import mesh_from_arrays, object_from_mesh
+from scene_reset import cleanup_scene
 
-def generate_tree(tree_type, complexity, seed, output_path):
-    """Generate a procedural tree using Blender"""
-    
-    # Set random seed
-    random.seed(seed)
-    
-    # Tree parameters based on type
-    tree_params = {
-        'oak': {
-            'trunk_height': 2.5,
-            'trunk_radius': 0.3,
-            'crown_size': 2.0,
-            'branch_count': 8,
-            'leaf_density': 0.8,
-        },
-        'willow': {
-            'trunk_height': 3.0,
-            'trunk_radius': 0.25,
-            'crown_size': 2.5,
-            'branch_count': 12,
-            'leaf_density': 1.0,
-        },
-        'yew': {
-            'trunk_height': 4.0,
-            'trunk_radius': 0.4,
-            'crown_size': 1.5,
-            'branch_count': 6,
-            'leaf_density': 0.6,
-        },
-        'maple': {
-            'trunk_height': 3.5,
-            'trunk_radius': 0.35,
-            'crown_size': 2.2,
-            'branch_count': 10,
-            'leaf_density': 0.7,
-        },
-    }
-    
-    params = tree_params.get(tree_type, tree_params['oak'])
-    
-    # Create trunk (cylinder)
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=params['trunk_radius'],
-        depth=params['trunk_height'],
-        location=(0, 0, params['trunk_height'] / 2)
-    )
-    trunk = bpy.context.active_object
-    trunk.name = 'Trunk'
-    
-    # Add material to trunk (brown)
-    mat_trunk = bpy.data.materials.new(name="Bark")
-    mat_trunk.use_nodes = True
-    bsdf = mat_trunk.node_tree.nodes["Principled BSDF"]
-    bsdf.inputs['Base Color'].default_value = (0.3, 0.2, 0.1, 1.0)
-    trunk.data.materials.append(mat_trunk)
-    
-    # Create crown (ico sphere for simplicity, can use particles for leaves)
-    bpy.ops.mesh.primitive_ico_sphere_add(
-        subdivisions=2,
-        radius=params['crown_size'],
-        location=(0, 0, params['trunk_height'] + params['crown_size'] * 0.5)
-    )
-    crown = bpy.context.active_object
-    crown.name = 'Crown'
-    
-    # Add material to crown (green)
-    mat_crown = bpy.data.materials.new(name="Leaves")
-    mat_crown.use_nodes = True
-    bsdf_crown = mat_crown.node_tree.nodes["Principled BSDF"]
-    bsdf_crown.inputs['Base Color'].default_value = (0.2, 0.6, 0.2, 1.0)
-    crown.data.materials.append(mat_crown)
-    
-    # Join trunk and crown
-    bpy.ops.object.select_all(action='DESELECT')
-    trunk.select_set(True)
-    crown.select_set(True)
-    bpy.context.view_layer.objects.active = trunk
-    bpy.ops.object.join()
+def shared_material(name, color):
+    """Material reused by every tree in the file, so variants share it"""
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        mat.node_tree.nodes["Principled BSDF"].inputs['Base Color'].default_value = color
+    return mat
+
+def build_tree(tree_type, complexity, seed, jitter=0.0):
+    """
+    Build a procedural tree in the scene, returns the tree object (origin at its base)
+    complexity 1-10 sets the triangle count (tree_geometry.triangle_count)
+    jitter: relative random variation of the tree dimensions
+    """
+    arrays = tree_geometry.tree_arrays(tree_type, complexity, seed, jitter)
+    mesh = mesh_from_arrays(f'Tree_{tree_type}', arrays.positions, arrays.indices,
+                            material_indices=arrays.material_indices)
     
-    tree = bpy.context.active_object
-    tree.name = f'Tree_{tree_type}'
+    # Bark (brown) and leaves (green), in tree_geometry material index order
+    materials = [
+        shared_material("Bark", (0.3, 0.2, 0.1, 1.0)),
+        shared_material("Leaves", (0.2, 0.6, 0.2, 1.0)),
+    ]
+    tree = object_from_mesh(f'Tree_{tree_type}', mesh, materials)
+    tree.select_set(True)
+    return tree
+
+def export_tree(output_path, profile=export_profiles.DEFAULT_PROFILE):
+    """Export the selected tree as GLB"""
+    with stage_log.stage('export', output=output_path):
+        export_profiles.export_gltf(output_path, profile, use_selection=True)
+
+def generate_tree(tree_type, complexity, seed, output_path, profile=export_profiles.DEFAULT_PROFILE):
+    """Generate a procedural tree using Blender"""
+    with stage_log.stage('build'):
+        build_tree(tree_type, complexity, seed)
     
     # Export as GLB
-    bpy.ops.export_scene.gltf(
-        filepath=output_path,
-        export_format='GLB',
-        use_selection=True
-    )
+    export_tree(output_path, profile)
+    variant_library.remove_index(output_path)
     
     print(f"[Blender] Tree exported to {output_path}")
 
-def main():
-    # Parse arguments (everything after --)
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
+def generate_library(tree_type, complexity, seed, variants, output_path,
+                     profile=export_profiles.DEFAULT_PROFILE, jitter=0.15, scatter=0):
+    """Generate seeded variants of one species into a single GLB plus a bounds index"""
+    with stage_log.stage('build'):
+        trees = []
+        for index in range(variants):
+            variant_seed = variant_library.variant_seed(seed, index)
+            tree = build_tree(tree_type, complexity, variant_seed, jitter)
+            tree.name = tree.data.name = f'Tree_{tree_type}_v{index}'
+            trees.append((tree, variant_seed))
+        records = variant_library.assemble_library(f'Tree_{tree_type}', trees, scatter, seed=seed)
     
+    with stage_log.stage('export', output=output_path):
+        variant_library.export_library(output_path, profile)
+    index = variant_library.write_index(output_path, tree_type, records, seed=seed, complexity=complexity,
+                                        jitter=jitter, instances=scatter)
+    
+    print(f"[Blender] {variants} {tree_type} variants exported to {output_path}, index {index}")
+
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
     parser = argparse.ArgumentParser()
     parser.add_argument('--type', type=str, default='oak')
-    parser.add_argument('--complexity', type=int, default=5)
-    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--complexity', type=int, default=5, help='1-10, sets the triangle count')
+    parser.add_argument('--seed', type=int, default=script_defaults.DEFAULT_SEED)
+    parser.add_argument('--variants', type=int, default=1,
+                        help='Seeded variants in one GLB (library with a bounds index)')
+    parser.add_argument('--jitter', type=float, default=0.15, help='Relative size variation between variants')
+    parser.add_argument('--scatter', type=int, default=0,
+                        help='Scattered GPU instances of the variants to include')
     parser.add_argument('--output', type=str, required=True)
+    export_profiles.add_arguments(parser)
+    stage_log.add_arguments(parser)
+    return parser
+
+def run(args):
+    """Generate one tree and return the output path"""
+    print(f"[Blender] Generating tree: type={args.type}, complexity={args.complexity}, seed={args.seed} "
+          f"({tree_geometry.triangle_count(args.type, args.complexity)} triangles)")
     
-    args = parser.parse_args(argv)
-    
-    print(f"[Blender] Generating tree: type={args.type}, complexity={args.complexity}, seed={args.seed}")
-    
-    cleanup_scene()
-    generate_tree(args.type, args.complexity, args.seed, args.output)
+    with stage_log.stage('reset'):
+        cleanup_scene()
+    if args.variants > 1:
+        generate_library(args.type, args.complexity, args.seed, args.variants, args.output,
+                         args.export_profile, args.jitter, args.scatter)
+    else:
+        generate_tree(args.type, args.complexity, args.seed, args.output, args.export_profile)
+    return args.output
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
 
 if __name__ == "__main__":
     main()
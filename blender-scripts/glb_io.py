@@ -0,0 +1,182 @@
+"""
+GLB 2.0 container helpers (no Blender needed)
+GltfBuilder collects NumPy arrays into one binary buffer with the matching
+bufferViews/accessors, pack_glb() wraps the JSON and BIN chunks into a .glb,
+glb_chunks() walks the chunks of an existing one
+"""
+
+import json
+import struct
+import numpy as np
+
+GLB_MAGIC = 0x46546C67  # 'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A  # 'JSON'
+CHUNK_BIN = 0x004E4942  # 'BIN\0'
+
+# glTF component types
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+ACCESSOR_TYPES = {1: 'SCALAR', 2: 'VEC2', 3: 'VEC3', 4: 'VEC4', 16: 'MAT4'}
+
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+def pad4(data, fill=b'\x00'):
+    """Pad bytes to a 4-byte boundary (GLB chunks and bufferViews must be aligned)"""
+    return data + fill * (-len(data) % 4)
+
+def pack_glb(gltf, bin_data=b''):
+    """Serialize a glTF JSON dict and its binary buffer into GLB bytes"""
+    json_chunk = pad4(json.dumps(gltf, separators=(',', ':')).encode('utf-8'), b' ')
+    chunks = struct.pack('<II', len(json_chunk), CHUNK_JSON) + json_chunk
+    if bin_data:
+        bin_chunk = pad4(bytes(bin_data))
+        chunks += struct.pack('<II', len(bin_chunk), CHUNK_BIN) + bin_chunk
+    header = struct.pack('<III', GLB_MAGIC, GLB_VERSION, 12 + len(chunks))
+    return header + chunks
+
+def glb_chunks(data):
+    """
+    (chunk type, start, length) of every chunk in GLB bytes (bytes, mmap or memoryview)
+    Only the 12-byte header and the 8-byte chunk headers are read
+    """
+    if len(data) < 12:
+        raise ValueError("Not a GLB file (too short)")
+    magic, version, length = struct.unpack_from('<III', data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError("Not a GLB file (bad magic)")
+    if version != GLB_VERSION:
+        raise ValueError(f"GLB version {version} is not supported")
+    offset = 12
+    end = min(length, len(data))
+    while offset + 8 <= end:
+        chunk_length, chunk_type = struct.unpack_from('<II', data, offset)
+        yield chunk_type, offset + 8, chunk_length
+        offset += 8 + chunk_length
+
+def write_glb(path, gltf, bin_data=b''):
+    """Write a GLB file, returns its size in bytes"""
+    data = pack_glb(gltf, bin_data)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+class GltfBuilder:
+    """Accumulates buffer data and glTF objects for one GLB"""
+
+    def __init__(self, generator='RSC Evolution blender-scripts'):
+        self.gltf = {
+            'asset': {'version': '2.0', 'generator': generator},
+            'scene': 0,
+            'scenes': [{'nodes': []}],
+            'nodes': [],
+            'meshes': [],
+            'materials': [],
+            'accessors': [],
+            'bufferViews': [],
+            'buffers': [],
+        }
+        self.chunks = []
+        self.byte_length = 0
+
+    def add_buffer_view(self, data, target=None):
+        """Append raw bytes (4-byte aligned) and return the bufferView index"""
+        data = pad4(bytes(data))
+        view = {'buffer': 0, 'byteOffset': self.byte_length, 'byteLength': len(data)}
+        if target is not None:
+            view['target'] = target
+        self.chunks.append(data)
+        self.byte_length += len(data)
+        self.gltf['bufferViews'].append(view)
+        return len(self.gltf['bufferViews']) - 1
+
+    def add_accessor(self, array, target=TARGET_ARRAY_BUFFER, bounds=False, normalized=False):
+        """Add a (count, components) or (count,) array, returns the accessor index"""
+        array = np.ascontiguousarray(array)
+        components = 1 if array.ndim == 1 else array.shape[1]
+        accessor = {
+            'bufferView': self.add_buffer_view(array.tobytes(), target),
+            'componentType': COMPONENT_TYPES[array.dtype],
+            'count': int(array.shape[0]),
+            'type': ACCESSOR_TYPES[components],
+        }
+        if normalized:
+            accessor['normalized'] = True
+        if bounds:
+            # POSITION accessors must carry min/max
+            accessor['min'] = np.atleast_1d(array.min(axis=0)).tolist()
+            accessor['max'] = np.atleast_1d(array.max(axis=0)).tolist()
+        self.gltf['accessors'].append(accessor)
+        return len(self.gltf['accessors']) - 1
+
+    def add_indices(self, indices):
+        """Add triangle indices as uint16 when they fit, else uint32"""
+        indices = np.asarray(indices).reshape(-1)
+        dtype = np.uint16 if indices.size == 0 or indices.max() < 0xFFFF else np.uint32
+        return self.add_accessor(indices.astype(dtype), TARGET_ELEMENT_ARRAY_BUFFER)
+
+    def add_material(self, name, base_color, metallic=0.0, roughness=0.5, double_sided=True, **extra):
+        material = {
+            'name': name,
+            'doubleSided': double_sided,
+            'pbrMetallicRoughness': {
+                'baseColorFactor': [float(c) for c in (list(base_color) + [1.0])[:4]],
+                'metallicFactor': float(metallic),
+                'roughnessFactor': float(roughness),
+            },
+        }
+        material.update(extra)
+        self.gltf['materials'].append(material)
+        return len(self.gltf['materials']) - 1
+
+    def add_mesh(self, name, positions, indices, normals=None, uvs=None, colors=None, material=None):
+        """Add a single-primitive mesh, returns the mesh index"""
+        attributes = {'POSITION': self.add_accessor(np.asarray(positions, np.float32), bounds=True)}
+        if normals is not None:
+            attributes['NORMAL'] = self.add_accessor(np.asarray(normals, np.float32))
+        if uvs is not None:
+            attributes['TEXCOORD_0'] = self.add_accessor(np.asarray(uvs, np.float32))
+        if colors is not None:
+            attributes['COLOR_0'] = self.add_accessor(np.asarray(colors, np.float32))
+
+        primitive = {'attributes': attributes, 'indices': self.add_indices(indices)}
+        if material is not None:
+            primitive['material'] = material
+        self.gltf['meshes'].append({'name': name, 'primitives': [primitive]})
+        return len(self.gltf['meshes']) - 1
+
+    def add_node(self, name, mesh=None, translation=None, scale=None, children=None, root=True, **extra):
+        node = {'name': name}
+        if mesh is not None:
+            node['mesh'] = mesh
+        if translation is not None:
+            node['translation'] = [float(v) for v in translation]
+        if scale is not None:
+            node['scale'] = [float(v) for v in scale]
+        if children:
+            node['children'] = list(children)
+        node.update(extra)
+        self.gltf['nodes'].append(node)
+        index = len(self.gltf['nodes']) - 1
+        if root:
+            self.gltf['scenes'][0]['nodes'].append(index)
+        return index
+
+    def build(self):
+        """Return (gltf dict, binary buffer) with empty top-level arrays dropped"""
+        bin_data = b''.join(self.chunks)
+        gltf = {k: v for k, v in self.gltf.items() if v != []}
+        if bin_data:
+            gltf['buffers'] = [{'byteLength': len(bin_data)}]
+        return gltf, bin_data
+
+    def write(self, path):
+        gltf, bin_data = self.build()
+        return write_glb(path, gltf, bin_data)
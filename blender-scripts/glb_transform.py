@@ -0,0 +1,399 @@
+"""
+GLB Transform: recolor / rescale a glTF model without Blender
+The file is memory-mapped copy-on-write, accessors are zero-copy NumPy views into it and
+edits happen in place, so the output is the input with only the edited bytes changed:
+material base color factors, COLOR_n accessors and root node transforms. Geometry is
+never decoded or re-encoded (Draco/meshopt streams pass through untouched; their vertex
+colors cannot be edited here, use hybrid_modify.py --reexport for those).
+Usage:
+  python glb_transform.py --input model.glb --output out.glb --recolor '{"from": "auto", "to": "hue:30"}'
+  python glb_transform.py --input model.gltf --output out.glb --hue-shift 30 --rescale 1.5
+  python glb_transform.py --input model.glb --output out.glb --color-replacements [[6798,43072]] --base-color 0.8,0.1,0.1
+Batch: python glb_transform.py --manifest jobs.jsonl [--summary summary.json]
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import base64
+import struct
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+from glb_io import GLB_MAGIC, GLB_VERSION, CHUNK_JSON, CHUNK_BIN, COMPONENT_TYPES, ACCESSOR_TYPES, pad4, glb_chunks
+from color_ops import build_replacement_table, replace_colors, shift_hue, srgb_to_linear
+
+DTYPES = {code: dtype for dtype, code in COMPONENT_TYPES.items()}
+COMPONENTS = {name: count for count, name in ACCESSOR_TYPES.items()}
+COMPONENTS.update({'MAT2': 4, 'MAT3': 9})
+# Extensions whose primitives keep their attributes in a compressed stream
+COMPRESSED_EXTENSIONS = ('KHR_draco_mesh_compression', 'EXT_meshopt_compression')
+# Extension of each export_profiles compression
+COMPRESSION_EXTENSIONS = {'draco': 'KHR_draco_mesh_compression', 'meshopt': 'EXT_meshopt_compression'}
+IMAGE_TYPES = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.webp': 'image/webp', '.ktx2': 'image/ktx2'}
+
+def hex_to_linear(value):
+    """'#rrggbb' (sRGB, as color pickers give it) → linear RGB"""
+    value = value.lstrip('#')
+    return srgb_to_linear(np.array([int(value[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float32) / 255.0)
+
+def write_aligned(f, chunks):
+    """Write buffers back to back, each padded to 4 bytes"""
+    for data in chunks:
+        f.write(data)
+        f.write(b'\x00' * (-len(data) % 4))
+
+class GltfDocument:
+    """A parsed glTF with its buffers mapped copy-on-write (edits never reach the input file)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.maps = []
+        with open(path, 'rb') as f:
+            is_glb = f.read(4) == struct.pack('<I', GLB_MAGIC)
+        self.gltf, self.buffers = self.open_glb(path) if is_glb else self.open_gltf(path)
+
+    def map_file(self, path):
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.maps.append(mapped)
+        return mapped
+
+    def open_glb(self, path):
+        mapped = self.map_file(path)
+        gltf, buffers = None, []
+        for chunk_type, start, length in glb_chunks(mapped):
+            if chunk_type == CHUNK_JSON:
+                gltf = json.loads(bytes(mapped[start:start + length]))
+            elif chunk_type == CHUNK_BIN and not buffers:
+                buffers.append(memoryview(mapped)[start:start + length])
+        if gltf is None:
+            raise ValueError(f"{path}: no JSON chunk")
+        return gltf, buffers
+
+    def open_gltf(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            gltf = json.load(f)
+        buffers = []
+        for buffer in gltf.get('buffers', []):
+            uri = buffer.get('uri', '')
+            if uri.startswith('data:'):
+                buffers.append(memoryview(bytearray(base64.b64decode(uri.split(',', 1)[1]))))
+            else:
+                mapped = self.map_file(os.path.join(os.path.dirname(path), uri))
+                buffers.append(memoryview(mapped)[:buffer['byteLength']])
+        return gltf, buffers
+
+    def close(self):
+        # Views into the maps must go before the maps can close
+        self.buffers = []
+        for mapped in self.maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A view is still referenced (e.g. by a traceback), the map closes with it
+                pass
+        self.maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def accessor(self, index):
+        """Zero-copy (count, components) view of an accessor, None when it has no plain data"""
+        accessor = self.gltf['accessors'][index]
+        if 'bufferView' not in accessor or 'sparse' in accessor:
+            return None
+        view = self.gltf['bufferViews'][accessor['bufferView']]
+        if 'extensions' in view:
+            # EXT_meshopt_compression: the view's own bytes are a fallback, not the data
+            return None
+        dtype = DTYPES[accessor['componentType']]
+        components = COMPONENTS[accessor['type']]
+        stride = view.get('byteStride') or dtype.itemsize * components
+        return np.ndarray(
+            shape=(accessor['count'], components),
+            dtype=dtype,
+            buffer=self.buffers[view.get('buffer', 0)],
+            offset=view.get('byteOffset', 0) + accessor.get('byteOffset', 0),
+            strides=(stride, dtype.itemsize),
+        )
+
+    def color_accessors(self):
+        """Unique COLOR_n accessor indices, plus how many sit in compressed primitives"""
+        indices, compressed = [], 0
+        for mesh in self.gltf.get('meshes', []):
+            for primitive in mesh['primitives']:
+                is_compressed = any(ext in primitive.get('extensions', {}) for ext in COMPRESSED_EXTENSIONS)
+                for name, index in primitive['attributes'].items():
+                    if not name.startswith('COLOR_'):
+                        continue
+                    if is_compressed or self.accessor(index) is None:
+                        compressed += 1
+                    elif index not in indices:
+                        indices.append(index)
+        return indices, compressed
+
+    def read_colors(self, index):
+        """Float colors of a COLOR_n accessor (normalized integers → 0..1)"""
+        view = self.accessor(index)
+        if view.dtype.kind == 'f':
+            return view.astype(np.float32)
+        return view.astype(np.float32) / np.iinfo(view.dtype).max
+
+    def write_colors(self, index, colors):
+        """Store float colors back into the accessor bytes"""
+        view = self.accessor(index)
+        if view.dtype.kind != 'f':
+            colors = np.round(np.clip(colors, 0, 1) * np.iinfo(view.dtype).max)
+        view[:] = colors.astype(view.dtype)
+
+    def base_colors(self):
+        """(M, 4) base color factors of every material (glTF default white when unset)"""
+        materials = self.gltf.get('materials', [])
+        return np.array([
+            mat.get('pbrMetallicRoughness', {}).get('baseColorFactor', [1.0, 1.0, 1.0, 1.0])
+            for mat in materials
+        ], dtype=np.float32).reshape(-1, 4)
+
+    def set_base_colors(self, colors, only=None):
+        """Write changed base color factors back, only: material indices to touch"""
+        old = self.base_colors()
+        changed = 0
+        for index, (color, before) in enumerate(zip(colors, old)):
+            if (only is not None and index not in only) or np.array_equal(color, before):
+                continue
+            pbr = self.gltf['materials'][index].setdefault('pbrMetallicRoughness', {})
+            pbr['baseColorFactor'] = [round(float(c), 6) for c in color]
+            changed += 1
+        return changed
+
+    def map_colors(self, func):
+        """Apply func((N, 4|3) float colors) → (colors, hits) to materials and color accessors"""
+        colors, material_hits = func(self.base_colors())
+        materials = self.set_base_colors(colors) if material_hits else 0
+        indices, compressed = self.color_accessors()
+        vertices = 0
+        for index in indices:
+            colors, hits = func(self.read_colors(index))
+            if hits:
+                self.write_colors(index, colors)
+                vertices += hits
+        return {'materials': materials, 'vertex_colors': vertices, 'compressed_color_sets': compressed}
+
+    def shift_hue(self, degrees):
+        def shift(colors):
+            return shift_hue(colors, degrees), len(colors)
+        return self.map_colors(shift)
+
+    def replace_colors(self, old_rgb, new_rgb):
+        """old_rgb/new_rgb are linear, like every color stored in glTF"""
+        return self.map_colors(lambda colors: replace_colors(colors, old_rgb, new_rgb, linear=True))
+
+    def set_base_color(self, color, names=None):
+        """Set the base color factor of all materials, or of the named ones"""
+        color = (list(color) + [1.0])[:4]
+        materials = self.gltf.get('materials', [])
+        only = None if not names else {i for i, mat in enumerate(materials) if mat.get('name') in names}
+        return self.set_base_colors(np.tile(np.array(color, np.float32), (len(materials), 1)), only)
+
+    def root_nodes(self):
+        """Nodes no other node has as a child"""
+        children = {child for node in self.gltf.get('nodes', []) for child in node.get('children', [])}
+        return [index for index in range(len(self.gltf.get('nodes', []))) if index not in children]
+
+    def rescale(self, factor):
+        """
+        Set the scale of the root nodes to factor (absolute, like hybrid_modify's
+        apply_rescale), rotation and translation are kept
+        """
+        roots = self.root_nodes()
+        for index in roots:
+            node = self.gltf['nodes'][index]
+            if 'matrix' in node:
+                # Column-major: the first three columns are the scaled rotation axes
+                matrix = np.array(node['matrix'], dtype=np.float64).reshape(4, 4)
+                lengths = np.linalg.norm(matrix[:3, :3], axis=1)
+                matrix[:3, :3] *= (factor / np.where(lengths == 0, 1.0, lengths))[:, None]
+                node['matrix'] = matrix.ravel().tolist()
+            else:
+                node['scale'] = [float(factor)] * 3
+        return len(roots)
+
+    def compression(self):
+        """Mesh compression extension used by the file, None for plain accessors"""
+        used = self.gltf.get('extensionsUsed', [])
+        return next((ext for ext in COMPRESSED_EXTENSIONS if ext in used), None)
+
+    def embed_images(self, offset):
+        """
+        Move file / data URI images into new bufferViews placed from offset on in the
+        output buffer, returns (image bytes, end offset)
+        """
+        images = []
+        for image in self.gltf.get('images', []):
+            uri = image.pop('uri', None)
+            if uri is None:
+                continue
+            if uri.startswith('data:'):
+                header, payload = uri.split(',', 1)
+                data = base64.b64decode(payload)
+                image.setdefault('mimeType', header[5:].split(';')[0])
+            else:
+                with open(os.path.join(os.path.dirname(self.path), uri), 'rb') as f:
+                    data = f.read()
+                image.setdefault('mimeType', IMAGE_TYPES.get(os.path.splitext(uri)[1].lower(), 'image/png'))
+            image['bufferView'] = len(self.gltf['bufferViews'])
+            self.gltf['bufferViews'].append({'buffer': 0, 'byteOffset': offset, 'byteLength': len(data)})
+            offset += len(data) + (-len(data) % 4)
+            images.append(data)
+        return images, offset
+
+    def save(self, output_path):
+        """
+        Write a GLB: the JSON chunk is re-serialized, the binary chunk is the mapped buffers
+        written as they are (one for a .glb input, the .gltf buffers back to back)
+        Closes the document, returns the output size in bytes
+        """
+        gltf = self.gltf
+        views = gltf.setdefault('bufferViews', [])
+        offsets, total = [], 0
+        for buffer in self.buffers:
+            offsets.append(total)
+            total += len(buffer) + (-len(buffer) % 4)
+        for view in views:
+            view['byteOffset'] = view.get('byteOffset', 0) + offsets[view.get('buffer', 0)]
+            view['buffer'] = 0
+        images, total = self.embed_images(total)
+
+        if total:
+            gltf['buffers'] = [{'byteLength': total}]
+        else:
+            gltf.pop('buffers', None)
+        if not views:
+            gltf.pop('bufferViews')
+
+        json_chunk = pad4(json.dumps(gltf, separators=(',', ':')).encode('utf-8'), b' ')
+        length = 12 + 8 + len(json_chunk) + (8 + total if total else 0)
+
+        # Temp file + rename: the output may be the mapped input itself
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(struct.pack('<III', GLB_MAGIC, GLB_VERSION, length))
+                f.write(struct.pack('<II', len(json_chunk), CHUNK_JSON))
+                f.write(json_chunk)
+                if total:
+                    f.write(struct.pack('<II', total, CHUNK_BIN))
+                    write_aligned(f, self.buffers + images)
+            # Windows cannot replace a file that is still mapped
+            self.close()
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return length
+
+def parse_recolor(config):
+    """
+    hybrid_modify --recolor config → (hue shift degrees, (old_rgb, new_rgb) or None)
+    {"from": "auto", "to": "hue:30"} shifts the hue, {"from": "#rrggbb", "to": "#rrggbb"}
+    replaces one color
+    """
+    if not config:
+        return 0.0, None
+    if config.get('from', 'auto') == 'auto':
+        return float(str(config.get('to', 'hue:0')).split(':')[1]), None
+    old_rgb = hex_to_linear(config.get('from', '#ffffff'))[None]
+    new_rgb = hex_to_linear(config.get('to', '#ffffff'))[None]
+    return 0.0, (old_rgb, new_rgb)
+
+def can_transform(input_path, compression=False):
+    """
+    True when every color set of the model is editable here (none inside Draco/meshopt)
+    compression: 'draco', 'meshopt' or None when the output must use that compression
+    (the file keeps its own, export_profiles.output_compression() gives a profile's)
+    """
+    with GltfDocument(input_path) as doc:
+        if compression is not False and doc.compression() != COMPRESSION_EXTENSIONS.get(compression):
+            return False
+        return doc.color_accessors()[1] == 0
+
+def transform_glb(input_path, output_path, hue_shift=0.0, replacements=(), base_color=None,
+                  materials=None, rescale=1.0, recolor=None):
+    """Apply the edits to input_path and write output_path, returns a result summary"""
+    stats = {}
+    with GltfDocument(input_path) as doc:
+        recolor_shift, recolor_pair = parse_recolor(recolor)
+        if replacements:
+            with stage_log.stage('recolor'):
+                stats['replace'] = doc.replace_colors(*build_replacement_table(replacements, linear=True))
+        if recolor_pair is not None:
+            with stage_log.stage('recolor'):
+                stats['recolor'] = doc.replace_colors(*recolor_pair)
+        if hue_shift or recolor_shift:
+            with stage_log.stage('hue_shift'):
+                stats['hue_shift'] = doc.shift_hue(hue_shift + recolor_shift)
+        if base_color is not None:
+            stats['base_color'] = doc.set_base_color(base_color, materials)
+        if rescale != 1.0:
+            stats['rescaled_roots'] = doc.rescale(rescale)
+        with stage_log.stage('export', output=output_path):
+            stats['bytes'] = doc.save(output_path)
+    return stats
+
+def build_parser():
+    """Argument parser, the hybrid_modify.py flags plus direct color edits"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', type=str, required=True, help='.glb or .gltf')
+    parser.add_argument('--output', type=str, required=True, help='Output .glb')
+    parser.add_argument('--recolor', type=str, default='{}',
+                        help='hybrid_modify config: {"from": "auto", "to": "hue:30"} or {"from": "#hex", "to": "#hex"}')
+    parser.add_argument('--rescale', type=float, default=1.0)
+    parser.add_argument('--hue-shift', type=float, default=0.0, help='Degrees')
+    parser.add_argument('--color-replacements', type=str, default='[]',
+                        help='JSON [[oldColorId, newColorId], ...] (RS palette ids)')
+    parser.add_argument('--base-color', type=str, default=None, help='r,g,b[,a] linear base color factor')
+    parser.add_argument('--materials', type=str, default=None,
+                        help='Comma-separated material names --base-color applies to (default all)')
+    stage_log.add_arguments(parser)
+    return parser
+
+def run(args):
+    """Transform one model and return the output path"""
+    start = time.perf_counter()
+    stats = transform_glb(
+        args.input,
+        args.output,
+        hue_shift=args.hue_shift,
+        replacements=json.loads(args.color_replacements),
+        base_color=[float(c) for c in args.base_color.split(',')] if args.base_color else None,
+        materials=args.materials.split(',') if args.materials else None,
+        rescale=args.rescale,
+        recolor=json.loads(args.recolor),
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    skipped = max((s.get('compressed_color_sets', 0) for s in stats.values() if isinstance(s, dict)), default=0)
+    if skipped:
+        print(f"[GLB] Warning: {skipped} compressed color sets left unchanged (hybrid_modify.py --reexport edits those)")
+    print(f"[GLB] {args.input} → {args.output} ({stats['bytes']} bytes, {elapsed:.1f} ms) {json.dumps(stats)}")
+    return args.output
+
+def main():
+    # Plain Python: every argument is the script's. Single job, or every job of a --manifest
+    jobs.main_with_manifest(sys.modules[__name__], sys.argv[1:])
+
+if __name__ == "__main__":
+    main()
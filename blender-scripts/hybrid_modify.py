@@ -2,18 +2,26 @@
 Blender Python Script: Hybrid Model Modifier
 Loads RSMV models and applies modifications
 Usage: blender --background --python hybrid_modify.py -- --input model.gltf --output modified.glb --recolor {...}
+Batch: blender --background --python hybrid_modify.py -- --manifest jobs.jsonl [--summary summary.json]
+Recolor and rescale go through glb_transform.py (no import/export, milliseconds) unless
+--reexport is given, the model's vertex colors are Draco/meshopt compressed or the model
+does not already use the compression of --export-profile.
+Without Blender: python glb_transform.py --input model.gltf --output modified.glb --recolor {...}
 """
 
 import bpy
+import os
 import sys
 import json
 import argparse
 from mathutils import Color
 
-def cleanup_scene():
-    """Remove all objects"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+import stage_log
+import export_profiles
+import glb_transform
+from scene_reset import cleanup_scene
 
 def load_model(input_path):
     """Load GLTF model from RSMV"""
@@ -60,40 +68,50 @@ def apply_rescale(objects, scale):
     for obj in objects:
         obj.scale = (scale, scale, scale)
 
-def main():
-    # Parse arguments (everything after --)
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
-    
+def build_parser():
+    """Argument parser shared by the CLI entry point and blender_worker.py"""
     parser = argparse.ArgumentParser()
     parser.add_argument('--input', type=str, default='none')
     parser.add_argument('--output', type=str, required=True)
     parser.add_argument('--recolor', type=str, default='{}')
     parser.add_argument('--rescale', type=float, default=1.0)
-    
-    args = parser.parse_args(argv)
-    
+    parser.add_argument('--reexport', action='store_true',
+                        help='Import and re-export through Blender (applies --export-profile) instead of editing the file')
+    export_profiles.add_arguments(parser)
+    stage_log.add_arguments(parser)
+    return parser
+
+def run(args):
+    """Apply the requested modifications and return the output path"""
     print(f"[Blender] Hybrid modification: {args.input} → {args.output}")
     
-    cleanup_scene()
+    # Material factors, color attributes and root transforms only: edit the file directly,
+    # when it already has the compression the export profile would write
+    if (args.input != 'none' and not args.reexport and
+            glb_transform.can_transform(args.input, export_profiles.output_compression(args.export_profile))):
+        glb_transform.transform_glb(args.input, args.output, rescale=args.rescale, recolor=json.loads(args.recolor))
+        print(f"[Blender] Modified without re-export to {args.output}")
+        return args.output
+    
+    with stage_log.stage('reset'):
+        cleanup_scene()
     
     # Load base model or create procedural
-    if args.input != 'none':
-        objects = load_model(args.input)
-        print(f"[Blender] Loaded {len(objects)} objects from RSMV")
-    else:
-        # Fallback: Create simple procedural model
-        bpy.ops.mesh.primitive_cube_add(size=2)
-        objects = [bpy.context.active_object]
-        print("[Blender] Created procedural base model")
+    with stage_log.stage('import'):
+        if args.input != 'none':
+            objects = load_model(args.input)
+            print(f"[Blender] Loaded {len(objects)} objects from RSMV")
+        else:
+            # Fallback: Create simple procedural model
+            bpy.ops.mesh.primitive_cube_add(size=2)
+            objects = [bpy.context.active_object]
+            print("[Blender] Created procedural base model")
     
     # Apply modifications
     recolor_config = json.loads(args.recolor)
     if recolor_config:
-        apply_recolor(objects, recolor_config)
+        with stage_log.stage('recolor'):
+            apply_recolor(objects, recolor_config)
         print(f"[Blender] Applied recolor")
     
     if args.rescale != 1.0:
@@ -101,13 +119,15 @@ def main():
         print(f"[Blender] Rescaled to {args.rescale}x")
     
     # Export as GLB
-    bpy.ops.export_scene.gltf(
-        filepath=args.output,
-        export_format='GLB',
-        use_selection=False
-    )
+    with stage_log.stage('export', output=args.output):
+        export_profiles.export_gltf(args.output, args.export_profile, use_selection=False)
     
     print(f"[Blender] Exported to {args.output}")
+    return args.output
+
+def main():
+    # Single job, or every job of a --manifest in this session
+    jobs.main_with_manifest(sys.modules[__name__])
 
 if __name__ == "__main__":
     main()
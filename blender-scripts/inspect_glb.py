@@ -0,0 +1,344 @@
+"""
+GLB Inspector (no Blender needed)
+Memory-maps each model and decodes only its JSON chunk: triangle, vertex and material
+counts, world bounds and where the bytes go (geometry, images, animation, unreferenced)
+all come from accessor and bufferView metadata, the binary chunk is never read.
+Usage:
+  python inspect_glb.py public/models/goblin.glb            # node tree and stats of one model
+  python inspect_glb.py --scan [dirs...] [--top 20] [--sort bytes] [--json report.json]
+--scan defaults to public/models (hybrid/ and generated/ included) and inspects files in
+parallel worker processes.
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from glb_io import CHUNK_JSON, CHUNK_BIN, glb_chunks
+
+COMPRESSION_EXTENSIONS = ('KHR_draco_mesh_compression', 'EXT_meshopt_compression', 'KHR_mesh_quantization')
+DEFAULT_ROOTS = ('public/models',)
+MODEL_EXTENSIONS = ('.glb', '.gltf')
+# Bloat flags: only raised above FLAG_MIN_BYTES of the part concerned
+FLAG_MIN_BYTES = 64 * 1024
+UNCOMPRESSED_FLAG_BYTES = 256 * 1024
+GEOMETRY_BYTES_PER_TRIANGLE = 64
+JSON_SHARE = 0.25
+
+def read_gltf(path):
+    """(glTF JSON, JSON chunk bytes, binary bytes) - GLB files are mapped, not read"""
+    if path.lower().endswith('.gltf'):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        gltf = json.loads(text)
+        binary = 0
+        for buffer in gltf.get('buffers', []):
+            uri = buffer.get('uri', '')
+            binary += buffer.get('byteLength', 0) if uri.startswith('data:') or not uri else \
+                os.path.getsize(os.path.join(os.path.dirname(path), uri))
+        return gltf, len(text), binary
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            gltf, json_bytes, binary = None, 0, 0
+            for chunk_type, start, length in glb_chunks(mapped):
+                if chunk_type == CHUNK_JSON:
+                    gltf = json.loads(mapped[start:start + length])
+                    json_bytes = length
+                elif chunk_type == CHUNK_BIN:
+                    binary += length
+    if gltf is None:
+        raise ValueError("no JSON chunk")
+    return gltf, json_bytes, binary
+
+def primitive_triangles(gltf, primitive):
+    """Triangles drawn by one primitive (points and lines count 0)"""
+    mode = primitive.get('mode', 4)
+    if 'indices' in primitive:
+        count = gltf['accessors'][primitive['indices']]['count']
+    else:
+        count = gltf['accessors'][primitive['attributes']['POSITION']]['count']
+    if mode == 4:
+        return count // 3
+    if mode in (5, 6):
+        return max(count - 2, 0)
+    return 0
+
+def node_matrix(node):
+    """Local 4x4 transform of a node (matrix, or translation/rotation/scale)"""
+    if 'matrix' in node:
+        return np.array(node['matrix'], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get('rotation', [0.0, 0.0, 0.0, 1.0])
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation * np.asarray(node.get('scale', [1.0, 1.0, 1.0]))
+    matrix[:3, 3] = node.get('translation', [0.0, 0.0, 0.0])
+    return matrix
+
+def mesh_instances(gltf):
+    """(mesh index, world matrix, instance count) for every node drawing a mesh in the scene"""
+    nodes = gltf.get('nodes', [])
+    if 'scenes' in gltf:
+        roots = gltf['scenes'][gltf.get('scene', 0)].get('nodes', [])
+    else:
+        children = {child for node in nodes for child in node.get('children', [])}
+        roots = [index for index in range(len(nodes)) if index not in children]
+
+    instances = []
+    pending = [(index, np.eye(4)) for index in roots]
+    while pending:
+        index, parent = pending.pop()
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        if 'mesh' in node:
+            gpu = node.get('extensions', {}).get('EXT_mesh_gpu_instancing')
+            count = gltf['accessors'][next(iter(gpu['attributes'].values()))]['count'] if gpu else 1
+            instances.append((node['mesh'], world, count))
+        pending.extend((child, world) for child in node.get('children', []))
+    return instances
+
+def world_bounds(gltf, instances):
+    """Scene AABB from the POSITION min/max of every instance (8 corners transformed)"""
+    lows, highs = [], []
+    for mesh, world, _ in instances:
+        for primitive in gltf['meshes'][mesh]['primitives']:
+            accessor = gltf['accessors'][primitive['attributes']['POSITION']]
+            if 'min' not in accessor or 'max' not in accessor:
+                continue
+            lo, hi = np.array(accessor['min'][:3]), np.array(accessor['max'][:3])
+            corners = np.array([[(lo, hi)[(i >> axis) & 1][axis] for axis in range(3)] for i in range(8)])
+            points = corners @ world[:3, :3].T + world[:3, 3]
+            lows.append(points.min(axis=0))
+            highs.append(points.max(axis=0))
+    if not lows:
+        return None
+    return {
+        'min': [round(float(v), 4) for v in np.min(lows, axis=0)],
+        'max': [round(float(v), 4) for v in np.max(highs, axis=0)],
+    }
+
+def byte_usage(gltf):
+    """Bytes per purpose, by which objects reference each bufferView"""
+    views = gltf.get('bufferViews', [])
+    purpose = [None] * len(views)
+
+    def mark(view, kind):
+        if view is not None and purpose[view] is None:
+            purpose[view] = kind
+
+    accessors = gltf.get('accessors', [])
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh['primitives']:
+            for index in list(primitive['attributes'].values()) + [primitive.get('indices')]:
+                if index is not None:
+                    mark(accessors[index].get('bufferView'), 'geometry')
+            for target in primitive.get('targets', []):
+                for index in target.values():
+                    mark(accessors[index].get('bufferView'), 'geometry')
+            draco = primitive.get('extensions', {}).get('KHR_draco_mesh_compression')
+            if draco:
+                mark(draco['bufferView'], 'geometry')
+    for image in gltf.get('images', []):
+        mark(image.get('bufferView'), 'images')
+    for animation in gltf.get('animations', []):
+        for sampler in animation.get('samplers', []):
+            mark(accessors[sampler['input']].get('bufferView'), 'animation')
+            mark(accessors[sampler['output']].get('bufferView'), 'animation')
+    for skin in gltf.get('skins', []):
+        if 'inverseBindMatrices' in skin:
+            mark(accessors[skin['inverseBindMatrices']].get('bufferView'), 'skins')
+    for node in gltf.get('nodes', []):
+        gpu = node.get('extensions', {}).get('EXT_mesh_gpu_instancing')
+        for index in (gpu or {}).get('attributes', {}).values():
+            mark(accessors[index].get('bufferView'), 'instances')
+
+    usage = {}
+    for view, kind in zip(views, purpose):
+        kind = kind or 'unreferenced'
+        usage[kind] = usage.get(kind, 0) + view['byteLength']
+    return usage
+
+def inspect(path):
+    """Stats of one model from its JSON chunk, an {"error"} record when it cannot be read"""
+    record = {'path': path, 'bytes': os.path.getsize(path)}
+    try:
+        gltf, json_bytes, binary = read_gltf(path)
+    except (OSError, ValueError) as e:
+        record['error'] = str(e)
+        return record
+
+    meshes = gltf.get('meshes', [])
+    accessors = gltf.get('accessors', [])
+    mesh_triangles = [sum(primitive_triangles(gltf, p) for p in mesh['primitives']) for mesh in meshes]
+    # Vertices per unique POSITION accessor (primitives may share one)
+    positions = {p['attributes']['POSITION'] for mesh in meshes for p in mesh['primitives'] if 'POSITION' in p['attributes']}
+    instances = mesh_instances(gltf)
+    extensions = gltf.get('extensionsUsed', [])
+    usage = byte_usage(gltf)
+
+    record.update({
+        'json_bytes': json_bytes,
+        'bin_bytes': binary,
+        'nodes': len(gltf.get('nodes', [])),
+        'meshes': len(meshes),
+        'primitives': sum(len(mesh['primitives']) for mesh in meshes),
+        'materials': len(gltf.get('materials', [])),
+        'textures': len(gltf.get('textures', [])),
+        'images': len(gltf.get('images', [])),
+        'animations': len(gltf.get('animations', [])),
+        'triangles': sum(mesh_triangles),
+        'scene_triangles': sum(mesh_triangles[mesh] * count for mesh, _, count in instances),
+        'vertices': sum(accessors[index]['count'] for index in positions),
+        'bounds': world_bounds(gltf, instances),
+        'usage': usage,
+        'compression': [ext for ext in extensions if ext in COMPRESSION_EXTENSIONS],
+        'extensions': extensions,
+    })
+    record['bytes_per_triangle'] = round(record['bytes'] / record['triangles'], 1) if record['triangles'] else None
+
+    flags = []
+    if usage.get('unreferenced'):
+        flags.append('unreferenced-bytes')
+    if not record['compression'] and usage.get('geometry', 0) > UNCOMPRESSED_FLAG_BYTES:
+        flags.append('uncompressed')
+    geometry = usage.get('geometry', 0)
+    if geometry > FLAG_MIN_BYTES and geometry > GEOMETRY_BYTES_PER_TRIANGLE * max(record['triangles'], 1):
+        flags.append('geometry-bytes-per-triangle')
+    if usage.get('images', 0) > FLAG_MIN_BYTES and usage['images'] > record['bytes'] / 2:
+        flags.append('texture-heavy')
+    if json_bytes > FLAG_MIN_BYTES and json_bytes > JSON_SHARE * record['bytes']:
+        flags.append('json-heavy')
+    used_materials = {p.get('material') for mesh in meshes for p in mesh['primitives']}
+    if record['materials'] > len(used_materials - {None}):
+        flags.append('unused-materials')
+    record['flags'] = flags
+    return record
+
+def model_files(roots):
+    """Every .glb/.gltf below the roots, each once"""
+    seen = set()
+    files = []
+    for root in roots:
+        if os.path.isfile(root):
+            candidates = [root]
+        else:
+            candidates = (
+                os.path.join(dirpath, name)
+                for dirpath, _, names in os.walk(root)
+                for name in sorted(names)
+            )
+        for path in candidates:
+            real = os.path.realpath(path)
+            if path.lower().endswith(MODEL_EXTENSIONS) and real not in seen:
+                seen.add(real)
+                files.append(path)
+    return files
+
+def scan(roots, jobs=None):
+    """Inspect every model below roots in worker processes"""
+    files = model_files(roots)
+    if len(files) < 64 or jobs == 1:
+        return [inspect(path) for path in files]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(inspect, files, chunksize=max(1, len(files) // (4 * (jobs or os.cpu_count() or 1)))))
+
+def summarize(records, roots):
+    """Totals overall and per directory"""
+    ok = [r for r in records if 'error' not in r]
+    directories = {}
+    for record in ok:
+        directory = os.path.dirname(record['path'])
+        entry = directories.setdefault(directory, {'files': 0, 'bytes': 0, 'triangles': 0})
+        entry['files'] += 1
+        entry['bytes'] += record['bytes']
+        entry['triangles'] += record['triangles']
+    flags = {}
+    for record in ok:
+        for flag in record['flags']:
+            flags[flag] = flags.get(flag, 0) + 1
+    return {
+        'roots': list(roots),
+        'files': len(records),
+        'errors': len(records) - len(ok),
+        'bytes': sum(r['bytes'] for r in ok),
+        'triangles': sum(r['triangles'] for r in ok),
+        'unreferenced_bytes': sum(r['usage'].get('unreferenced', 0) for r in ok),
+        'flags': flags,
+        'directories': directories,
+    }
+
+def print_tree(path):
+    """Node tree with mesh triangle counts, then the stats of one model"""
+    gltf, _, _ = read_gltf(path)
+    meshes = gltf.get('meshes', [])
+    nodes = gltf.get('nodes', [])
+    materials = gltf.get('materials', [])
+    children = {child for node in nodes for child in node.get('children', [])}
+
+    print(f"[Inspect] {path}")
+    pending = [(index, 0) for index in reversed(range(len(nodes))) if index not in children]
+    while pending:
+        index, depth = pending.pop()
+        node = nodes[index]
+        line = f"{'  ' * (depth + 1)}[{index}] {node.get('name', '<unnamed>')}"
+        if 'mesh' in node:
+            mesh = meshes[node['mesh']]
+            triangles = sum(primitive_triangles(gltf, p) for p in mesh['primitives'])
+            names = [materials[p['material']].get('name', p['material']) if 'material' in p else '-' for p in mesh['primitives']]
+            line += f" -> mesh {mesh.get('name', node['mesh'])} ({triangles} tris, materials: {', '.join(map(str, names))})"
+        print(line)
+        pending.extend((child, depth + 1) for child in reversed(node.get('children', [])))
+
+    record = inspect(path)
+    print(json.dumps({k: v for k, v in record.items() if k != 'path'}, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('paths', nargs='*', help='Model to inspect, or directories/files with --scan')
+    parser.add_argument('--scan', action='store_true', help=f"Scan directories (default: {', '.join(DEFAULT_ROOTS)})")
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--sort', type=str, default='bytes', choices=['bytes', 'triangles', 'bytes_per_triangle'])
+    parser.add_argument('--top', type=int, default=20, help='Largest models to list')
+    parser.add_argument('--json', type=str, default=None, help='Write every record and the summary here')
+    args = parser.parse_args()
+
+    if not args.scan:
+        if len(args.paths) != 1:
+            parser.error('give one model, or --scan')
+        print_tree(args.paths[0])
+        return
+
+    roots = args.paths or list(DEFAULT_ROOTS)
+    start = time.perf_counter()
+    records = scan(roots, args.jobs)
+    summary = summarize(records, roots)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    ranked = sorted((r for r in records if 'error' not in r), key=lambda r: r[args.sort] or 0, reverse=True)
+    for record in ranked[:args.top]:
+        print(f"  {record['bytes']:>10}  {record['triangles']:>8} tris  {record['materials']:>3} mats  "
+              f"{record['path']}  {' '.join(record['flags'])}")
+    for record in records:
+        if 'error' in record:
+            print(f"  ERROR {record['path']}: {record['error']}")
+    print(f"[Inspect] {summary['files']} models, {summary['bytes']} bytes, {summary['triangles']} triangles, "
+          f"{summary['unreferenced_bytes']} unreferenced bytes, flags {json.dumps(summary['flags'])} ({elapsed:.1f} ms)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'models': records}, f, indent=2)
+        print(f"[Inspect] Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+"""
+Blender Job Scheduler
+One queue in front of persistent Blender workers (blender_worker.py) for live and bulk generation
+Runs under plain Python - it only starts Blender, it does not need bpy
+Usage:
+  python job_scheduler.py [--workers 4] [--cache]                         (jobs on stdin)
+  python job_scheduler.py --socket 127.0.0.1:8766                         (jobs over TCP)
+  python job_scheduler.py --manifest jobs.jsonl --script generate_entity  (bulk run, like blender_pool.py)
+
+Protocol: the blender_worker.py job records plus "priority":
+  {"id": "oak-1", "script": "generate_tree", "priority": "interactive", "args": {...}}
+  {"command": "stats"} / {"command": "ping"} / {"command": "shutdown"}
+Results come back as they finish (not in request order), one JSON line per request
+(prefixed with RESULT_PREFIX on stdout). Each carries the request id, "priority",
+"queue_time" and "coalesced".
+
+Priority classes: interactive jobs always start before queued bulk jobs, and bulk jobs
+may only use --bulk-limit workers (default: all but one, at least one; a worker is
+always left to interactive jobs, so one worker becomes two), so a live request never
+waits for a whole bulk rebuild. Requests with the same asset_cache.py job key while one
+is queued or running share that execution. An interactive request promotes a queued
+bulk job, and outputs written to other paths are copied.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import itertools
+import threading
+import socketserver
+from collections import deque
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import jobs
+from asset_cache import AssetCache, DEFAULT_CACHE_DIR, companion_files, normalize_args, retarget_companions
+from blender_pool import WorkerProcess, DEFAULT_BLENDER, run_on_worker
+from blender_worker import RESULT_PREFIX
+
+# Dispatch order: earlier classes start first
+PRIORITIES = ('interactive', 'bulk')
+DEFAULT_PRIORITY = 'bulk'
+DEFAULT_SOCKET = '127.0.0.1:8766'
+# Queue times kept per class for the percentiles
+METRIC_WINDOW = 1000
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+def copy_outputs(source_args, target_args):
+    """Copy the outputs (and companions) written for source_args to the paths in target_args"""
+    _, _, sources = normalize_args(source_args)
+    _, _, targets = normalize_args(target_args)
+    for name, target in targets.items():
+        source = sources.get(name)
+        if not source or os.path.abspath(source) == os.path.abspath(target):
+            continue
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        # Separate variant exports write no GLB at the output path, only companions
+        if os.path.exists(source):
+            shutil.copyfile(source, target)
+        source_stem, target_stem = os.path.splitext(source)[0], os.path.splitext(target)[0]
+        for companion in companion_files(source):
+            shutil.copyfile(companion, target_stem + companion[len(source_stem):])
+        retarget_companions(target)
+
+class Execution:
+    """One job run shared by every request with its key"""
+
+    def __init__(self, key, job, priority):
+        self.key = key
+        self.job = job
+        self.priority = priority
+        # (request job, priority, future, submit time)
+        self.requests = []
+        self.started = None
+
+class ClassMetrics:
+    """Counters and recent queue/run times of one priority class"""
+
+    def __init__(self):
+        self.submitted = 0
+        self.coalesced = 0
+        self.promoted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_times = deque(maxlen=METRIC_WINDOW)
+        self.run_times = deque(maxlen=METRIC_WINDOW)
+
+    def snapshot(self):
+        return {
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'promoted': self.promoted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'queue_time_p50': percentile(self.queue_times, 0.5),
+            'queue_time_p95': percentile(self.queue_times, 0.95),
+            'queue_time_max': round(max(self.queue_times), 4) if self.queue_times else None,
+            'run_time_avg': round(sum(self.run_times) / len(self.run_times), 4) if self.run_times else None,
+        }
+
+class JobScheduler:
+    """
+    Priority queue with in-flight coalescing over N Blender workers
+    limits: {priority: max concurrent executions}, defaults to every worker for
+    interactive jobs and all but one (at least one) for bulk jobs; workers is raised
+    to bulk limit + 1 so interactive jobs always have a free worker
+    worker_factory: callable(name) returning a WorkerProcess-like object
+    """
+
+    def __init__(self, workers=None, limits=None, timeout=300, blender_path=DEFAULT_BLENDER, cache=None,
+                 worker_factory=None):
+        self.limits = dict(limits or {})
+        # Bulk work always leaves a worker to interactive jobs: a single worker gets a second one
+        bulk = max(1, self.limits.get('bulk') or (workers or os.cpu_count() or 1) - 1)
+        self.workers = max(workers or os.cpu_count() or 1, bulk + 1)
+        self.limits['bulk'] = bulk
+        self.limits.setdefault('interactive', self.workers)
+        self.timeout = timeout
+        self.cache = cache
+        # Keys only, the directory is not touched without --cache
+        self.keys = cache or AssetCache()
+        self.worker_factory = worker_factory or (lambda name: WorkerProcess(blender_path, name))
+
+        self.condition = threading.Condition()
+        self.queues = {priority: deque() for priority in PRIORITIES}
+        self.running = {priority: 0 for priority in PRIORITIES}
+        self.in_flight = {}
+        self.metrics = {priority: ClassMetrics() for priority in PRIORITIES}
+        self.unhashed = itertools.count()
+        self.stopping = False
+        self.threads = []
+        self.started = time.perf_counter()
+
+    def start(self):
+        for i in range(self.workers):
+            worker = self.worker_factory(f"worker-{i}")
+            thread = threading.Thread(target=self._worker_loop, args=(worker,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        print(f"[Scheduler] {self.workers} Blender workers, limits {self.limits}")
+        return self
+
+    def job_key(self, job):
+        """Cache key of a job, a unique key when its inputs cannot be hashed"""
+        try:
+            return self.keys.job_key(job['script'], job['args'])
+        except OSError:
+            return f"unhashed-{next(self.unhashed)}"
+
+    def submit(self, job, priority=None):
+        """Queue a job (or join the identical one in flight), returns a Future of its result record"""
+        priority = priority or job.get('priority') or DEFAULT_PRIORITY
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})")
+        job = dict(job)
+        job.pop('priority', None)
+        job['id'] = job.get('id')
+        job['script'] = job.get('script')
+        if not job['script']:
+            raise ValueError("Job has no 'script'")
+        job['args'] = jobs.job_args(job)
+        key = self.job_key(job)
+
+        future = Future()
+        with self.condition:
+            if self.stopping:
+                raise RuntimeError("Scheduler is shutting down")
+            metrics = self.metrics[priority]
+            metrics.submitted += 1
+            execution = self.in_flight.get(key)
+            if execution is None:
+                execution = Execution(key, job, priority)
+                self.in_flight[key] = execution
+                self.queues[priority].append(execution)
+            else:
+                metrics.coalesced += 1
+                if execution.started is None and PRIORITIES.index(priority) < PRIORITIES.index(execution.priority):
+                    # Still queued behind bulk work: move it to the faster class
+                    self.queues[execution.priority].remove(execution)
+                    self.queues[priority].append(execution)
+                    execution.priority = priority
+                    metrics.promoted += 1
+            execution.requests.append((job, priority, future, time.perf_counter()))
+            self.condition.notify_all()
+        return future
+
+    def _next_execution(self):
+        """First queued execution of the highest class with a free slot (lock held)"""
+        for priority in PRIORITIES:
+            if self.queues[priority] and self.running[priority] < self.limits[priority]:
+                return self.queues[priority].popleft()
+        return None
+
+    def _worker_loop(self, worker):
+        while True:
+            with self.condition:
+                execution = self._next_execution()
+                while execution is None:
+                    if self.stopping and not any(self.queues.values()):
+                        break
+                    self.condition.wait()
+                    execution = self._next_execution()
+                if execution is None:
+                    break
+                execution.started = time.perf_counter()
+                self.running[execution.priority] += 1
+
+            try:
+                record = run_on_worker(worker, execution.job, self.timeout, self.cache,
+                                       None if execution.key.startswith('unhashed-') else execution.key)
+            except Exception as e:
+                record = {'ok': False, 'error': str(e) or e.__class__.__name__}
+
+            with self.condition:
+                self.running[execution.priority] -= 1
+                # Later identical requests start a new execution (their outputs may be gone)
+                del self.in_flight[execution.key]
+                idle = not self.in_flight
+                self.condition.notify_all()
+            if idle:
+                # catalog.json is exported once the queue drains, not after every job
+                jobs.export_catalog()
+            self._finish(execution, record)
+        worker.stop()
+
+    def _finish(self, execution, record):
+        """Answer every request of an execution"""
+        finished = time.perf_counter()
+        self.metrics[execution.priority].run_times.append(finished - execution.started)
+        for index, (job, priority, future, submitted) in enumerate(execution.requests):
+            result = dict(record)
+            result['id'] = job.get('id')
+            result['priority'] = priority
+            result['coalesced'] = index > 0
+            result['queue_time'] = round(max(0.0, execution.started - submitted), 4)
+            if index > 0 and record['ok']:
+                try:
+                    copy_outputs(execution.job['args'], job['args'])
+                except OSError as e:
+                    result.update(ok=False, error=f"Copying shared outputs failed: {e}")
+
+            metrics = self.metrics[priority]
+            with self.condition:
+                metrics.queue_times.append(result['queue_time'])
+                if result['ok']:
+                    metrics.completed += 1
+                else:
+                    metrics.failed += 1
+            future.set_result(result)
+
+    def stats(self):
+        """Queue depth, running executions and per-class metrics"""
+        with self.condition:
+            return {
+                'workers': self.workers,
+                'limits': dict(self.limits),
+                'queued': {priority: len(queue) for priority, queue in self.queues.items()},
+                'running': dict(self.running),
+                'in_flight': len(self.in_flight),
+                'uptime': round(time.perf_counter() - self.started, 4),
+                'classes': {priority: metrics.snapshot() for priority, metrics in self.metrics.items()},
+                'cache': self.cache.stats() if self.cache else None,
+            }
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs, finish the queued ones and stop the workers"""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+        if self.cache:
+            self.cache.flush_stats()
+
+def handle_request(scheduler, line, respond):
+    """
+    Handle one request line, respond(record) is called once with its result
+    (later, from a worker thread, for jobs); returns False on shutdown
+    """
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        respond({'ok': False, 'error': f"Invalid JSON: {e}"})
+        return True
+
+    command = request.get('command')
+    if command == 'ping':
+        respond({'id': request.get('id'), 'ok': True, 'pong': True, 'pid': os.getpid()})
+    elif command == 'stats':
+        respond({'id': request.get('id'), 'ok': True, 'stats': scheduler.stats()})
+    elif command == 'shutdown':
+        respond({'id': request.get('id'), 'ok': True, 'shutdown': True})
+        return False
+    elif command is not None:
+        respond({'id': request.get('id'), 'ok': False, 'error': f"Unknown command: {command}"})
+    else:
+        try:
+            future = scheduler.submit(request)
+        except (ValueError, RuntimeError) as e:
+            respond({'id': request.get('id'), 'ok': False, 'error': str(e)})
+        else:
+            future.add_done_callback(lambda done: respond(done.result()))
+    return True
+
+def serve_stdin(scheduler):
+    """Read requests from stdin until EOF or shutdown, then finish the queued jobs"""
+    lock = threading.Lock()
+
+    def respond(record):
+        with lock:
+            sys.stdout.write(RESULT_PREFIX + json.dumps(record) + '\n')
+            sys.stdout.flush()
+
+    print(f"[Scheduler] Ready on stdin (pid {os.getpid()})")
+    sys.stdout.flush()
+    for line in sys.stdin:
+        line = line.strip()
+        if line and not handle_request(scheduler, line, respond):
+            break
+
+class SchedulerRequestHandler(socketserver.StreamRequestHandler):
+    """One connection may send any number of requests, results are written as they finish"""
+
+    def handle(self):
+        lock = threading.Lock()
+
+        def respond(record):
+            with lock:
+                try:
+                    self.wfile.write((json.dumps(record) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                except (OSError, ValueError):
+                    # Client went away, the job still ran (and is cached/catalogued)
+                    pass
+
+        # Unanswered requests of this connection (clients keep one open for their lifetime)
+        pending = [0]
+        answered = threading.Condition()
+
+        def finish(record):
+            respond(record)
+            with answered:
+                pending[0] -= 1
+                answered.notify_all()
+
+        for raw in self.rfile:
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            with answered:
+                pending[0] += 1
+            if not handle_request(self.server.scheduler, line, finish):
+                self.server.stopping = True
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                break
+        # Keep the connection open until its jobs are answered
+        with answered:
+            answered.wait_for(lambda: pending[0] == 0)
+
+class SchedulerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve_socket(scheduler, address):
+    """Serve requests over a local TCP socket, any number of clients at once"""
+    host, _, port = address.rpartition(':')
+    server = SchedulerServer((host or '127.0.0.1', int(port)), SchedulerRequestHandler)
+    server.scheduler = scheduler
+    server.stopping = False
+
+    print(f"[Scheduler] Listening on {host or '127.0.0.1'}:{port} (pid {os.getpid()})")
+    sys.stdout.flush()
+    with server:
+        server.serve_forever()
+
+def run_manifest(scheduler, manifest_path, script=None, priority=None):
+    """Submit every manifest job and wait for all of them, returns the report"""
+    manifest_jobs = jobs.load_manifest(manifest_path)
+    futures = []
+    for index, job in enumerate(manifest_jobs):
+        job.setdefault('id', index)
+        job['script'] = job.get('script') or script
+        futures.append(scheduler.submit(job, priority or job.get('priority')))
+
+    start = time.perf_counter()
+    results = []
+    for future in futures:
+        record = future.result()
+        status = 'ok' if record['ok'] else f"FAILED: {record['error']}"
+        if record.get('coalesced'):
+            status += ' (coalesced)'
+        print(f"[Scheduler] {record.get('worker', '-')} {record['id']} ({record.get('wall_time', 0)}s) {status}")
+        results.append(record)
+
+    return {
+        'manifest': manifest_path,
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['ok']),
+        'failed': sum(1 for r in results if not r['ok']),
+        'duration': round(time.perf_counter() - start, 4),
+        'stats': scheduler.stats(),
+        'results': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of Blender processes (default: one per core)')
+    parser.add_argument('--interactive-limit', type=int, default=None,
+                        help='Max concurrent interactive jobs (default: every worker)')
+    parser.add_argument('--bulk-limit', type=int, default=None,
+                        help='Max concurrent bulk jobs (default: all workers but one; one worker is always kept for interactive jobs)')
+    parser.add_argument('--timeout', type=float, default=300,
+                        help='Seconds per job before its worker is killed')
+    parser.add_argument('--blender', type=str, default=DEFAULT_BLENDER)
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, default=None,
+                        help='Use the asset cache (optionally at this directory)')
+    parser.add_argument('--socket', type=str, nargs='?', const=DEFAULT_SOCKET, default=None,
+                        help=f"host:port to listen on instead of stdin (default {DEFAULT_SOCKET})")
+    parser.add_argument('--manifest', type=str, default=None,
+                        help='Run the jobs of a manifest and exit')
+    parser.add_argument('--script', type=str, default=None,
+                        help='Script for manifest jobs that do not name one')
+    parser.add_argument('--priority', type=str, default=None, choices=PRIORITIES,
+                        help='Priority of manifest jobs without one (default: bulk)')
+    parser.add_argument('--report', type=str, default=None)
+    args = parser.parse_args()
+
+    limits = {}
+    if args.interactive_limit:
+        limits['interactive'] = args.interactive_limit
+    if args.bulk_limit:
+        limits['bulk'] = args.bulk_limit
+    cache = AssetCache(args.cache) if args.cache else None
+    scheduler = JobScheduler(args.workers, limits, args.timeout, args.blender, cache).start()
+
+    if args.manifest:
+        report = run_manifest(scheduler, args.manifest, args.script, args.priority)
+        scheduler.shutdown()
+        report_path = args.report or os.path.splitext(args.manifest)[0] + '.report.json'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"[Scheduler] {report['succeeded']}/{report['total']} succeeded in {report['duration']}s, "
+              f"report written to {report_path}")
+        sys.exit(0 if report['failed'] == 0 else 1)
+
+    if args.socket:
+        serve_socket(scheduler, args.socket)
+    else:
+        serve_stdin(scheduler)
+    scheduler.shutdown()
+    print(f"[Scheduler] Shutting down: {json.dumps(scheduler.stats()['classes'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Job helpers shared by the Blender scripts and blender_worker.py
+A job is a JSON record naming a script plus the arguments its argparse parser takes:
+  {"id": "goblin-12", "script": "evolution_transformer", "args": {"input": "base.glb", "era": 12, "output": "out.glb"}}
+"args" may also be a plain argv list: ["--input", "base.glb", "--era", "12", "--output", "out.glb"]
+Manifests (--manifest) hold many jobs: a JSON list, {"jobs": [...]}, or JSONL with one job per line.
+A manifest job may omit "script" (the invoked script runs it) and may give its args inline:
+  {"id": "goblin", "models": "a.obj,b.obj", "output": "goblin_base.glb"}
+"source_hash" carries the job's asset_cache.py key when the sender already computed it.
+No bpy import here so the module can be used outside Blender as well
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import traceback
+
+import stage_log
+from runtime_stats import current_rss
+
+JOB_KEYS = ('id', 'script', 'args', 'source_hash')
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def script_argv(argv=None):
+    """Return everything after -- (Blender keeps its own flags before it)"""
+    argv = sys.argv if argv is None else argv
+    if "--" in argv:
+        return argv[argv.index("--") + 1:]
+    return []
+
+def job_to_argv(args):
+    """
+    Convert job arguments to an argv list
+    dict keys become --flags, lists/dicts are JSON encoded (as the TS callers do),
+    True becomes a bare flag, False/None are dropped
+    """
+    if args is None:
+        return []
+    if isinstance(args, (list, tuple)):
+        return [str(a) for a in args]
+
+    argv = []
+    for key, value in args.items():
+        flag = '--' + key.replace('_', '-')
+        if value is None or value is False:
+            continue
+        if value is True:
+            argv.append(flag)
+        elif isinstance(value, (list, dict)):
+            argv.extend([flag, json.dumps(value)])
+        else:
+            argv.extend([flag, str(value)])
+    return argv
+
+def load_script(name):
+    """Import a blender-scripts module by name ("composite_entity" or "composite_entity.py")"""
+    name = os.path.basename(name)
+    if name.endswith('.py'):
+        name = name[:-3]
+    if not os.path.exists(os.path.join(SCRIPTS_DIR, f"{name}.py")):
+        raise ValueError(f"Unknown script: {name}")
+
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    module = importlib.import_module(name)
+    if not hasattr(module, 'build_parser') or not hasattr(module, 'run'):
+        raise ValueError(f"Script {name} has no build_parser()/run() entry point")
+    return module
+
+def script_name(module):
+    """Script name of a loaded module (also right when Blender runs it as __main__)"""
+    if module is None:
+        return None
+    return os.path.splitext(os.path.basename(module.__file__))[0]
+
+def job_args(job):
+    """Job arguments, either under "args" or inline next to id/script"""
+    if 'args' in job:
+        return job['args']
+    return {k: v for k, v in job.items() if k not in JOB_KEYS}
+
+def catalog_outputs(script, args, source_hash=None, export=None):
+    """Record a finished job's outputs in the asset catalog, a failure only warns"""
+    # Imported here: asset_catalog imports asset_cache, which imports this module
+    import asset_catalog
+    try:
+        with stage_log.stage('catalog'):
+            asset_catalog.record_job(script, args, source_hash=source_hash, export=export)
+    except Exception as e:
+        print(f"[Catalog] Not updated for {script}: {e}")
+
+def export_catalog():
+    """Export catalog.json once after a batch of jobs, a failure only warns"""
+    import asset_catalog
+    try:
+        asset_catalog.export_catalog()
+    except Exception as e:
+        print(f"[Catalog] Not exported: {e}")
+
+def run_job(job, module=None, catalog_export=None):
+    """
+    Run one job in the current interpreter and return its result record
+    module: script module to use when the job names no script
+    catalog_export: False when the caller exports the catalog after a batch (export_catalog())
+    """
+    start = time.perf_counter()
+    record = {
+        'id': job.get('id'),
+        'script': job.get('script') or script_name(module),
+        'ok': False,
+    }
+
+    try:
+        if job.get('script') or module is None:
+            module = load_script(job['script'])
+        args = module.build_parser().parse_args(job_to_argv(job_args(job)))
+        with stage_log.job(args, script_name(module), record['id']):
+            record['output'] = module.run(args)
+            catalog_outputs(script_name(module), job_args(job), job.get('source_hash'), catalog_export)
+        record['ok'] = True
+    except SystemExit as e:
+        # argparse exits on bad arguments - keep the worker alive
+        record['error'] = f"Invalid arguments (exit code {e.code})"
+    except Exception as e:
+        record['error'] = str(e) or e.__class__.__name__
+        record['traceback'] = traceback.format_exc()
+
+    record['duration'] = round(time.perf_counter() - start, 4)
+    # Lets persistent sessions watch for memory growth across jobs
+    record['rss'] = current_rss()
+    return record
+
+def load_manifest(path):
+    """Load jobs from a JSON list, a {"jobs": [...]} object or a JSONL file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        # JSONL - one job per line
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    if isinstance(data, dict):
+        return data.get('jobs', [data])
+    return data
+
+def run_manifest(manifest_path, module, summary_path=None):
+    """
+    Run every manifest job sequentially in this session
+    Failed jobs are recorded and skipped, the summary is written once all jobs ran
+    """
+    manifest_jobs = load_manifest(manifest_path)
+    summary_path = summary_path or os.path.splitext(manifest_path)[0] + '.summary.json'
+    print(f"[Jobs] Running {len(manifest_jobs)} jobs from {manifest_path}")
+
+    start = time.perf_counter()
+    results = []
+    for index, job in enumerate(manifest_jobs):
+        job.setdefault('id', index)
+        # Each script's run() starts by resetting the scene
+        record = run_job(job, module, catalog_export=False)
+        results.append(record)
+        status = 'ok' if record['ok'] else f"FAILED: {record['error']}"
+        print(f"[Jobs] {index + 1}/{len(manifest_jobs)} {record['id']} ({record['duration']}s) {status}")
+    export_catalog()
+
+    summary = {
+        'manifest': manifest_path,
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['ok']),
+        'failed': sum(1 for r in results if not r['ok']),
+        'duration': round(time.perf_counter() - start, 4),
+        'results': results,
+    }
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"[Jobs] {summary['succeeded']}/{summary['total']} succeeded, summary written to {summary_path}")
+    return summary
+
+def main_with_manifest(module, argv=None):
+    """
+    Script entry point: run a manifest when --manifest is given, else a single job
+    Returns the single job output path or the manifest summary
+    """
+    argv = script_argv() if argv is None else argv
+    if '--manifest' in argv:
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--manifest', type=str, required=True)
+        parser.add_argument('--summary', type=str, default=None)
+        args = parser.parse_args(argv)
+        return run_manifest(args.manifest, module, args.summary)
+
+    args = module.build_parser().parse_args(argv)
+    with stage_log.job(args, script_name(module)):
+        output = module.run(args)
+        catalog_outputs(script_name(module), argv)
+        return output
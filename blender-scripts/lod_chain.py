@@ -0,0 +1,71 @@
+"""
+LOD chain file layout (no Blender needed)
+An evolved model exported as evolved.glb gets decimated siblings evolved_lod1.glb ...
+and a manifest evolved.lod.json the client uses to pick a level:
+  {"levels": [{"level": 0, "file": "evolved.glb", "ratio": 1.0, "screen_coverage": 0.25,
+               "triangles": 48210, "bytes": 1804412}, ...]}
+A level is used while the model covers at least screen_coverage of the screen height
+(MSFT_lod's MSFT_screencoverage convention), the last level has coverage 0
+"""
+
+import os
+import json
+
+DEFAULT_RATIOS = '1.0,0.5,0.25,0.1'
+DEFAULT_COVERAGE = '0.25,0.1,0.03,0.0'
+
+def parse_levels(ratios, coverage):
+    """Comma lists → [(ratio, screen_coverage), ...], LOD0 first"""
+    ratios = [float(r) for r in str(ratios).split(',') if r.strip()]
+    coverage = [float(c) for c in str(coverage).split(',') if c.strip()]
+    if not ratios or ratios[0] != 1.0:
+        raise ValueError("LOD ratios must start with 1.0 (the full model)")
+    if any(b >= a for a, b in zip(ratios, ratios[1:])) or ratios[-1] <= 0:
+        raise ValueError(f"LOD ratios must be decreasing and positive: {ratios}")
+    if len(coverage) < len(ratios):
+        raise ValueError(f"Need a screen coverage per LOD level ({len(ratios)}), got {len(coverage)}")
+    return list(zip(ratios, coverage))
+
+def level_path(output_path, level):
+    """File of one level, LOD0 is the output itself"""
+    if level == 0:
+        return output_path
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_lod{level}{ext}"
+
+def manifest_path(output_path):
+    return os.path.splitext(output_path)[0] + '.lod.json'
+
+def write_manifest(output_path, levels):
+    """levels: [{"ratio", "screen_coverage", "triangles"}, ...] in level order"""
+    records = []
+    for level, record in enumerate(levels):
+        path = level_path(output_path, level)
+        records.append({
+            'level': level,
+            'file': os.path.basename(path),
+            **record,
+            'bytes': os.path.getsize(path) if os.path.exists(path) else None,
+        })
+    path = manifest_path(output_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'levels': records}, f, indent=2)
+    return path
+
+def chain_files(output_path):
+    """Manifest and LOD1+ files written next to output_path (empty without a chain)"""
+    path = manifest_path(output_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        levels = json.load(f)['levels']
+    return [path] + [level_path(output_path, record['level']) for record in levels if record['level'] > 0]
+
+def retarget_manifest(path, output_path):
+    """Point a copied manifest at the level files of output_path"""
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    for record in manifest['levels']:
+        record['file'] = os.path.basename(level_path(output_path, record['level']))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
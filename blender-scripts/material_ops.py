@@ -0,0 +1,256 @@
+"""
+Material slot operations on joined meshes
+merge_mesh_materials() folds identical / near-identical Principled BSDF materials into
+one slot and remaps face material indices with foreach_get/foreach_set
+bake_vertex_colors() moves flat material colors into a corner color attribute and leaves
+one shared vertex-color material (one draw call per classic model)
+"""
+
+import bpy
+import numpy as np
+
+from script_defaults import MERGE_TOLERANCE
+
+# Unlinked Principled BSDF inputs compared when merging
+MATERIAL_INPUTS = ('Base Color', 'Metallic', 'Roughness', 'Alpha', 'Emission Color', 'Emission', 'Emission Strength')
+# Shared material and attribute of vertex-color mode
+VERTEX_COLOR_MATERIAL = 'RS_VertexColor'
+VERTEX_COLOR_ATTRIBUTE = 'Col'
+# Custom properties of materials carrying an RS material id (rs_material()), the id reaches
+# the GLB in the material name and extras
+RS_MATERIAL_PROPERTY = 'rs_material'
+RS_BASE_PROPERTY = 'rs_base'
+
+def principled_node(mat):
+    """The material's only Principled BSDF, None for anything else"""
+    if mat is None or not mat.use_nodes:
+        return None
+    nodes = [node for node in mat.node_tree.nodes if node.type == 'BSDF_PRINCIPLED']
+    return nodes[0] if len(nodes) == 1 else None
+
+def material_signature(mat):
+    """
+    (key, values): materials can only merge when their hashable keys are equal (settings,
+    textures) and every unlinked input value is within tolerance of the other's
+    """
+    bsdf = principled_node(mat)
+    if bsdf is None:
+        # Custom node setups are never merged
+        return ('unique', mat.name if mat else None), ()
+
+    # Different RS material ids never merge
+    key = [getattr(mat, 'blend_method', None), mat.use_backface_culling, mat.get(RS_MATERIAL_PROPERTY)]
+    values = []
+    for socket in bsdf.inputs:
+        if socket.is_linked:
+            # Same image texture merges, any other node chain stays unique
+            source = socket.links[0].from_node
+            image = getattr(source, 'image', None)
+            key.append((socket.name, image.name if image else f"{mat.name}/{source.name}"))
+        elif socket.name in MATERIAL_INPUTS:
+            value = socket.default_value
+            value = value[:] if hasattr(value, '__len__') else (value,)
+            key.append((socket.name, len(value)))
+            values.extend(value)
+    return tuple(key), tuple(values)
+
+def find_equal(candidates, values, tolerance):
+    """Index of the first candidate whose values are all within tolerance, None if none is"""
+    if not candidates:
+        return None
+    kept = np.array([candidate for _, candidate in candidates], dtype=np.float64).reshape(len(candidates), -1)
+    close = (np.abs(kept - np.asarray(values, dtype=np.float64)) <= tolerance).all(axis=1)
+    return candidates[int(close.argmax())][0] if close.any() else None
+
+def merge_mesh_materials(mesh, tolerance=MERGE_TOLERANCE):
+    """
+    Merge equal material slots of one mesh and drop unused ones
+    Returns (slots before, slots after, materials no longer in the slots)
+    """
+    slots = list(mesh.materials)
+    if len(slots) < 2:
+        return len(slots), len(slots), []
+
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', indices)
+    indices = np.clip(indices, 0, len(slots) - 1)
+    used = np.bincount(indices, minlength=len(slots)) > 0
+
+    # Kept materials per key as (kept index, values); each slot is compared with the values
+    # of the kept materials, not bucketed, so close values never split across a boundary
+    canonical = {}
+    kept = []
+    remap = np.zeros(len(slots), dtype=np.int32)
+    for slot, mat in enumerate(slots):
+        if not used[slot]:
+            continue
+        key, values = material_signature(mat)
+        candidates = canonical.setdefault(key, [])
+        match = find_equal(candidates, values, max(tolerance, 0.0))
+        if match is None:
+            match = len(kept)
+            candidates.append((match, values))
+            kept.append(mat)
+        remap[slot] = match
+
+    if len(kept) == len(slots):
+        return len(slots), len(slots), []
+
+    mesh.materials.clear()
+    for mat in kept:
+        mesh.materials.append(mat)
+    mesh.polygons.foreach_set('material_index', remap[indices])
+    mesh.update()
+
+    kept_names = {mat.name for mat in kept if mat is not None}
+    dropped = [mat for mat in slots if mat is not None and mat.name not in kept_names]
+    return len(slots), len(kept), dropped
+
+def remove_orphan_materials(materials):
+    """Delete materials nothing uses any more, returns how many went"""
+    removed = 0
+    for mat in {mat.name: mat for mat in materials}.values():
+        if mat.users == 0:
+            bpy.data.materials.remove(mat)
+            removed += 1
+    return removed
+
+def is_textured(mat):
+    """True when any Principled BSDF input is driven by an image texture"""
+    bsdf = principled_node(mat)
+    return bsdf is not None and any(
+        getattr(link.from_node, 'image', None) is not None
+        for socket in bsdf.inputs if socket.is_linked
+        for link in socket.links
+    )
+
+def slot_colors(slots):
+    """(S, 4) linear base color per slot, white for slots without a Principled BSDF"""
+    colors = np.ones((max(len(slots), 1), 4), dtype=np.float32)
+    for slot, mat in enumerate(slots):
+        bsdf = principled_node(mat)
+        if bsdf is not None:
+            colors[slot, :3] = bsdf.inputs['Base Color'].default_value[:3]
+            alpha = bsdf.inputs.get('Alpha')
+            colors[slot, 3] = alpha.default_value if alpha is not None else 1.0
+    return colors
+
+def corner_faces(mesh):
+    """Face index of every corner (loop)"""
+    face_count = len(mesh.polygons)
+    starts = np.empty(face_count, dtype=np.int64)
+    totals = np.empty(face_count, dtype=np.int64)
+    mesh.polygons.foreach_get('loop_start', starts)
+    mesh.polygons.foreach_get('loop_total', totals)
+    offsets = np.arange(totals.sum()) - np.repeat(np.cumsum(totals) - totals, totals)
+    faces = np.empty(len(mesh.loops), dtype=np.int64)
+    faces[np.repeat(starts, totals) + offsets] = np.repeat(np.arange(face_count), totals)
+    return faces
+
+def existing_corner_colors(mesh):
+    """Active color attribute as (L, 4) corner colors, None without one"""
+    attr = mesh.color_attributes.active_color
+    if attr is None or len(attr.data) == 0:
+        return None
+    colors = np.empty(len(attr.data) * 4, dtype=np.float32)
+    attr.data.foreach_get('color', colors)
+    colors = colors.reshape(-1, 4)
+    if attr.domain == 'POINT':
+        vertex_indices = np.empty(len(mesh.loops), dtype=np.int64)
+        mesh.loops.foreach_get('vertex_index', vertex_indices)
+        colors = colors[vertex_indices]
+    return colors
+
+def vertex_color_material(roughness=0.8, metallic=0.0, emission_strength=0.0):
+    """
+    Shared material reading base (and emission) color from the color attribute
+    Named by its parameters so every model with the same look uses the same one
+    """
+    name = VERTEX_COLOR_MATERIAL
+    if (roughness, metallic, emission_strength) != (0.8, 0.0, 0.0):
+        name = f"{name}_r{roughness:.2f}_m{metallic:.2f}_e{emission_strength:.1f}"
+    mat = bpy.data.materials.get(name)
+    if mat is not None:
+        return mat
+
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    bsdf = nodes["Principled BSDF"]
+    color = nodes.new("ShaderNodeVertexColor")
+    color.layer_name = VERTEX_COLOR_ATTRIBUTE
+    mat.node_tree.links.new(color.outputs['Color'], bsdf.inputs['Base Color'])
+    # Unused while linked, white so bake_vertex_colors() keeps the attribute colors as they are
+    bsdf.inputs['Base Color'].default_value = (1.0, 1.0, 1.0, 1.0)
+    bsdf.inputs['Roughness'].default_value = roughness
+    bsdf.inputs['Metallic'].default_value = metallic
+    if emission_strength > 0:
+        emission = bsdf.inputs.get('Emission Color') or bsdf.inputs['Emission']
+        mat.node_tree.links.new(color.outputs['Color'], emission)
+        bsdf.inputs['Emission Strength'].default_value = emission_strength
+    return mat
+
+def rs_material(base, material_id):
+    """
+    Copy of base tagged with an RS material id, shared by every part with that base and id
+    (an id already tagged on base is replaced: the copy is made from base's own base)
+    """
+    base = bpy.data.materials.get(base.get(RS_BASE_PROPERTY, base.name)) or base
+    name = f"{base.name}_RS{int(material_id)}"
+    mat = bpy.data.materials.get(name)
+    if mat is None:
+        mat = base.copy()
+        mat.name = name
+        mat[RS_MATERIAL_PROPERTY] = int(material_id)
+        mat[RS_BASE_PROPERTY] = base.name
+    return mat
+
+def bake_vertex_colors(mesh):
+    """
+    Multiply each face's material color into its corner colors and collapse the mesh to
+    the shared vertex-color material (one copy per RS material id of the slots)
+    Returns False (mesh untouched) when a slot is textured
+    """
+    slots = list(mesh.materials)
+    if any(is_textured(mat) for mat in slots):
+        return False
+
+    # Look (roughness/metallic/emission) of the first flat material, the evolution
+    # pass sets the same values on every slot
+    bsdf = next((principled_node(mat) for mat in slots if principled_node(mat) is not None), None)
+    look = (0.8, 0.0, 0.0)
+    if bsdf is not None:
+        strength = bsdf.inputs.get('Emission Strength')
+        look = (
+            round(bsdf.inputs['Roughness'].default_value, 2),
+            round(bsdf.inputs['Metallic'].default_value, 2),
+            round(strength.default_value, 1) if strength is not None else 0.0,
+        )
+
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', material_indices)
+    material_indices = np.clip(material_indices, 0, max(len(slots) - 1, 0))
+    colors = slot_colors(slots)[material_indices][corner_faces(mesh)]
+
+    # glTF multiplies COLOR_0 by the base color, so keep any existing vertex colors
+    existing = existing_corner_colors(mesh)
+    if existing is not None:
+        colors *= existing
+
+    for attr in list(mesh.color_attributes):
+        mesh.color_attributes.remove(attr)
+    attr = mesh.color_attributes.new(VERTEX_COLOR_ATTRIBUTE, 'BYTE_COLOR', 'CORNER')
+    attr.data.foreach_set('color', colors.ravel())
+    mesh.color_attributes.active_color = attr
+
+    # One slot per RS material id, so the ids still reach the GLB
+    shared = vertex_color_material(*look)
+    ids = [mat.get(RS_MATERIAL_PROPERTY) if mat is not None else None for mat in slots] or [None]
+    kept = list(dict.fromkeys(ids))
+    mesh.materials.clear()
+    for material_id in kept:
+        mesh.materials.append(shared if material_id is None else rs_material(shared, material_id))
+    remap = np.array([kept.index(material_id) for material_id in ids], dtype=np.int32)
+    mesh.polygons.foreach_set('material_index', remap[material_indices])
+    mesh.update()
+    return True
@@ -0,0 +1,91 @@
+"""
+Build Blender meshes straight from NumPy arrays through the data API
+No bpy.ops, no per-vertex Python loops: everything goes through foreach_set
+"""
+
+import bpy
+import numpy as np
+
+def y_up_to_z_up(positions):
+    """glTF (Y-up) → Blender (Z-up), the same mapping the glTF importer uses"""
+    positions = np.asarray(positions, dtype=np.float32)
+    return np.stack([positions[:, 0], -positions[:, 2], positions[:, 1]], axis=1)
+
+def mesh_from_arrays(name, positions, indices, uvs=None, face_colors=None, corner_colors=None,
+                     material_indices=None, smooth=False, y_up=False, normals=None):
+    """
+    Create a triangle mesh datablock
+    positions (V, 3), indices (F, 3), uvs per vertex (V, 2),
+    face_colors (F, 3|4) or corner_colors (F*3, 3|4) as linear floats,
+    material_indices (F,), normals per vertex (V, 3) kept as custom normals
+    """
+    positions = y_up_to_z_up(positions) if y_up else np.asarray(positions, dtype=np.float32)
+    indices = np.asarray(indices, dtype=np.int32).reshape(-1, 3)
+    face_count = len(indices)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set('co', positions.ravel())
+
+    mesh.loops.add(face_count * 3)
+    mesh.loops.foreach_set('vertex_index', indices.ravel())
+
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, face_count * 3, 3, dtype=np.int32))
+    try:
+        # Required before Blender 4.0, read-only (derived from loop_start) after
+        mesh.polygons.foreach_set('loop_total', np.full(face_count, 3, dtype=np.int32))
+    except (AttributeError, TypeError, RuntimeError):
+        pass
+
+    if material_indices is not None:
+        mesh.polygons.foreach_set('material_index', np.asarray(material_indices, dtype=np.int32))
+    if smooth:
+        mesh.polygons.foreach_set('use_smooth', np.ones(face_count, dtype=bool))
+
+    if uvs is not None:
+        uv_layer = mesh.uv_layers.new(name='UVMap')
+        uv_layer.data.foreach_set('uv', np.asarray(uvs, dtype=np.float32)[indices.ravel()].ravel())
+
+    if face_colors is not None:
+        corner_colors = np.repeat(np.asarray(face_colors, dtype=np.float32), 3, axis=0)
+    if corner_colors is not None:
+        set_corner_colors(mesh, corner_colors)
+
+    mesh.update(calc_edges=True)
+
+    if normals is not None:
+        normals = y_up_to_z_up(normals) if y_up else np.asarray(normals, dtype=np.float32)
+        if hasattr(mesh, 'use_auto_smooth'):
+            # Custom normals are ignored without auto smooth before Blender 4.1
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set_from_vertices(normals)
+    return mesh
+
+def set_corner_colors(mesh, corner_colors, name='Col'):
+    """Write per-corner colors (N, 3|4) into a byte color attribute"""
+    corner_colors = np.asarray(corner_colors, dtype=np.float32)
+    if corner_colors.shape[1] == 3:
+        corner_colors = np.concatenate([corner_colors, np.ones((len(corner_colors), 1), np.float32)], axis=1)
+    attr = mesh.color_attributes.get(name) or mesh.color_attributes.new(name, 'BYTE_COLOR', 'CORNER')
+    attr.data.foreach_set('color', corner_colors.ravel())
+    mesh.color_attributes.active_color = attr
+    return attr
+
+def object_from_mesh(name, mesh, materials=(), collection=None):
+    """Link a new object using mesh into the scene"""
+    for mat in materials:
+        mesh.materials.append(mat)
+    obj = bpy.data.objects.new(name, mesh)
+    (collection or bpy.context.scene.collection).objects.link(obj)
+    return obj
+
+def flat_material(name, color, roughness=0.8, metallic=0.0):
+    """Principled BSDF material with a base color"""
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    bsdf = mat.node_tree.nodes["Principled BSDF"]
+    bsdf.inputs['Base Color'].default_value = (*color[:3], 1.0)
+    bsdf.inputs['Roughness'].default_value = roughness
+    bsdf.inputs['Metallic'].default_value = metallic
+    return mat
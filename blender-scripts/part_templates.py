@@ -0,0 +1,184 @@
+"""
+Part templates for NPCs and items (no Blender needed)
+One JSON file per archetype in templates/<kind>/<name>.json describes the parts:
+  {"name": "goblin", "proportions": {"height": 0.8, "width": 1.1},
+   "jitter": {"height": 0.08}, "palettes": {"skin": [[0.4, 0.6, 0.2], 21543]},
+   "parts": [{"name": "head", "shape": "sphere", "size": [0.4, 0.38, 0.36], "at": [0, 1.0, 0],
+              "color": "skin", "grow": "head", "mirror": false, "axis": "y"}, ...]}
+Parts are Y-up (glTF), "at" is the bottom center of the part, sizes are full extents.
+"height" scales every Y, "width" every X/Z; other proportions only grow the parts naming
+them in "grow". "mirror" adds a copy at -x, "axis" turns cylinders along x or z.
+Colors are sRGB [r, g, b] lists, RS color ids or palette names; each variant picks one
+entry per palette (a list, or a dict of named entries a variant can ask for by name).
+A variant is {"template", "seed", "name"?, "colors"?, "proportions"?}; a type is a template
+name, one of its "aliases" or "<entry>_<template>" ("rune_sword": sword with metal "rune")
+"""
+
+import os
+import json
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from color_ops import srgb_to_linear
+from primitives import box, cylinder, icosphere, transform, merge
+from rs_palette import rs_colors_to_rgb
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+KINDS = ('npc', 'item')
+SHAPES = ('box', 'cylinder', 'sphere')
+
+PartArrays = namedtuple('PartArrays', ['positions', 'indices', 'face_colors'])
+
+_templates = {}
+
+def template_path(kind, name):
+    return os.path.join(TEMPLATES_DIR, kind, f"{name}.json")
+
+def list_templates(kind):
+    """Template names of one kind"""
+    directory = os.path.join(TEMPLATES_DIR, kind)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(directory) if f.endswith('.json'))
+
+def load_template(kind, name):
+    """Parsed template, read once per session"""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown template kind: {kind}")
+    key = (kind, name)
+    if key not in _templates:
+        path = template_path(kind, name)
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown {kind} template: {name} (available: {', '.join(list_templates(kind))})")
+        with open(path, 'r', encoding='utf-8') as f:
+            template = json.load(f)
+        for part in template['parts']:
+            if part.get('shape', 'box') not in SHAPES:
+                raise ValueError(f"{path}: unknown shape {part['shape']} in part {part.get('name')}")
+        _templates[key] = template
+    return _templates[key]
+
+def resolution(complexity):
+    """Cylinder segments and sphere subdivisions for a complexity 1-10"""
+    complexity = min(max(int(complexity), 1), 10)
+    return {'segments': 4 + 2 * (complexity // 3), 'subdivisions': complexity // 4}
+
+def part_triangles(shape, complexity):
+    r = resolution(complexity)
+    if shape == 'cylinder':
+        return 4 * r['segments']
+    if shape == 'sphere':
+        return 20 * 4 ** r['subdivisions']
+    return 12
+
+def triangle_count(kind, name, complexity):
+    """Exact triangle count assemble() produces for a template"""
+    return sum(
+        part_triangles(part.get('shape', 'box'), complexity) * (2 if part.get('mirror') else 1)
+        for part in load_template(kind, name)['parts']
+    )
+
+def resolve_color(value):
+    """sRGB list or RS color id → linear RGB"""
+    if isinstance(value, int):
+        value = rs_colors_to_rgb(value)
+    return srgb_to_linear(value[:3])
+
+def resolve_type(kind, name):
+    """
+    Template and fixed colors for a requested type: a template name or alias, or
+    "<entry>_<template>" with a named palette entry ("rune_sword" → sword, metal=rune)
+    """
+    if os.path.exists(template_path(kind, name)):
+        return name, {}
+    for template in list_templates(kind):
+        if name in load_template(kind, template).get('aliases', []):
+            return template, {}
+    for template in list_templates(kind):
+        if name.endswith('_' + template):
+            entry = name[:-len(template) - 1]
+            for key, entries in load_template(kind, template).get('palettes', {}).items():
+                if isinstance(entries, dict) and entry in entries:
+                    return template, {key: entry}
+    raise ValueError(f"Unknown {kind} type: {name} (templates: {', '.join(list_templates(kind))})")
+
+def variant_specs(kind, name, count, seed, batch=None):
+    """
+    Variants to build: the batch list when given (entries may omit template and seed,
+    or be plain type names), else count seeded variants of one type
+    """
+    entries = batch or [{}] * count
+    specs = []
+    for index, entry in enumerate(entries):
+        entry = {'template': entry} if isinstance(entry, str) else dict(entry)
+        template, colors = resolve_type(kind, entry.get('template', name))
+        entry['template'] = template
+        entry['colors'] = {**colors, **entry.get('colors', {})}
+        entry.setdefault('seed', seed + index * 7919)
+        specs.append(entry)
+    return specs
+
+def part_mesh(part, complexity):
+    """Unit-extent primitive of a part, centered on the origin, along its axis"""
+    shape = part.get('shape', 'box')
+    r = resolution(complexity)
+    if shape == 'cylinder':
+        mesh = cylinder(0.5, 1.0, r['segments'])
+    elif shape == 'sphere':
+        mesh = icosphere(r['subdivisions'], 0.5)
+    else:
+        mesh = box(1.0)
+    return turn(mesh, part.get('axis', 'y'))
+
+def turn(mesh, axis):
+    """Turn a Y-axis primitive along x or z (cyclic axis swap, winding is kept)"""
+    if axis == 'y':
+        return mesh
+    order = [1, 2, 0] if axis == 'x' else [2, 0, 1]
+    return mesh._replace(positions=mesh.positions[:, order], normals=mesh.normals[:, order])
+
+def assemble(kind, spec, complexity):
+    """Merged part arrays of one variant, Y-up with the base at y=0"""
+    template = load_template(kind, spec['template'])
+    rng = random.Random(spec['seed'])
+
+    proportions = dict(template.get('proportions', {}))
+    proportions.setdefault('height', 1.0)
+    proportions.setdefault('width', 1.0)
+    for key, amount in sorted(template.get('jitter', {}).items()):
+        proportions[key] = proportions.get(key, 1.0) * (1 + rng.uniform(-amount, amount))
+    proportions.update(spec.get('proportions', {}))
+
+    palettes = template.get('palettes', {})
+    palette = {}
+    for key, entries in sorted(palettes.items()):
+        options = list(entries.values()) if isinstance(entries, dict) else entries
+        palette[key] = options[rng.randrange(len(options))]
+    for key, value in spec.get('colors', {}).items():
+        if isinstance(value, str):
+            # Named palette entry ("metal": "rune")
+            if value not in palettes.get(key, {}):
+                raise ValueError(f"No {key} color named {value} in template {spec['template']}")
+            value = palettes[key][value]
+        palette[key] = value
+
+    frame = np.array([proportions['width'], proportions['height'], proportions['width']], dtype=np.float32)
+    meshes, colors = [], []
+    for part in template['parts']:
+        size = np.asarray(part.get('size', [1, 1, 1]), dtype=np.float32) * frame
+        for key in np.atleast_1d(part.get('grow', [])):
+            size = size * proportions.get(key, 1.0)
+        mesh = transform(part_mesh(part, complexity), scale=size)
+
+        # "at" is the bottom center
+        at = np.asarray(part.get('at', [0, 0, 0]), dtype=np.float32) * frame + [0, size[1] / 2, 0]
+        color = part.get('color', [1, 1, 1])
+        color = resolve_color(palette[color] if isinstance(color, str) else color)
+        for sign in ((1, -1) if part.get('mirror') else (1,)):
+            meshes.append(transform(mesh, translation=at * [sign, 1, 1]))
+            colors.append(np.broadcast_to(color, (len(mesh.indices), 3)))
+
+    merged = merge(*meshes)
+    return PartArrays(merged.positions, merged.indices.astype(np.int32), np.concatenate(colors).astype(np.float32))
@@ -0,0 +1,89 @@
+"""
+Placeholder GLB Writer (no Blender needed)
+Writes single colored primitives as GLB 2.0 directly from NumPy buffers, matching the
+cubes scripts/create-placeholders.ts used to export through Blender
+Usage:
+  python placeholder_glb.py --spec placeholders.json --out-dir ../public/models [--force]
+  python placeholder_glb.py --name oak_tree --color 0.3,0.5,0.2 [--primitive box] --output oak_tree.glb
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from glb_io import GltfBuilder
+from primitives import PRIMITIVES
+
+DEFAULT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'placeholders.json')
+
+def build_placeholder(name, color, primitive='box', size=1.0):
+    """GltfBuilder with one primitive resting on the ground plane"""
+    if primitive not in PRIMITIVES:
+        raise ValueError(f"Unknown primitive: {primitive}")
+
+    mesh = PRIMITIVES[primitive](size) if primitive in ('box', 'cube') else PRIMITIVES[primitive]()
+    height = float(mesh.positions[:, 1].max() - mesh.positions[:, 1].min())
+
+    builder = GltfBuilder()
+    material = builder.add_material('Material', color)
+    mesh_index = builder.add_mesh(name, mesh.positions, mesh.indices, mesh.normals, mesh.uvs, material=material)
+    builder.add_node(name, mesh=mesh_index, translation=(0, height / 2, 0))
+    return builder
+
+def write_placeholder(output_path, name, color, primitive='box', size=1.0):
+    """Write one placeholder GLB, returns its size in bytes"""
+    return build_placeholder(name, color, primitive, size).write(output_path)
+
+def write_batch(spec, out_dir, force=False):
+    """Write every placeholder in spec, existing files are kept unless force"""
+    os.makedirs(out_dir, exist_ok=True)
+    created, skipped = 0, 0
+    for entry in spec:
+        output_path = os.path.join(out_dir, f"{entry['name']}.glb")
+        if not force and os.path.exists(output_path):
+            skipped += 1
+            continue
+        write_placeholder(
+            output_path,
+            entry['name'],
+            entry['color'],
+            entry.get('primitive', 'box'),
+            entry.get('size', 1.0),
+        )
+        created += 1
+    return created, skipped
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--spec', type=str, default=None,
+                        help=f'JSON list of {{name, color, primitive?, size?}} (default: {os.path.basename(DEFAULT_SPEC)})')
+    parser.add_argument('--out-dir', type=str, default='public/models')
+    parser.add_argument('--force', action='store_true', help='Overwrite existing files')
+    parser.add_argument('--name', type=str, default=None)
+    parser.add_argument('--color', type=str, default='0.9,0.7,0.6')
+    parser.add_argument('--primitive', type=str, default='box', choices=sorted(PRIMITIVES))
+    parser.add_argument('--size', type=float, default=1.0)
+    parser.add_argument('--output', type=str, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    if args.name:
+        color = [float(c) for c in args.color.split(',')]
+        output_path = args.output or os.path.join(args.out_dir, f"{args.name}.glb")
+        size = write_placeholder(output_path, args.name, color, args.primitive, args.size)
+        print(f"[Placeholder] Wrote {output_path} ({size} bytes)")
+        return
+
+    with open(args.spec or DEFAULT_SPEC, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    created, skipped = write_batch(spec, args.out_dir, args.force)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"[Placeholder] Created {created}, kept {skipped} existing in {args.out_dir} ({elapsed:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+NumPy primitive meshes (no Blender needed)
+All primitives are Y-up (glTF convention), centered on the origin and return
+MeshArrays: float32 positions/normals (N, 3), uvs (N, 2) and uint32 triangle indices (M, 3)
+"""
+
+from collections import namedtuple
+import numpy as np
+
+MeshArrays = namedtuple('MeshArrays', ['positions', 'normals', 'uvs', 'indices'])
+
+# One entry per cube face: normal, then the two in-face axes (u, v)
+_BOX_FACES = np.array([
+    [[1, 0, 0], [0, 0, -1], [0, 1, 0]],
+    [[-1, 0, 0], [0, 0, 1], [0, 1, 0]],
+    [[0, 1, 0], [1, 0, 0], [0, 0, -1]],
+    [[0, -1, 0], [1, 0, 0], [0, 0, 1]],
+    [[0, 0, 1], [1, 0, 0], [0, 1, 0]],
+    [[0, 0, -1], [-1, 0, 0], [0, 1, 0]],
+], dtype=np.float32)
+
+def box(size=1.0):
+    """Flat-shaded box, 4 vertices per face. size: scalar or (x, y, z)"""
+    half = np.broadcast_to(np.asarray(size, np.float32), (3,)) / 2.0
+    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float32)
+
+    normal, u_axis, v_axis = _BOX_FACES[:, 0], _BOX_FACES[:, 1], _BOX_FACES[:, 2]
+    # (6 faces, 4 corners, 3)
+    positions = (normal[:, None] + corners[None, :, :1] * u_axis[:, None] + corners[None, :, 1:] * v_axis[:, None]) * half
+    normals = np.repeat(normal[:, None], 4, axis=1)
+    uvs = np.tile((corners + 1) / 2, (6, 1))
+
+    base = (np.arange(6, dtype=np.uint32) * 4)[:, None]
+    indices = np.concatenate([base + [0, 1, 2], base + [0, 2, 3]], axis=1).reshape(-1, 3)
+    return MeshArrays(positions.reshape(-1, 3), normals.reshape(-1, 3), uvs.astype(np.float32), indices)
+
+def cylinder(radius=0.5, depth=1.0, segments=16, caps=True):
+    """Y-axis cylinder with smooth sides and flat caps"""
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False, dtype=np.float32)
+    ring = np.stack([np.cos(angles), np.zeros_like(angles), -np.sin(angles)], axis=1)
+    half = depth / 2.0
+
+    # Side: bottom ring then top ring
+    side_pos = np.concatenate([ring * radius + [0, -half, 0], ring * radius + [0, half, 0]])
+    side_nrm = np.concatenate([ring, ring])
+    u = np.arange(segments, dtype=np.float32) / segments
+    side_uv = np.concatenate([np.stack([u, np.zeros_like(u)], 1), np.stack([u, np.ones_like(u)], 1)])
+
+    i = np.arange(segments, dtype=np.uint32)
+    j = (i + 1) % segments
+    side_idx = np.concatenate([
+        np.stack([i, j, j + segments], 1),
+        np.stack([i, j + segments, i + segments], 1),
+    ])
+
+    parts = [(side_pos, side_nrm, side_uv, side_idx)]
+    if caps:
+        cap_uv = (ring[:, [0, 2]] + 1) / 2
+        for y, sign in ((half, 1.0), (-half, -1.0)):
+            pos = np.concatenate([[[0, y, 0]], ring * radius + [0, y, 0]])
+            nrm = np.tile([0, sign, 0], (segments + 1, 1))
+            uv = np.concatenate([[[0.5, 0.5]], cap_uv])
+            fan = np.stack([np.zeros(segments, np.uint32), i + 1, j + 1], 1)
+            if sign < 0:
+                fan = fan[:, [0, 2, 1]]
+            parts.append((pos, nrm, uv, fan))
+
+    return merge(*[MeshArrays(*p) for p in parts])
+
+def icosphere(subdivisions=2, radius=1.0):
+    """Smooth icosphere, each subdivision splits every triangle into four"""
+    t = (1.0 + 5 ** 0.5) / 2.0
+    verts = np.array([
+        [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+        [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+        [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+    ], dtype=np.float64)
+    faces = np.array([
+        [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+        [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+        [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+        [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+    ], dtype=np.int64)
+    verts /= np.linalg.norm(verts, axis=1, keepdims=True)
+
+    for _ in range(subdivisions):
+        # Unique edge midpoints, shared between neighbouring triangles
+        edges = np.sort(np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]), axis=1)
+        unique_edges, inverse = np.unique(edges, axis=0, return_inverse=True)
+        mids = verts[unique_edges].mean(axis=1)
+        mids /= np.linalg.norm(mids, axis=1, keepdims=True)
+
+        m = inverse.reshape(3, -1).T + len(verts)  # (faces, 3): midpoints of edges 01, 12, 20
+        a, b, c = faces.T
+        faces = np.concatenate([
+            np.stack([a, m[:, 0], m[:, 2]], 1),
+            np.stack([b, m[:, 1], m[:, 0]], 1),
+            np.stack([c, m[:, 2], m[:, 1]], 1),
+            m,
+        ])
+        verts = np.concatenate([verts, mids])
+
+    normals = verts.astype(np.float32)
+    uvs = np.stack([
+        0.5 + np.arctan2(verts[:, 2], verts[:, 0]) / (2 * np.pi),
+        0.5 + np.arcsin(np.clip(verts[:, 1], -1, 1)) / np.pi,
+    ], axis=1).astype(np.float32)
+    return MeshArrays((verts * radius).astype(np.float32), normals, uvs, faces.astype(np.uint32))
+
+def transform(mesh, translation=(0, 0, 0), scale=(1, 1, 1)):
+    """Scale then translate a mesh (normals are re-normalized for non-uniform scale)"""
+    scale = np.broadcast_to(np.asarray(scale, np.float32), (3,))
+    normals = mesh.normals / scale
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    positions = mesh.positions * scale + np.asarray(translation, np.float32)
+    return MeshArrays(positions.astype(np.float32), normals.astype(np.float32), mesh.uvs, mesh.indices)
+
+def merge(*meshes):
+    """Concatenate meshes into one, offsetting indices"""
+    offsets = np.cumsum([0] + [len(m.positions) for m in meshes[:-1]])
+    return MeshArrays(
+        np.concatenate([m.positions for m in meshes]).astype(np.float32),
+        np.concatenate([m.normals for m in meshes]).astype(np.float32),
+        np.concatenate([m.uvs for m in meshes]).astype(np.float32),
+        np.concatenate([m.indices + np.uint32(o) for m, o in zip(meshes, offsets)]).astype(np.uint32),
+    )
+
+PRIMITIVES = {
+    'box': box,
+    'cube': box,
+    'cylinder': cylinder,
+    'sphere': icosphere,
+}
@@ -0,0 +1,118 @@
+"""
+Rock and ore node geometry in NumPy (no Blender needed)
+An icosphere is squashed, displaced along its normals by fractal value noise and cut flat
+at the bottom. Ore rocks get patches of ore-colored faces around a few random points.
+Coordinates are Blender Z-up with the base at the origin; colors are linear RGB per face.
+Triangle count: 20 * 4^subdivisions with subdivisions = 1 + complexity // 3
+"""
+
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from color_ops import srgb_to_linear
+from primitives import icosphere
+
+RockArrays = namedtuple('RockArrays', ['positions', 'indices', 'face_colors'])
+
+ROCK_COLOR = (0.42, 0.40, 0.38)
+# Ore patch colors (sRGB) and patch count range
+ORES = {
+    'rock': None,
+    'copper': {'color': (0.80, 0.45, 0.25), 'patches': (3, 5)},
+    'iron': {'color': (0.50, 0.30, 0.22), 'patches': (3, 5)},
+    'coal': {'color': (0.08, 0.08, 0.09), 'patches': (4, 6)},
+    'gold': {'color': (0.95, 0.78, 0.25), 'patches': (2, 4)},
+}
+# Rock dimensions varied per library variant
+JITTER_PARAMS = ('width', 'depth', 'height')
+ROCK_PARAMS = {'width': 1.2, 'depth': 1.0, 'height': 0.8, 'roughness': 0.35, 'frequency': 1.6}
+PATCH_ANGLE = 0.4  # patch radius on the unit sphere, radians
+
+def subdivisions(complexity):
+    return 1 + min(max(int(complexity), 1), 10) // 3
+
+def triangle_count(complexity):
+    """Exact triangle count rock_arrays() produces"""
+    return 20 * 4 ** subdivisions(complexity)
+
+def value_noise(points, table):
+    """Smooth 3D value noise in [-1, 1] at (N, 3) points, lattice values from table (256,)"""
+    cell = np.floor(points).astype(np.int64)
+    t = points - cell
+    t = t * t * (3 - 2 * t)
+
+    def lattice(dx, dy, dz):
+        x, y, z = (cell[:, 0] + dx) & 255, (cell[:, 1] + dy) & 255, (cell[:, 2] + dz) & 255
+        return table[(x * 73 + table[(y * 151 + table[z]) & 255].astype(np.int64)) & 255]
+
+    def mix(a, b, w):
+        return a + (b - a) * w
+
+    x0 = mix(mix(lattice(0, 0, 0), lattice(1, 0, 0), t[:, 0]), mix(lattice(0, 1, 0), lattice(1, 1, 0), t[:, 0]), t[:, 1])
+    x1 = mix(mix(lattice(0, 0, 1), lattice(1, 0, 1), t[:, 0]), mix(lattice(0, 1, 1), lattice(1, 1, 1), t[:, 0]), t[:, 1])
+    return mix(x0, x1, t[:, 2]) / 127.5 - 1.0
+
+def fbm(points, table, octaves=3):
+    """Fractal sum of value noise octaves, roughly in [-1, 1]"""
+    total = np.zeros(len(points))
+    amplitude, norm = 1.0, 0.0
+    for octave in range(octaves):
+        total += amplitude * value_noise(points * 2 ** octave + octave * 17.0, table)
+        norm += amplitude
+        amplitude *= 0.5
+    return total / norm
+
+def random_directions(rng, count, upper=True):
+    """Unit vectors, optionally on the upper half (where ore is visible)"""
+    directions = []
+    while len(directions) < count:
+        v = np.array([rng.gauss(0, 1), rng.gauss(0, 1), rng.gauss(0, 1)])
+        v /= np.linalg.norm(v)
+        if upper and v[2] < -0.1:
+            continue
+        directions.append(v)
+    return np.array(directions)
+
+def rock_arrays(ore, complexity, seed, jitter=0.0):
+    """
+    Rock mesh arrays with per-face colors
+    ore: 'rock' (plain) or an ORES key; jitter: relative variation of the dimensions
+    """
+    if ore not in ORES:
+        raise ValueError(f"Unknown rock type: {ore} (expected one of {', '.join(ORES)})")
+    rng = random.Random(seed)
+    params = dict(ROCK_PARAMS)
+    for key in JITTER_PARAMS:
+        params[key] *= 1 + rng.uniform(-jitter, jitter)
+    table = np.array([rng.randrange(256) for _ in range(256)], dtype=np.int64)
+
+    sphere = icosphere(subdivisions(complexity))
+    # Y-up primitive → Z-up unit directions
+    unit = np.stack([sphere.positions[:, 0], -sphere.positions[:, 2], sphere.positions[:, 1]], axis=1).astype(np.float64)
+
+    offset = np.array([rng.uniform(0, 100) for _ in range(3)])
+    radius = 1 + params['roughness'] * fbm(unit * params['frequency'] + offset, table)
+    positions = unit * radius[:, None] * [params['width'] / 2, params['depth'] / 2, params['height']]
+    # Flat base resting on the ground
+    floor = -0.25 * params['height']
+    positions[:, 2] = np.maximum(positions[:, 2], floor) - floor
+
+    indices = sphere.indices.astype(np.int32)
+    # Grey with a little shading variation, averaged per flat face
+    shade = 0.85 + 0.15 * (fbm(unit * 4.0 + offset, table, octaves=2) + 1) / 2
+    face_shade = shade[indices].mean(axis=1)[:, None]
+    face_colors = srgb_to_linear(ROCK_COLOR)[None] * face_shade
+
+    ore_config = ORES[ore]
+    if ore_config:
+        centers = random_directions(rng, rng.randint(*ore_config['patches']))
+        # Vertex in a patch when within PATCH_ANGLE (noise-warped edge) of a center,
+        # a face is ore when most of its vertices are
+        closeness = (unit @ centers.T).max(axis=1)
+        edge = np.cos(PATCH_ANGLE * (1 + 0.3 * fbm(unit * 6.0 + offset, table, octaves=1)))
+        ore_faces = (closeness > edge)[indices].sum(axis=1) >= 2
+        face_colors[ore_faces] = srgb_to_linear(ore_config['color'])[None] * face_shade[ore_faces]
+
+    return RockArrays(positions.astype(np.float32), indices, face_colors.astype(np.float32))
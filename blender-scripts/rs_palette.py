@@ -0,0 +1,89 @@
+"""
+RS HSL color palette (no Blender needed)
+All 65,536 packed RS HSL color IDs (6-bit hue, 3-bit saturation, 7-bit lightness) as
+8-bit RGB, computed with RSMV's HSL2RGB(packedHSL2HSL(id)) so recolors match the RSMV
+exports. The table is built once into rs_palette.bin (65536 × 3 bytes) and memory-mapped.
+Usage:
+  python rs_palette.py              (rebuild rs_palette.bin)
+  python rs_palette.py --lookup 6798
+"""
+
+import os
+import argparse
+import numpy as np
+
+PALETTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rs_palette.bin')
+PALETTE_SIZE = 1 << 16
+
+_palette = None
+
+def _hue_to_rgb(p, q, t):
+    t = np.where(t < 0, t + 1, t)
+    t = np.where(t > 1, t - 1, t)
+    return np.where(t < 1 / 6, p + (q - p) * 6 * t,
+           np.where(t < 1 / 2, q,
+           np.where(t < 2 / 3, p + (q - p) * (2 / 3 - t) * 6, p)))
+
+def build_palette():
+    """Compute the full palette as a (65536, 3) uint8 array"""
+    ids = np.arange(PALETTE_SIZE, dtype=np.int64)
+    # packedHSL2HSL
+    h = ((ids >> 10) & 0x3F) / 63.0
+    s = ((ids >> 7) & 0x7) / 7.0
+    l = (ids & 0x7F) / 127.0
+    h = np.where(h > 0.5, h - 1.0, h)
+
+    # HSL2RGBfloat
+    q = np.where(l < 0.5, l * (1 + s), l + s - l * s)
+    p = 2 * l - q
+    rgb = np.stack([
+        _hue_to_rgb(p, q, h + 1 / 3),
+        _hue_to_rgb(p, q, h),
+        _hue_to_rgb(p, q, h - 1 / 3),
+    ], axis=1)
+    rgb = np.where((s == 0)[:, None], l[:, None], rgb)
+
+    # HSL2RGB rounds like Math.round
+    return np.floor(rgb * 255 + 0.5).astype(np.uint8)
+
+def write_palette(path=PALETTE_PATH):
+    """Build the palette and write it atomically"""
+    palette = build_palette()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    palette.tofile(tmp_path)
+    os.replace(tmp_path, path)
+    return palette
+
+def load_palette(path=PALETTE_PATH):
+    """Memory-mapped (65536, 3) uint8 palette, built on first use"""
+    global _palette
+    if _palette is not None:
+        return _palette
+
+    if not os.path.exists(path) or os.path.getsize(path) != PALETTE_SIZE * 3:
+        write_palette(path)
+    _palette = np.memmap(path, dtype=np.uint8, mode='r', shape=(PALETTE_SIZE, 3))
+    return _palette
+
+def rs_colors_to_rgb(color_ids):
+    """RS color IDs → RGB floats in 0..1, shape (..., 3)"""
+    ids = np.asarray(color_ids, dtype=np.int64) & 0xFFFF
+    return load_palette()[ids].astype(np.float32) / 255.0
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', type=str, default=PALETTE_PATH)
+    parser.add_argument('--lookup', type=int, nargs='*', default=None, help='Print RGB for these IDs')
+    args = parser.parse_args()
+
+    if args.lookup is not None:
+        for color_id in args.lookup:
+            r, g, b = load_palette(args.output)[color_id & 0xFFFF]
+            print(f"{color_id}: #{r:02x}{g:02x}{b:02x} ({r}, {g}, {b})")
+        return
+
+    write_palette(args.output)
+    print(f"[Palette] Wrote {PALETTE_SIZE} colors to {args.output}")
+
+if __name__ == "__main__":
+    main()
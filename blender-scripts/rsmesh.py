@@ -0,0 +1,118 @@
+"""
+.rsmesh: binary mesh handoff from the RSMV exporter (no Blender needed)
+Written by HybridContentGenerator (TS) in place of a text OBJ, so RS models reach Blender
+at memory-copy speed with their face colors. Little-endian, every buffer 4-byte aligned:
+  header  magic "RSMS", version u16, flags u16, vertex count u32, face count u32
+  positions  f32 (V, 3)   Y-up, as RSMV returns them
+  normals    f32 (V, 3)   FLAG_NORMALS
+  uvs        f32 (V, 2)   FLAG_UVS
+  indices    u32 (F, 3)
+  colors     u8  (F, 4)   FLAG_COLORS, face sRGB + alpha as RSMV decoded it from the Jagex HSL
+  materials  u16 (F,)     FLAG_MATERIALS, RS material id per face (0xFFFF: none)
+"""
+
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b'RSMS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+
+FLAG_NORMALS = 1
+FLAG_UVS = 2
+FLAG_COLORS = 4
+FLAG_MATERIALS = 8
+NO_MATERIAL = 0xFFFF
+
+RsMesh = namedtuple('RsMesh', ['positions', 'normals', 'uvs', 'indices', 'face_colors', 'face_materials'])
+
+# (field, flag or None when always present, dtype, components per element, per 'vertex' or 'face')
+LAYOUT = (
+    ('positions', None, np.float32, 3, 'vertex'),
+    ('normals', FLAG_NORMALS, np.float32, 3, 'vertex'),
+    ('uvs', FLAG_UVS, np.float32, 2, 'vertex'),
+    ('indices', None, np.uint32, 3, 'face'),
+    ('face_colors', FLAG_COLORS, np.uint8, 4, 'face'),
+    ('face_materials', FLAG_MATERIALS, np.uint16, 1, 'face'),
+)
+
+def parse_rsmesh(data):
+    """RsMesh of .rsmesh bytes, arrays are read-only views into data (missing buffers are None)"""
+    if len(data) < HEADER.size:
+        raise ValueError("Not an .rsmesh file (too short)")
+    magic, version, flags, vertex_count, face_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an .rsmesh file (bad magic)")
+    if version != VERSION:
+        raise ValueError(f".rsmesh version {version} is not supported")
+
+    offset = HEADER.size
+    arrays = {}
+    for field, flag, dtype, components, per in LAYOUT:
+        if flag is not None and not flags & flag:
+            arrays[field] = None
+            continue
+        count = (vertex_count if per == 'vertex' else face_count) * components
+        size = count * np.dtype(dtype).itemsize
+        if offset + size > len(data):
+            raise ValueError(f".rsmesh truncated in {field}")
+        array = np.frombuffer(data, dtype=np.dtype(dtype).newbyteorder('<'), count=count, offset=offset)
+        arrays[field] = array.reshape(-1, components) if components > 1 else array
+        offset += size + (-size % 4)
+
+    if face_count and int(arrays['indices'].max()) >= vertex_count:
+        raise ValueError(".rsmesh index out of range")
+    return RsMesh(**arrays)
+
+def read_rsmesh(path):
+    """RsMesh of one file (one read, no per-element parsing)"""
+    with open(path, 'rb') as f:
+        return parse_rsmesh(f.read())
+
+def pack_rsmesh(positions, indices, normals=None, uvs=None, face_colors=None, face_materials=None):
+    """.rsmesh bytes of the arrays (face_colors as 0-255 RGB/RGBA)"""
+    arrays = {
+        'positions': positions, 'normals': normals, 'uvs': uvs, 'indices': indices,
+        'face_colors': face_colors, 'face_materials': face_materials,
+    }
+    positions = np.asarray(positions).reshape(-1, 3)
+    indices = np.asarray(indices).reshape(-1, 3)
+    if face_colors is not None:
+        face_colors = np.asarray(face_colors).reshape(len(indices), -1)
+        if face_colors.shape[1] == 3:
+            face_colors = np.concatenate([face_colors, np.full((len(face_colors), 1), 255)], axis=1)
+        arrays['face_colors'] = face_colors
+
+    flags = 0
+    chunks = []
+    for field, flag, dtype, components, _ in LAYOUT:
+        if arrays[field] is None:
+            continue
+        flags |= flag or 0
+        chunk = np.ascontiguousarray(arrays[field], dtype=np.dtype(dtype).newbyteorder('<')).tobytes()
+        chunks.append(chunk + b'\x00' * (-len(chunk) % 4))
+    return HEADER.pack(MAGIC, VERSION, flags, len(positions), len(indices)) + b''.join(chunks)
+
+def replace_materials(face_materials, replacements):
+    """
+    Map RS material ids through Jagex material replacements [[old, new], ...] (first pair
+    of an id wins, every face is mapped from its original id), returns (ids, replaced count)
+    """
+    ids = np.asarray(face_materials)
+    pairs = np.asarray(replacements, dtype=np.int64).reshape(-1, 2)
+    if ids.size == 0 or len(pairs) == 0:
+        return ids, 0
+    # First occurrence of every old id
+    old, first = np.unique(pairs[:, 0], return_index=True)
+    new = pairs[first, 1]
+    slot = np.clip(np.searchsorted(old, ids), 0, len(old) - 1)
+    hit = old[slot] == ids
+    result = ids.copy()
+    result[hit] = new[slot[hit]]
+    return result, int(hit.sum())
+
+def write_rsmesh(path, *args, **kwargs):
+    with open(path, 'wb') as f:
+        f.write(pack_rsmesh(*args, **kwargs))
@@ -0,0 +1,82 @@
+"""
+Process memory helpers (no Blender needed)
+current_rss() / peak_rss() in bytes on Linux, macOS and Windows; None when unavailable
+reset_peak_rss() lets per-stage peaks be measured where the OS supports it (Linux)
+"""
+
+import os
+import sys
+
+def _windows_memory_counters():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters
+
+def current_rss():
+    """Resident set size of this process in bytes"""
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        if sys.platform == 'win32':
+            counters = _windows_memory_counters()
+            return counters.WorkingSetSize if counters else None
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+def peak_rss():
+    """Peak resident set size of this process in bytes"""
+    try:
+        if sys.platform.startswith('linux'):
+            # VmHWM, unlike ru_maxrss, honours reset_peak_rss()
+            with open('/proc/self/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        if sys.platform == 'win32':
+            counters = _windows_memory_counters()
+            return counters.PeakWorkingSetSize if counters else None
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except Exception:
+        return None
+
+def reset_peak_rss():
+    """Reset the peak RSS high-water mark to the current RSS, returns False if unsupported"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def format_bytes(size):
+    if size is None:
+        return 'n/a'
+    return f"{size / (1024 * 1024):.1f} MB"
@@ -0,0 +1,98 @@
+"""
+Blender scene reset through the data API
+Removes every object and datablock a job can leave behind (meshes, materials, node
+groups, actions, particle settings, images, ...) with bpy.data.batch_remove, so no
+operator context is needed and long-running sessions keep flat memory
+"""
+
+import gc
+import bpy
+
+from runtime_stats import current_rss, format_bytes
+
+# bpy.data collections owned by jobs. Scenes, worlds, screens and workspaces stay.
+PURGE_COLLECTIONS = (
+    'objects',
+    'meshes',
+    'materials',
+    'node_groups',
+    'actions',
+    'particles',
+    'images',
+    'textures',
+    'curves',
+    'hair_curves',
+    'lights',
+    'cameras',
+    'armatures',
+    'lattices',
+    'metaballs',
+    'fonts',
+    'grease_pencils',
+    'grease_pencils_v3',
+    'pointclouds',
+    'volumes',
+    'lightprobes',
+    'speakers',
+    'cache_files',
+    'collections',
+)
+
+def datablock_counts():
+    """Number of datablocks per purged collection"""
+    return {
+        name: len(getattr(bpy.data, name))
+        for name in PURGE_COLLECTIONS
+        if hasattr(bpy.data, name)
+    }
+
+def reset_compositor(scene):
+    """Undo scene-level changes jobs make (bloom compositor, animation range)"""
+    tree = getattr(scene, 'node_tree', None)
+    if tree is not None:
+        for node in list(tree.nodes):
+            tree.nodes.remove(node)
+    if hasattr(scene, 'use_nodes'):
+        scene.use_nodes = False
+    scene.frame_set(1)
+
+def reset_scene(verbose=True):
+    """
+    Remove all job data from the file and return a report:
+    {'datablocks_before', 'datablocks_after', 'rss_before', 'rss_after'}
+    """
+    before = datablock_counts()
+    rss_before = current_rss()
+
+    ids = []
+    for name in PURGE_COLLECTIONS:
+        collection = getattr(bpy.data, name, None)
+        if collection is not None:
+            ids.extend(collection)
+    if ids:
+        bpy.data.batch_remove(ids)
+
+    # Anything only reachable from removed data (e.g. shape keys, library data)
+    if hasattr(bpy.data, 'orphans_purge'):
+        bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+    for scene in bpy.data.scenes:
+        reset_compositor(scene)
+
+    gc.collect()
+
+    after = datablock_counts()
+    report = {
+        'datablocks_before': before,
+        'datablocks_after': after,
+        'rss_before': rss_before,
+        'rss_after': current_rss(),
+    }
+    if verbose:
+        print(f"[Reset] Datablocks {sum(before.values())} → {sum(after.values())}, "
+              f"RSS {format_bytes(report['rss_before'])} → {format_bytes(report['rss_after'])}")
+    return report
+
+def cleanup_scene():
+    """Remove all objects and the data they used"""
+    return reset_scene()
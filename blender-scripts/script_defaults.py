@@ -0,0 +1,28 @@
+"""
+Parser defaults shared by the Blender scripts and asset_cache.py (no Blender needed)
+asset_cache drops arguments equal to a script's defaults from its cache keys, so the
+parsers take these values from here instead of repeating them
+(tests/test_asset_cache.py checks every parser against the tables)
+"""
+
+from export_profiles import DEFAULT_PROFILE
+
+# --seed of the generator scripts
+DEFAULT_SEED = 42
+# --asset-class of evolution_transformer.py / generate_entity.py
+DEFAULT_ASSET_CLASS = 'npc'
+# --export-profile of evolution_transformer.py: evolved models are smooth, so they keep finer quantization
+EVOLUTION_EXPORT_PROFILE = 'hero'
+# --material-tolerance: values within this step of each other count as equal (about 2.5/255 for colors)
+MERGE_TOLERANCE = 0.01
+
+GENERATORS = ('generate_tree', 'generate_rock', 'generate_npc', 'generate_item')
+
+# Parser defaults that differ per script, on top of asset_cache.NEUTRAL_DEFAULTS
+# (generate_entity has no export profile default: it depends on the era)
+SCRIPT_DEFAULTS = {
+    'composite_entity': {'export-profile': DEFAULT_PROFILE},
+    'hybrid_modify': {'export-profile': DEFAULT_PROFILE},
+    'evolution_transformer': {'export-profile': EVOLUTION_EXPORT_PROFILE},
+    **{script: {'export-profile': DEFAULT_PROFILE, 'seed': DEFAULT_SEED} for script in GENERATORS},
+}
@@ -0,0 +1,169 @@
+"""
+Structured per-stage instrumentation for the Blender scripts
+Each stage of a job emits one JSON record (JSONL) to the stage log:
+  {"job": "goblin-12", "script": "generate_entity", "stage": "join", "duration": 0.0123,
+   "before": {"objects": 4, "vertices": 812, "faces": 640, "materials": 9},
+   "after": {"objects": 1, ...}, "peak_rss": 312475648, "output_bytes": null}
+The stage log is --stage-log PATH (or BLENDER_STAGE_LOG); without one, stages only cost a
+few counters. --profile-dir (or BLENDER_PROFILE_DIR) also dumps a cProfile file per job.
+Works without bpy (geometry counts are then omitted)
+Usage: python stage_log.py stages.jsonl   (per-stage totals)
+"""
+
+import os
+import re
+import json
+import time
+import cProfile
+import argparse
+from contextlib import contextmanager, nullcontext
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+from runtime_stats import current_rss, peak_rss, reset_peak_rss
+
+# StageLog of the job currently running in this interpreter
+_active = None
+
+def scene_counts():
+    """Mesh objects, vertices, faces and materials currently in the file"""
+    if bpy is None:
+        return None
+    meshes = [obj.data for obj in bpy.data.objects if obj.type == 'MESH']
+    return {
+        'objects': len(meshes),
+        'vertices': sum(len(m.vertices) for m in meshes),
+        'faces': sum(len(m.polygons) for m in meshes),
+        'materials': len(bpy.data.materials),
+    }
+
+class StageLog:
+    """Collects stage records for one job and appends them to the stage log file"""
+
+    def __init__(self, job_id, script=None, path=None, extra=None):
+        self.job_id = job_id
+        self.script = script
+        self.path = path
+        self.extra = extra or {}
+        self.records = []
+        # Job-wide peak RSS: every stage resets the high-water mark, so it is folded in here
+        self.peak = None
+
+    def fold_peak(self, value):
+        if value is not None:
+            self.peak = value if self.peak is None else max(self.peak, value)
+        return value
+
+    def job_peak_rss(self):
+        """Peak RSS since the job started, across every stage and the time between them"""
+        self.fold_peak(peak_rss())
+        return self.peak
+
+    def emit(self, record):
+        self.records.append(record)
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+
+    @contextmanager
+    def stage(self, name, output=None):
+        """Time a stage; output: file whose size is recorded once the stage finishes"""
+        record = {'job': self.job_id, 'script': self.script, 'stage': name, **self.extra}
+        record['before'] = scene_counts()
+        # Keep the peak reached before this stage (earlier stages, code between them)
+        self.fold_peak(peak_rss())
+        reset_peak_rss()
+        rss_before = current_rss()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['duration'] = round(time.perf_counter() - start, 6)
+            record['after'] = scene_counts()
+            record['peak_rss'] = self.fold_peak(peak_rss())
+            rss_after = current_rss()
+            record['rss_delta'] = rss_after - rss_before if None not in (rss_before, rss_after) else None
+            record['output_bytes'] = os.path.getsize(output) if output and os.path.exists(output) else None
+            self.emit(record)
+
+def stage(name, output=None):
+    """Stage of the active job, a no-op outside of one"""
+    if _active is None:
+        return nullcontext({})
+    return _active.stage(name, output)
+
+def add_arguments(parser):
+    """Instrumentation flags, added to every script parser"""
+    parser.add_argument('--job-id', type=str, default=None)
+    parser.add_argument('--stage-log', type=str, default=os.environ.get('BLENDER_STAGE_LOG'),
+                        help='Append one JSON record per stage to this file')
+    parser.add_argument('--profile-dir', type=str, default=os.environ.get('BLENDER_PROFILE_DIR'),
+                        help='Write a cProfile dump per job into this directory')
+
+def default_job_id(args):
+    output = getattr(args, 'output', None)
+    return os.path.splitext(os.path.basename(output))[0] if output else str(os.getpid())
+
+@contextmanager
+def job(args, script, job_id=None):
+    """Make a StageLog active while one job runs, optionally under cProfile"""
+    global _active
+    if getattr(args, 'job_id', None) is not None:
+        job_id = args.job_id
+    job_id = str(job_id) if job_id is not None else default_job_id(args)
+    log = StageLog(job_id, script, getattr(args, 'stage_log', None))
+
+    profile_dir = getattr(args, 'profile_dir', None)
+    profiler = cProfile.Profile() if profile_dir else None
+
+    previous, _active = _active, log
+    # Once per job, stages only reset the mark after folding it into log.peak
+    reset_peak_rss()
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield log
+    finally:
+        if profiler:
+            profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            safe_id = re.sub(r'[^\w.-]', '_', job_id)
+            profiler.dump_stats(os.path.join(profile_dir, f"{safe_id}.prof"))
+        log.emit({
+            'job': job_id,
+            'script': script,
+            'stage': 'total',
+            'duration': round(time.perf_counter() - start, 6),
+            'peak_rss': log.job_peak_rss(),
+            'stages': len(log.records),
+        })
+        _active = previous
+
+def summarize(path):
+    """Per (script, stage) call count, total, mean and max duration"""
+    stages = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            stages.setdefault((record.get('script'), record['stage']), []).append(record['duration'])
+
+    print(f"{'script':<24} {'stage':<16} {'count':>6} {'total s':>10} {'mean s':>9} {'max s':>9}")
+    for (script, name), durations in sorted(stages.items(), key=lambda item: -sum(item[1])):
+        print(f"{str(script)[:24]:<24} {name[:16]:<16} {len(durations):>6} {sum(durations):>10.3f} "
+              f"{sum(durations) / len(durations):>9.4f} {max(durations):>9.4f}")
+    return stages
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', type=str, help='Stage log written by --stage-log')
+    args = parser.parse_args()
+    summarize(args.path)
+
+if __name__ == "__main__":
+    main()
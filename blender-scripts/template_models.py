@@ -0,0 +1,138 @@
+"""
+Blender side of the template generators (generate_npc.py, generate_item.py)
+Builds part_templates variants through the data API and exports them as one GLB,
+a packed variant library (variant_library.py) or one GLB per variant (--separate):
+  <stem>_v0.glb, <stem>_v1.glb, ... listed in <stem>.variants.json under "file"
+"""
+
+import os
+import json
+import argparse
+
+import stage_log
+import export_profiles
+import script_defaults
+import variant_library
+import part_templates
+from material_ops import vertex_color_material
+from mesh_build import mesh_from_arrays, object_from_mesh
+from scene_reset import cleanup_scene
+
+PREFIXES = {'npc': 'NPC', 'item': 'Item'}
+
+def separate_path(output_path, index):
+    """File of one variant exported on its own"""
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_v{index}{ext}"
+
+def load_batch(value):
+    """--batch value: a JSON list inline or the path of a JSON file holding one"""
+    if not value:
+        return None
+    if os.path.exists(value):
+        with open(value, 'r', encoding='utf-8') as f:
+            value = f.read()
+    batch = json.loads(value)
+    if not isinstance(batch, list):
+        raise ValueError("--batch must be a JSON list of variants")
+    return batch
+
+def build_model(kind, spec, complexity, name):
+    """Build one variant in the scene, returns the object (origin at its base)"""
+    arrays = part_templates.assemble(kind, spec, complexity)
+    mesh = mesh_from_arrays(name, arrays.positions, arrays.indices, face_colors=arrays.face_colors, y_up=True)
+    # Part colors live in the color attribute, every model is a single draw call
+    obj = object_from_mesh(name, mesh, [vertex_color_material()])
+    obj.select_set(True)
+    return obj
+
+def build_variants(kind, specs, complexity):
+    """Build every variant, returns [(object, spec), ...]"""
+    models = []
+    for index, spec in enumerate(specs):
+        name = spec.get('name') or f"{PREFIXES[kind]}_{spec['template']}_v{index}"
+        obj = build_model(kind, spec, complexity, name)
+        obj.name = obj.data.name = name
+        models.append((obj, spec))
+    return models
+
+def export_selected(output_path, profile):
+    with stage_log.stage('export', output=output_path):
+        export_profiles.export_gltf(output_path, profile, use_selection=True)
+
+def index_records(models):
+    """Variant index records plus the template and fixed colors of each variant"""
+    return [
+        dict(variant_library.variant_record(index, obj, spec['seed']), template=spec['template'],
+             colors=spec.get('colors', {}))
+        for index, (obj, spec) in enumerate(models)
+    ]
+
+def export_separate(models, output_path, profile):
+    """One GLB per variant, returns the index records with their files"""
+    records = index_records(models)
+    for record, (obj, _) in zip(records, models):
+        path = separate_path(output_path, record['index'])
+        for other, _ in models:
+            other.select_set(other is obj)
+        export_selected(path, profile)
+        record['file'] = os.path.basename(path)
+    return records
+
+def generate(kind, args):
+    """Build the requested variants and export them, returns the output (or index) path"""
+    specs = part_templates.variant_specs(kind, args.type, args.variants, args.seed, load_batch(args.batch))
+    with stage_log.stage('build'):
+        models = build_variants(kind, specs, args.complexity)
+
+    if len(models) == 1:
+        export_selected(args.output, args.export_profile)
+        variant_library.remove_index(args.output)
+        print(f"[Blender] {PREFIXES[kind]} {specs[0]['template']} exported to {args.output}")
+        return args.output
+
+    if args.separate:
+        records = export_separate(models, args.output, args.export_profile)
+    else:
+        variant_library.assemble_library(f"{PREFIXES[kind]}_{args.type}", [(obj, spec['seed']) for obj, spec in models],
+                                         args.scatter, seed=args.seed)
+        records = index_records(models)
+        with stage_log.stage('export', output=args.output):
+            variant_library.export_library(args.output, args.export_profile)
+    index = variant_library.write_index(args.output, args.type, records, seed=args.seed,
+                                        complexity=args.complexity, instances=0 if args.separate else args.scatter)
+
+    if args.separate:
+        # No packed GLB, the index lists the variant files
+        print(f"[Blender] {len(models)} {kind} variants exported next to {args.output}, index {index}")
+        return index
+    print(f"[Blender] {len(models)} {kind} variants exported to {args.output}, index {index}")
+    return args.output
+
+def build_parser(kind, default_type, default_complexity):
+    """Argument parser of a template generator script"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--type', type=str, default=default_type,
+                        help=f"Template name or <palette entry>_<template> ({', '.join(part_templates.list_templates(kind))})")
+    parser.add_argument('--complexity', type=int, default=default_complexity, help='1-10, sets cylinder/sphere detail')
+    parser.add_argument('--seed', type=int, default=script_defaults.DEFAULT_SEED)
+    parser.add_argument('--variants', type=int, default=1, help='Seeded variants of --type')
+    parser.add_argument('--batch', type=str, default=None,
+                        help='JSON list (or file) of variants: type names or {"template", "seed", "name", "colors", "proportions"}')
+    parser.add_argument('--separate', action='store_true',
+                        help='Export each variant to <output stem>_v<i>.glb instead of one packed GLB')
+    parser.add_argument('--scatter', type=int, default=0,
+                        help='Scattered GPU instances of the variants in the packed GLB')
+    parser.add_argument('--output', type=str, required=True)
+    export_profiles.add_arguments(parser)
+    stage_log.add_arguments(parser)
+    return parser
+
+def run(kind, args):
+    """Generate the variants of one script invocation and return the output path"""
+    print(f"[Blender] Generating {kind}: type={args.type}, complexity={args.complexity}, seed={args.seed}, "
+          f"variants={len(load_batch(args.batch) or []) or args.variants}")
+
+    with stage_log.stage('reset'):
+        cleanup_scene()
+    return generate(kind, args)
@@ -0,0 +1,11 @@
+"""
+Tests of the Blender-free helpers (plain Python + NumPy, no bpy)
+Run: python -m pytest blender-scripts/tests
+"""
+
+import os
+import sys
+
+# Jobs run here must not touch the real asset catalog
+os.environ['BLENDER_ASSET_CATALOG'] = 'off'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,189 @@
+import ast
+import importlib
+import json
+import os
+
+import pytest
+
+import asset_cache
+import lod_chain
+import script_defaults
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(asset_cache.__file__))
+
+@pytest.fixture
+def cache(tmp_path):
+    return asset_cache.AssetCache(str(tmp_path / 'cache'))
+
+def test_key_ignores_arg_order_and_instrumentation(cache):
+    a = cache.job_key('generate_tree', {'type': 'oak', 'seed': 7, 'output': 'a.glb'})
+    b = cache.job_key('generate_tree', {'seed': '7.0', 'output': 'b.glb', 'type': 'oak', 'job-id': 'x', 'stage-log': 'log.jsonl'})
+    assert a == b
+
+def test_key_drops_neutral_and_script_defaults(cache):
+    plain = cache.job_key('hybrid_modify', {'input': __file__, 'output': 'a.glb'})
+    explicit = cache.job_key('hybrid_modify', {
+        'input': __file__, 'output': 'a.glb', 'rescale': '1.0', 'color-replacements': [],
+        'recolor': {}, 'export-profile': 'classic-lowpoly', 'lod-ratios': lod_chain.DEFAULT_RATIOS,
+    })
+    assert plain == explicit
+    assert plain != cache.job_key('hybrid_modify', {'input': __file__, 'output': 'a.glb', 'rescale': 2})
+
+def test_generator_seed_default(cache):
+    assert cache.job_key('generate_rock', {'output': 'a.glb'}) == cache.job_key('generate_rock', {'output': 'a.glb', 'seed': 42})
+    assert cache.job_key('generate_rock', {'output': 'a.glb'}) != cache.job_key('generate_rock', {'output': 'a.glb', 'seed': 1})
+
+def test_key_follows_input_content(cache, tmp_path):
+    model = tmp_path / 'in.glb'
+    model.write_bytes(b'one')
+    first = cache.job_key('hybrid_modify', {'input': str(model), 'output': 'a.glb'})
+    copy = tmp_path / 'copy.glb'
+    copy.write_bytes(b'one')
+    assert cache.job_key('hybrid_modify', {'input': str(copy), 'output': 'a.glb'}) == first
+    model.write_bytes(b'two')
+    assert cache.job_key('hybrid_modify', {'input': str(model), 'output': 'a.glb'}) != first
+
+def test_batch_keyed_by_file_content(cache, tmp_path):
+    batch = tmp_path / 'batch.json'
+    batch.write_text(json.dumps([{'type': 'oak'}]))
+    first = cache.job_key('generate_tree', {'batch': str(batch), 'output': 'a.glb'})
+    batch.write_text(json.dumps([{'type': 'pine'}]))
+    assert cache.job_key('generate_tree', {'batch': str(batch), 'output': 'a.glb'}) != first
+    # Inline batches are key args
+    inline = cache.job_key('generate_tree', {'batch': [{'type': 'oak'}], 'output': 'a.glb'})
+    assert inline != cache.job_key('generate_tree', {'batch': [{'type': 'pine'}], 'output': 'a.glb'})
+
+def test_normalize_args_splits_paths(tmp_path):
+    key_args, inputs, outputs = asset_cache.normalize_args(
+        ['--models', 'a.glb,none,b.glb', '--output', 'out.glb', '--hero'], 'composite_entity')
+    assert key_args == {'models': 2, 'hero': True}
+    assert inputs == ['a.glb', 'b.glb']
+    assert outputs == {'output': 'out.glb'}
+
+def test_put_get_round_trip_with_lod_chain(cache, tmp_path):
+    output = tmp_path / 'run' / 'tree.glb'
+    output.parent.mkdir()
+    output.write_bytes(b'lod0')
+    lod1 = tmp_path / 'run' / 'tree_lod1.glb'
+    lod1.write_bytes(b'lod1')
+    lod_chain.write_manifest(str(output), [
+        {'ratio': 1.0, 'screen_coverage': 0.25, 'triangles': 10},
+        {'ratio': 0.5, 'screen_coverage': 0.1, 'triangles': 5},
+    ])
+    args = {'type': 'oak', 'output': str(output)}
+    key = cache.job_key('generate_tree', args)
+    assert not cache.get(key, args)
+    cache.put(key, args)
+
+    target = tmp_path / 'other' / 'copy.glb'
+    assert cache.get(key, {'type': 'oak', 'output': str(target)})
+    assert target.read_bytes() == b'lod0'
+    assert (tmp_path / 'other' / 'copy_lod1.glb').read_bytes() == b'lod1'
+    manifest = json.loads((tmp_path / 'other' / 'copy.lod.json').read_text())
+    assert [record['file'] for record in manifest['levels']] == ['copy.glb', 'copy_lod1.glb']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_put_get_round_trip_separate_variants(cache, tmp_path):
+    # --separate export: no main GLB, an index and one file per variant
+    run = tmp_path / 'run'
+    run.mkdir()
+    output = run / 'rocks.glb'
+    for index in range(2):
+        (run / f'rocks_v{index}.glb').write_bytes(f'variant {index}'.encode())
+    index_path = run / ('rocks' + asset_cache.VARIANT_INDEX_SUFFIX)
+    index_path.write_text(json.dumps({'variants': [
+        {'index': i, 'file': f'rocks_v{i}.glb'} for i in range(2)
+    ]}))
+    args = {'variants': 2, 'output': str(output)}
+    key = cache.job_key('generate_rock', args)
+    cache.put(key, args)
+
+    target = tmp_path / 'other' / 'boulders.glb'
+    assert cache.get(key, {'variants': 2, 'output': str(target)})
+    assert not target.exists()
+    assert (tmp_path / 'other' / 'boulders_v1.glb').read_bytes() == b'variant 1'
+    index = json.loads((tmp_path / 'other' / ('boulders' + asset_cache.VARIANT_INDEX_SUFFIX)).read_text())
+    assert [record['file'] for record in index['variants']] == ['boulders_v0.glb', 'boulders_v1.glb']
+
+def test_incomplete_separate_entry_misses(cache, tmp_path):
+    run = tmp_path / 'run'
+    run.mkdir()
+    output = run / 'rocks.glb'
+    (run / 'rocks_v0.glb').write_bytes(b'v0')
+    (run / ('rocks' + asset_cache.VARIANT_INDEX_SUFFIX)).write_text(json.dumps({'variants': [
+        {'index': 0, 'file': 'rocks_v0.glb'}, {'index': 1, 'file': 'rocks_v1.glb'},
+    ]}))
+    args = {'variants': 2, 'output': str(output)}
+    key = cache.job_key('generate_rock', args)
+    cache.put(key, args)
+    assert not cache.get(key, {'variants': 2, 'output': str(tmp_path / 'copy.glb')})
+
+def test_stats(cache, tmp_path):
+    output = tmp_path / 'a.glb'
+    output.write_bytes(b'glb')
+    args = {'output': str(output)}
+    key = cache.job_key('generate_rock', args)
+    cache.put(key, args)
+    cache.get(key, args)
+    assert cache.flush_stats() == {'hits': 1, 'misses': 0}
+    stats = cache.stats()
+    assert stats['files'] == 1 and stats['bytes'] == 3 and stats['hit_rate'] == 1.0
+
+def module_namespace(tree):
+    """Module-level names a default can refer to: bpy-free imports and constants"""
+    namespace = {}
+    for node in tree.body:
+        try:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    namespace[alias.asname or alias.name] = importlib.import_module(alias.name)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                module = importlib.import_module(node.module)
+                for alias in node.names:
+                    namespace[alias.asname or alias.name] = getattr(module, alias.name)
+            elif isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) for t in node.targets):
+                value = eval(compile(ast.Expression(node.value), '<default>', 'eval'), namespace)
+                namespace.update({t.id: value for t in node.targets})
+        except Exception:
+            pass  # bpy modules and values computed at runtime
+    return namespace
+
+def parser_defaults(module_name, function='build_parser'):
+    """Static walk of a script parser (the scripts import bpy): {argument name: default}"""
+    with open(os.path.join(SCRIPTS_DIR, module_name + '.py')) as f:
+        tree = ast.parse(f.read())
+    namespace = module_namespace(tree)
+    functions = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+
+    def evaluate(node):
+        return eval(compile(ast.Expression(node), '<default>', 'eval'), namespace)
+
+    defaults = {}
+    for call in ast.walk(functions[function]):
+        if not isinstance(call, ast.Call):
+            continue
+        func = call.func
+        owner = func.value.id if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) else None
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', None)
+        keywords = {k.arg: k.value for k in call.keywords}
+        try:
+            if name == 'add_argument' and 'default' in keywords:
+                defaults[call.args[0].value.lstrip('-')] = evaluate(keywords['default'])
+            elif owner == 'export_profiles' and name == 'add_arguments':
+                node = call.args[1] if len(call.args) > 1 else keywords.get('default')
+                defaults['export-profile'] = evaluate(node) if node else namespace['export_profiles'].DEFAULT_PROFILE
+            elif owner is None and name in functions:
+                defaults.update(parser_defaults(module_name, name))
+            elif owner and os.path.isfile(os.path.join(SCRIPTS_DIR, owner + '.py')):
+                defaults.update(parser_defaults(owner, name))
+        except NameError:
+            pass  # Defaults passed in as parameters (template_models.build_parser)
+    return defaults
+
+@pytest.mark.parametrize('script', sorted(script_defaults.SCRIPT_DEFAULTS) + ['generate_entity'])
+def test_cache_defaults_match_parsers(script):
+    defaults = parser_defaults(script)
+    expected = dict(asset_cache.NEUTRAL_DEFAULTS, **script_defaults.SCRIPT_DEFAULTS.get(script, {}))
+    assert set(script_defaults.SCRIPT_DEFAULTS.get(script, {})) <= set(defaults)
+    for name in set(expected) & set(defaults):
+        assert asset_cache.normalize_value(defaults[name]) == asset_cache.normalize_value(expected[name]), name
@@ -0,0 +1,30 @@
+import json
+
+import asset_cache
+import asset_catalog
+from placeholder_glb import write_placeholder
+
+def rehash(*args):
+    raise AssertionError('job key recomputed')
+
+def test_record_job_uses_given_key_and_defers_export(tmp_path, monkeypatch):
+    models = tmp_path / 'models'
+    models.mkdir()
+    catalog_path = str(tmp_path / 'catalog.sqlite')
+    monkeypatch.setattr(asset_cache.AssetCache, 'job_key', rehash)
+    for index in range(3):
+        output = models / f"rock_{index}.glb"
+        write_placeholder(output, 'rock', (0.5, 0.5, 0.5), 'box', 1.0)
+        rows = asset_catalog.record_job('generate_rock', {'output': str(output)}, source_hash=f"key{index}",
+                                        catalog_path=catalog_path, models_root=str(models), export=False)
+        assert [row['source_hash'] for row in rows] == [f"key{index}"]
+    assert not (models / asset_catalog.EXPORT_NAME).exists()
+
+    output = asset_catalog.export_catalog(catalog_path, str(models))
+    with open(output, encoding='utf-8') as f:
+        data = json.load(f)
+    assert [row[0] for row in data['rows']] == ['rock_0.glb', 'rock_1.glb', 'rock_2.glb']
+
+def test_export_catalog_without_database(tmp_path):
+    assert asset_catalog.export_catalog(str(tmp_path / 'missing.sqlite'), str(tmp_path)) is None
+    assert asset_catalog.export_catalog('off', str(tmp_path)) is None
@@ -0,0 +1,90 @@
+import numpy as np
+
+import color_ops
+
+def test_replace_colors_on_known_array():
+    colors = np.array([
+        [1.0, 0.0, 0.0, 0.5],
+        [1.0, 1.0 / 255, 0.0, 1.0],  # within tolerance of red
+        [0.0, 1.0, 0.0, 1.0],
+        [1.0, 0.0, 0.0, 0.25],
+        [0.5, 0.5, 0.5, 1.0],
+    ], dtype=np.float32)
+    old_rgb = np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    new_rgb = np.array([[0, 0, 1], [1, 1, 0]], dtype=np.float32)
+
+    result, hits = color_ops.replace_colors(colors, old_rgb, new_rgb)
+    assert hits == 4
+    np.testing.assert_array_equal(result, [
+        [0, 0, 1, 0.5],
+        [0, 0, 1, 1.0],
+        [1, 1, 0, 1.0],
+        [0, 0, 1, 0.25],
+        [0.5, 0.5, 0.5, 1.0],
+    ])
+    # The input is not modified
+    assert colors[0, 2] == 0.0
+
+def test_replace_colors_first_match_wins():
+    colors = np.array([[0.5, 0.5, 0.5]], dtype=np.float32)
+    old_rgb = np.array([[0.5, 0.5, 0.5], [0.5, 0.5, 0.5]], dtype=np.float32)
+    new_rgb = np.array([[1, 0, 0], [0, 1, 0]], dtype=np.float32)
+    result, hits = color_ops.replace_colors(colors, old_rgb, new_rgb)
+    assert hits == 1
+    np.testing.assert_array_equal(result, [[1, 0, 0]])
+
+def test_replace_colors_outside_tolerance():
+    colors = np.array([[1.0, 4.0 / 255, 0.0]], dtype=np.float32)
+    result, hits = color_ops.replace_colors(colors, np.array([[1, 0, 0]], np.float32), np.array([[0, 0, 1]], np.float32))
+    assert hits == 0
+    np.testing.assert_array_equal(result, colors)
+
+def test_replace_colors_empty():
+    result, hits = color_ops.replace_colors(np.zeros((0, 4), np.float32), np.zeros((0, 3)), np.zeros((0, 3)))
+    assert hits == 0 and result.shape == (0, 4)
+
+def test_replacement_table_uses_palette():
+    old_rgb, new_rgb = color_ops.build_replacement_table([[0, 127], [127, 0]])
+    assert old_rgb.shape == new_rgb.shape == (2, 3)
+    np.testing.assert_array_equal(old_rgb[0], new_rgb[1])
+    np.testing.assert_array_equal(old_rgb[1], new_rgb[0])
+
+def test_hsv_round_trip():
+    rgb = np.random.default_rng(1).random((100, 3)).astype(np.float32)
+    np.testing.assert_allclose(color_ops.hsv_to_rgb(color_ops.rgb_to_hsv(rgb)), rgb, atol=1e-5)
+
+def test_shift_hue():
+    colors = np.array([[1, 0, 0, 0.5]], dtype=np.float32)
+    np.testing.assert_allclose(color_ops.shift_hue(colors, 120), [[0, 1, 0, 0.5]], atol=1e-6)
+    np.testing.assert_allclose(color_ops.shift_hue(colors, 360), colors, atol=1e-6)
+
+def test_srgb_to_linear():
+    np.testing.assert_allclose(color_ops.srgb_to_linear([0.0, 0.04045, 0.5, 1.0]),
+                               [0.0, 0.04045 / 12.92, 0.214041, 1.0], rtol=1e-5)
+
+def test_replace_colors_linear_keeps_dark_neighbours():
+    # RS palette greys: sRGB 12, 16, 18, 20, 22, 24, 30, 34 (ids 6..17)
+    ids = [6, 8, 9, 10, 11, 12, 15, 17]
+    colors = color_ops.srgb_to_linear(color_ops.build_replacement_table([[i, i] for i in ids])[0])
+    old_rgb, new_rgb = (color_ops.srgb_to_linear(rgb) for rgb in color_ops.build_replacement_table([[10, 127]]))
+    result, hits = color_ops.replace_colors(colors, old_rgb, new_rgb, linear=True)
+    assert hits == 1
+    np.testing.assert_array_equal(result[3], new_rgb[0])
+    np.testing.assert_array_equal(np.delete(result, 3, axis=0), np.delete(colors, 3, axis=0))
+
+def test_replace_colors_linear_byte_round_trip():
+    # Blender byte colors store sRGB bytes, reading them back gives their linear value
+    srgb = np.array([[20, 20, 20], [200, 100, 50]], dtype=np.float32) / 255
+    colors = color_ops.srgb_to_linear(np.round(srgb * 255 + [[1], [-1]]) / 255)
+    result, hits = color_ops.replace_colors(colors, color_ops.srgb_to_linear(srgb), np.ones((2, 3), np.float32), linear=True)
+    assert hits == 2
+
+def test_linear_to_srgb_inverts_srgb_to_linear():
+    values = np.linspace(0, 1, 256, dtype=np.float32)
+    np.testing.assert_allclose(color_ops.linear_to_srgb(color_ops.srgb_to_linear(values)), values, atol=1e-5)
+
+def test_linear_replacement_table():
+    old_srgb, new_srgb = color_ops.build_replacement_table([[1000, 2000]])
+    old_linear, new_linear = color_ops.build_replacement_table([[1000, 2000]], linear=True)
+    np.testing.assert_array_equal(old_linear, color_ops.srgb_to_linear(old_srgb))
+    np.testing.assert_array_equal(new_linear, color_ops.srgb_to_linear(new_srgb))
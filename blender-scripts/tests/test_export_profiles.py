@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+import export_profiles
+
+def brute_force(reference, positions):
+    return ((positions[:, None, :] - reference[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+
+@pytest.mark.parametrize('shape', ['cloud', 'plane'])
+def test_nearest_distances_match_brute_force(shape):
+    rng = np.random.default_rng(3)
+    reference = rng.random((400, 3))
+    if shape == 'plane':
+        reference[:, 2] = 0
+    # Quantization noise, plus a few points far outside the grid
+    positions = np.concatenate([reference + rng.normal(0, 1e-3, reference.shape), rng.random((5, 3)) * 20 - 10])
+    np.testing.assert_allclose(export_profiles.nearest_distances(reference, positions),
+                               brute_force(reference, positions), rtol=1e-6, atol=1e-12)
+
+def test_max_position_error():
+    reference = np.array([[0, 0, 0], [1, 0, 0]], dtype=np.float32)
+    positions = np.array([[0, 0.5, 0], [1, 0, 0]], dtype=np.float32)
+    assert export_profiles.max_position_error(reference, positions) == pytest.approx(0.5)
+
+def test_output_compression():
+    assert export_profiles.output_compression('raw') is None
+    assert export_profiles.output_compression('classic-lowpoly') == 'draco'
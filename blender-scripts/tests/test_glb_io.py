@@ -0,0 +1,96 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+import inspect_glb
+from glb_io import CHUNK_BIN, CHUNK_JSON, GltfBuilder, glb_chunks, pack_glb
+from placeholder_glb import build_placeholder, write_placeholder
+
+def parse(data):
+    """(gltf, bin bytes) of GLB bytes"""
+    gltf, binary = None, b''
+    for chunk_type, start, length in glb_chunks(data):
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(data[start:start + length])
+        elif chunk_type == CHUNK_BIN:
+            binary = data[start:start + length]
+    return gltf, binary
+
+def read_accessor(gltf, binary, index):
+    accessor = gltf['accessors'][index]
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = {5121: np.uint8, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}[accessor['componentType']]
+    components = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}[accessor['type']]
+    array = np.frombuffer(binary, dtype=dtype, count=accessor['count'] * components, offset=view['byteOffset'])
+    return array.reshape(accessor['count'], components) if components > 1 else array
+
+def test_write_then_parse(tmp_path):
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 2, 0]], dtype=np.float32)
+    normals = np.tile(np.array([0, 0, 1], dtype=np.float32), (3, 1))
+    colors = np.array([[1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 0.5]], dtype=np.float32)
+
+    builder = GltfBuilder()
+    material = builder.add_material('Red', (1, 0, 0))
+    mesh = builder.add_mesh('tri', positions, [0, 1, 2], normals=normals, colors=colors, material=material)
+    builder.add_node('tri', mesh=mesh, translation=(0, 1, 0))
+    path = tmp_path / 'tri.glb'
+    size = builder.write(path)
+
+    data = path.read_bytes()
+    assert size == len(data) == struct.unpack_from('<I', data, 8)[0]
+    gltf, binary = parse(data)
+    assert gltf['asset']['version'] == '2.0'
+    assert gltf['buffers'] == [{'byteLength': len(binary)}]
+    assert gltf['nodes'][0] == {'name': 'tri', 'mesh': 0, 'translation': [0.0, 1.0, 0.0]}
+    assert gltf['materials'][0]['pbrMetallicRoughness']['baseColorFactor'] == [1.0, 0.0, 0.0, 1.0]
+
+    primitive = gltf['meshes'][0]['primitives'][0]
+    assert primitive['material'] == 0
+    attributes = primitive['attributes']
+    np.testing.assert_array_equal(read_accessor(gltf, binary, attributes['POSITION']), positions)
+    np.testing.assert_array_equal(read_accessor(gltf, binary, attributes['NORMAL']), normals)
+    np.testing.assert_array_equal(read_accessor(gltf, binary, attributes['COLOR_0']), colors)
+    np.testing.assert_array_equal(read_accessor(gltf, binary, primitive['indices']), [0, 1, 2])
+    position = gltf['accessors'][attributes['POSITION']]
+    assert position['min'] == [0, 0, 0] and position['max'] == [1, 2, 0]
+
+    for view in gltf['bufferViews']:
+        assert view['byteOffset'] % 4 == 0
+
+def test_index_width():
+    builder = GltfBuilder()
+    small = builder.add_indices([0, 1, 2])
+    large = builder.add_indices([0, 1, 70000])
+    assert builder.gltf['accessors'][small]['componentType'] == 5123
+    assert builder.gltf['accessors'][large]['componentType'] == 5125
+
+def test_json_only_glb_has_no_bin_chunk():
+    data = pack_glb({'asset': {'version': '2.0'}})
+    assert [chunk_type for chunk_type, _, _ in glb_chunks(data)] == [CHUNK_JSON]
+    assert len(data) % 4 == 0
+
+@pytest.mark.parametrize('data, message', [
+    (b'glTF', 'too short'),
+    (b'XXXX' + struct.pack('<II', 2, 12), 'bad magic'),
+    (struct.pack('<III', 0x46546C67, 1, 12), 'version'),
+])
+def test_rejects_broken_headers(data, message):
+    with pytest.raises(ValueError, match=message):
+        list(glb_chunks(data))
+
+def test_placeholder_inspects_cleanly(tmp_path):
+    path = tmp_path / 'box.glb'
+    write_placeholder(path, 'box', (0.3, 0.5, 0.2), 'box', 2.0)
+    record = inspect_glb.inspect(str(path))
+    assert 'error' not in record
+    assert record['triangles'] == 12
+    assert record['materials'] == 1 and record['compression'] == []
+    # Resting on the ground plane
+    assert record['bounds']['min'][1] == pytest.approx(0.0)
+    assert record['bounds']['max'][1] == pytest.approx(2.0)
+
+def test_placeholder_rejects_unknown_primitive():
+    with pytest.raises(ValueError, match='Unknown primitive'):
+        build_placeholder('x', (1, 1, 1), 'teapot')
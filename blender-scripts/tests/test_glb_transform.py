@@ -0,0 +1,129 @@
+import json
+
+import numpy as np
+import pytest
+
+import glb_transform
+from color_ops import build_replacement_table, srgb_to_linear
+from glb_io import CHUNK_BIN, CHUNK_JSON, GltfBuilder, glb_chunks, write_glb
+
+POSITIONS = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+
+def write_model(path, colors, base_color=(1, 1, 1), extensions_used=None, node=None):
+    builder = GltfBuilder()
+    material = builder.add_material('Skin', base_color)
+    mesh = builder.add_mesh('tri', POSITIONS, [0, 1, 2], colors=colors, material=material)
+    builder.add_node('root', mesh=mesh, **(node or {'translation': (0, 2, 0)}))
+    if extensions_used:
+        builder.gltf['extensionsUsed'] = list(extensions_used)
+    builder.write(path)
+    return path
+
+def read_model(path):
+    data = path.read_bytes()
+    gltf, binary = None, b''
+    for chunk_type, start, length in glb_chunks(data):
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(data[start:start + length])
+        elif chunk_type == CHUNK_BIN:
+            binary = data[start:start + length]
+    return gltf, binary
+
+def test_accessor_is_zero_copy_view(tmp_path):
+    colors = np.array([[1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 1]], dtype=np.float32)
+    path = write_model(tmp_path / 'in.glb', colors)
+    with glb_transform.GltfDocument(str(path)) as doc:
+        np.testing.assert_array_equal(doc.accessor(0), POSITIONS)
+        assert doc.color_accessors() == ([1], 0)
+        np.testing.assert_array_equal(doc.read_colors(1), colors)
+        # Copy-on-write map: edits stay in memory
+        doc.write_colors(1, np.zeros((3, 4), np.float32))
+        assert not doc.read_colors(1).any()
+    with glb_transform.GltfDocument(str(path)) as doc:
+        np.testing.assert_array_equal(doc.read_colors(1), colors)
+
+def test_replacements_match_linear_colors(tmp_path):
+    old_srgb, new_srgb = build_replacement_table([[1000, 2000]])
+    old_linear, new_linear = srgb_to_linear(old_srgb)[0], srgb_to_linear(new_srgb)[0]
+    other = np.array([0.1, 0.9, 0.1], dtype=np.float32)
+    colors = np.array([[*old_linear, 1], [*old_linear, 0.5], [*other, 1]], dtype=np.float32)
+    source = write_model(tmp_path / 'in.glb', colors, base_color=old_linear)
+    output = tmp_path / 'out.glb'
+
+    stats = glb_transform.transform_glb(str(source), str(output), replacements=[[1000, 2000]])
+    assert stats['replace'] == {'materials': 1, 'vertex_colors': 2, 'compressed_color_sets': 0}
+
+    with glb_transform.GltfDocument(str(output)) as doc:
+        result = doc.read_colors(1)
+        np.testing.assert_allclose(result[:2, :3], [new_linear, new_linear], atol=1e-6)
+        np.testing.assert_array_equal(result[:, 3], [1, 0.5, 1])
+        np.testing.assert_array_equal(result[2, :3], other)
+        np.testing.assert_allclose(doc.base_colors()[0, :3], new_linear, atol=1e-5)
+
+def test_save_keeps_geometry_bytes(tmp_path):
+    source = write_model(tmp_path / 'in.glb', np.ones((3, 4), np.float32))
+    output = tmp_path / 'out.glb'
+    glb_transform.transform_glb(str(source), str(output), base_color=(0.5, 0.5, 0.5))
+    before, after = read_model(source), read_model(output)
+    assert before[1] == after[1]
+    assert after[0]['materials'][0]['pbrMetallicRoughness']['baseColorFactor'] == [0.5, 0.5, 0.5, 1.0]
+    assert before[0]['bufferViews'] == after[0]['bufferViews']
+
+def test_transform_in_place(tmp_path):
+    path = write_model(tmp_path / 'in.glb', np.ones((3, 4), np.float32))
+    glb_transform.transform_glb(str(path), str(path), hue_shift=90, base_color=(1, 0, 0))
+    gltf, _ = read_model(path)
+    assert gltf['materials'][0]['pbrMetallicRoughness']['baseColorFactor'] == [1.0, 0.0, 0.0, 1.0]
+
+def test_rescale_is_absolute(tmp_path):
+    source = write_model(tmp_path / 'in.glb', np.ones((3, 4), np.float32))
+    once, twice = tmp_path / 'once.glb', tmp_path / 'twice.glb'
+    glb_transform.transform_glb(str(source), str(once), rescale=2.0)
+    glb_transform.transform_glb(str(once), str(twice), rescale=2.0)
+    node = read_model(twice)[0]['nodes'][0]
+    assert node['scale'] == [2.0, 2.0, 2.0]
+    assert node['translation'] == [0.0, 2.0, 0.0]
+
+def test_rescale_matrix_node(tmp_path):
+    # Column-major: x axis scaled by 3, translation (1, 2, 3)
+    matrix = [3, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 1, 2, 3, 1]
+    path = write_model(tmp_path / 'in.glb', np.ones((3, 4), np.float32), node={'matrix': matrix})
+    with glb_transform.GltfDocument(str(path)) as doc:
+        assert doc.rescale(2.0) == 1
+        result = doc.gltf['nodes'][0]['matrix']
+    assert result == [2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 2, 0, 1, 2, 3, 1]
+
+@pytest.mark.parametrize('extensions, compression, expected', [
+    (None, False, True),
+    (None, None, True),
+    (None, 'draco', False),
+    (['KHR_draco_mesh_compression'], 'draco', True),
+    (['KHR_draco_mesh_compression'], None, False),
+    (['EXT_meshopt_compression'], 'draco', False),
+])
+def test_can_transform_compression(tmp_path, extensions, compression, expected):
+    path = write_model(tmp_path / 'in.glb', np.ones((3, 4), np.float32), extensions_used=extensions)
+    assert glb_transform.can_transform(str(path), compression) is expected
+
+def test_can_transform_rejects_compressed_colors(tmp_path):
+    path = write_model(tmp_path / 'in.glb', np.ones((3, 4), np.float32))
+    gltf, binary = read_model(path)
+    gltf['meshes'][0]['primitives'][0]['extensions'] = {'KHR_draco_mesh_compression': {}}
+    write_glb(path, gltf, binary)
+    assert glb_transform.can_transform(str(path)) is False
+
+def test_parse_recolor():
+    assert glb_transform.parse_recolor(None) == (0.0, None)
+    assert glb_transform.parse_recolor({'from': 'auto', 'to': 'hue:30'}) == (30.0, None)
+    shift, (old_rgb, new_rgb) = glb_transform.parse_recolor({'from': '#ffffff', 'to': '#000000'})
+    assert shift == 0.0
+    np.testing.assert_allclose(old_rgb, [[1, 1, 1]])
+    np.testing.assert_allclose(new_rgb, [[0, 0, 0]])
+
+def test_replacements_keep_dark_neighbours(tmp_path):
+    # RS palette greys sRGB 16, 20 and 24 (ids 8, 10, 12), only 20 is replaced
+    palette, _ = build_replacement_table([[8, 8], [10, 10], [12, 12]])
+    colors = np.concatenate([srgb_to_linear(palette), np.ones((3, 1), np.float32)], axis=1)
+    source = write_model(tmp_path / 'in.glb', colors)
+    stats = glb_transform.transform_glb(str(source), str(tmp_path / 'out.glb'), replacements=[[10, 127]])
+    assert stats['replace']['vertex_colors'] == 1
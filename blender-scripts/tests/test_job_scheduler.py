@@ -0,0 +1,145 @@
+import json
+import threading
+
+import pytest
+
+import job_scheduler
+import lod_chain
+from job_scheduler import JobScheduler, copy_outputs, handle_request
+
+TIMEOUT = 10
+
+class FakeWorker:
+    """WorkerProcess stand-in: writes the job's output, jobs with a gate wait for it"""
+
+    def __init__(self, name, log, gates):
+        self.name = name
+        self.log = log
+        self.gates = gates
+        self.stopped = False
+
+    def run(self, job, timeout):
+        self.log.append(('start', job['id']))
+        gate = self.gates.get(job['id'])
+        if gate is not None:
+            assert gate.wait(TIMEOUT)
+        with open(job['args']['output'], 'w', encoding='utf-8') as f:
+            f.write(f"{job['id']} seed {job['args'].get('seed')}")
+        self.log.append(('end', job['id']))
+        return {'ok': True}
+
+    def stop(self):
+        self.stopped = True
+
+@pytest.fixture
+def scheduler_factory():
+    started = []
+
+    def make(workers=2, limits=None, gates=None):
+        log = []
+        scheduler = JobScheduler(workers=workers, limits=limits,
+                                 worker_factory=lambda name: FakeWorker(name, log, gates or {}))
+        started.append(scheduler)
+        return scheduler.start(), log
+
+    yield make
+    for scheduler in started:
+        scheduler.shutdown()
+
+def job(job_id, output, seed=1, priority=None):
+    record = {'id': job_id, 'script': 'generate_rock', 'args': {'seed': seed, 'output': str(output)}}
+    if priority:
+        record['priority'] = priority
+    return record
+
+def wait_started(log, job_id):
+    for _ in range(TIMEOUT * 100):
+        if ('start', job_id) in log:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"{job_id} never started")
+
+def test_limits_keep_a_worker_for_interactive():
+    assert JobScheduler(workers=1).workers == 2
+    scheduler = JobScheduler(workers=4)
+    assert scheduler.limits == {'bulk': 3, 'interactive': 4}
+    scheduler = JobScheduler(workers=2, limits={'bulk': 4})
+    assert scheduler.workers == 5
+
+def test_identical_jobs_share_one_run(scheduler_factory, tmp_path):
+    gate = threading.Event()
+    scheduler, log = scheduler_factory(gates={'a': gate})
+    first = scheduler.submit(job('a', tmp_path / 'a.glb'))
+    wait_started(log, 'a')
+    second = scheduler.submit(job('b', tmp_path / 'out' / 'b.glb'))
+    gate.set()
+
+    a, b = first.result(TIMEOUT), second.result(TIMEOUT)
+    assert a['ok'] and b['ok']
+    assert (a['id'], a['coalesced']) == ('a', False)
+    assert (b['id'], b['coalesced']) == ('b', True)
+    assert [entry for entry in log if entry[0] == 'start'] == [('start', 'a')]
+    assert (tmp_path / 'out' / 'b.glb').read_text() == 'a seed 1'
+    assert scheduler.stats()['classes']['bulk']['coalesced'] == 1
+
+def test_finished_job_runs_again(scheduler_factory, tmp_path):
+    scheduler, log = scheduler_factory()
+    scheduler.submit(job('a', tmp_path / 'a.glb')).result(TIMEOUT)
+    assert not scheduler.submit(job('b', tmp_path / 'b.glb')).result(TIMEOUT)['coalesced']
+    assert ('start', 'b') in log
+
+def test_interactive_promotes_queued_bulk(scheduler_factory, tmp_path):
+    gate = threading.Event()
+    scheduler, log = scheduler_factory(limits={'bulk': 1}, gates={'busy': gate})
+    busy = scheduler.submit(job('busy', tmp_path / 'busy.glb', seed=1))
+    wait_started(log, 'busy')
+    queued = scheduler.submit(job('queued', tmp_path / 'queued.glb', seed=2))
+    assert scheduler.stats()['queued']['bulk'] == 1
+
+    live = scheduler.submit(job('live', tmp_path / 'live.glb', seed=2, priority='interactive'))
+    # Runs on the worker kept for interactive jobs while the bulk job still holds the other
+    assert live.result(TIMEOUT)['ok']
+    assert queued.result(TIMEOUT)['priority'] == 'bulk'
+    assert not busy.done()
+    gate.set()
+    assert busy.result(TIMEOUT)['ok']
+    assert scheduler.stats()['classes']['interactive']['promoted'] == 1
+    assert (tmp_path / 'live.glb').read_text() == 'queued seed 2'
+
+def test_unknown_priority_is_rejected(scheduler_factory, tmp_path):
+    scheduler, _ = scheduler_factory()
+    with pytest.raises(ValueError, match='Unknown priority'):
+        scheduler.submit(job('a', tmp_path / 'a.glb', priority='urgent'))
+
+def test_handle_request_commands(scheduler_factory, tmp_path):
+    scheduler, _ = scheduler_factory()
+    responses = []
+    assert handle_request(scheduler, json.dumps({'command': 'ping', 'id': 1}), responses.append)
+    assert handle_request(scheduler, 'not json', responses.append)
+    assert handle_request(scheduler, json.dumps({'id': 2, 'args': {}}), responses.append)
+    assert not handle_request(scheduler, json.dumps({'command': 'shutdown'}), responses.append)
+    assert responses[0]['pong']
+    assert 'Invalid JSON' in responses[1]['error']
+    assert responses[2] == {'id': 2, 'ok': False, 'error': "Job has no 'script'"}
+    assert responses[3]['shutdown']
+
+def test_copy_outputs_with_lod_chain(tmp_path):
+    source = tmp_path / 'src' / 'tree.glb'
+    source.parent.mkdir()
+    source.write_bytes(b'lod0')
+    (tmp_path / 'src' / 'tree_lod1.glb').write_bytes(b'lod1')
+    lod_chain.write_manifest(str(source), [
+        {'ratio': 1.0, 'screen_coverage': 0.25, 'triangles': 10},
+        {'ratio': 0.5, 'screen_coverage': 0.1, 'triangles': 5},
+    ])
+    target = tmp_path / 'dst' / 'copy.glb'
+    copy_outputs({'output': str(source)}, {'output': str(target)})
+    assert target.read_bytes() == b'lod0'
+    assert (tmp_path / 'dst' / 'copy_lod1.glb').read_bytes() == b'lod1'
+    manifest = json.loads((tmp_path / 'dst' / 'copy.lod.json').read_text())
+    assert [record['file'] for record in manifest['levels']] == ['copy.glb', 'copy_lod1.glb']
+
+def test_percentile():
+    assert job_scheduler.percentile([], 0.5) is None
+    assert job_scheduler.percentile([3, 1, 2, 4], 0.5) == 3
+    assert job_scheduler.percentile([3, 1, 2, 4], 0.95) == 4
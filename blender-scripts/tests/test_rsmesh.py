@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import rsmesh
+
+def sample_mesh():
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    indices = np.array([[0, 1, 2], [0, 2, 3], [1, 2, 3]], dtype=np.uint32)
+    normals = np.tile(np.array([0, 0, 1], dtype=np.float32), (4, 1))
+    uvs = np.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=np.float32)
+    face_colors = np.array([[255, 0, 0, 255], [0, 128, 255, 200], [10, 20, 30, 255]], dtype=np.uint8)
+    # Odd face count keeps the u16 material buffer unaligned, exercising the padding
+    face_materials = np.array([7, rsmesh.NO_MATERIAL, 3], dtype=np.uint16)
+    return positions, indices, normals, uvs, face_colors, face_materials
+
+def test_round_trip_all_buffers(tmp_path):
+    positions, indices, normals, uvs, face_colors, face_materials = sample_mesh()
+    path = tmp_path / 'mesh.rsmesh'
+    rsmesh.write_rsmesh(path, positions, indices, normals=normals, uvs=uvs,
+                        face_colors=face_colors, face_materials=face_materials)
+
+    # 6 material bytes padded to 8
+    assert path.stat().st_size == rsmesh.HEADER.size + 48 + 48 + 32 + 36 + 12 + 8
+    mesh = rsmesh.read_rsmesh(path)
+    np.testing.assert_array_equal(mesh.positions, positions)
+    np.testing.assert_array_equal(mesh.indices, indices)
+    np.testing.assert_array_equal(mesh.normals, normals)
+    np.testing.assert_array_equal(mesh.uvs, uvs)
+    np.testing.assert_array_equal(mesh.face_colors, face_colors)
+    np.testing.assert_array_equal(mesh.face_materials, face_materials)
+
+def test_optional_buffers_are_none():
+    positions, indices, *_ = sample_mesh()
+    mesh = rsmesh.parse_rsmesh(rsmesh.pack_rsmesh(positions, indices))
+    assert mesh.normals is None and mesh.uvs is None
+    assert mesh.face_colors is None and mesh.face_materials is None
+    np.testing.assert_array_equal(mesh.positions, positions)
+
+def test_buffers_are_aligned():
+    positions, indices, *_ , face_materials = sample_mesh()
+    data = rsmesh.pack_rsmesh(positions[:3], indices[:1], face_materials=face_materials[:1])
+    assert len(data) % 4 == 0
+
+def test_rgb_colors_get_opaque_alpha():
+    positions, indices, *_ = sample_mesh()
+    mesh = rsmesh.parse_rsmesh(rsmesh.pack_rsmesh(positions, indices, face_colors=[[1, 2, 3], [4, 5, 6], [7, 8, 9]]))
+    np.testing.assert_array_equal(mesh.face_colors, [[1, 2, 3, 255], [4, 5, 6, 255], [7, 8, 9, 255]])
+
+@pytest.mark.parametrize('mutate, message', [
+    (lambda data: b'XXXX' + data[4:], 'bad magic'),
+    (lambda data: data[:10], 'too short'),
+    (lambda data: data[:-8], 'truncated'),
+])
+def test_rejects_broken_files(mutate, message):
+    positions, indices, *_ = sample_mesh()
+    with pytest.raises(ValueError, match=message):
+        rsmesh.parse_rsmesh(mutate(rsmesh.pack_rsmesh(positions, indices)))
+
+def test_rejects_out_of_range_index():
+    positions, _, *_ = sample_mesh()
+    with pytest.raises(ValueError, match='out of range'):
+        rsmesh.parse_rsmesh(rsmesh.pack_rsmesh(positions, [[0, 1, 9]]))
+
+def test_replace_materials_maps_original_ids():
+    ids = np.array([1, 2, 3, rsmesh.NO_MATERIAL, 2], dtype=np.int32)
+    # 2 → 5 and 3 → 2 apply to the original ids only, the later 2 → 9 pair loses
+    result, hits = rsmesh.replace_materials(ids, [[2, 5], [3, 2], [2, 9]])
+    np.testing.assert_array_equal(result, [1, 5, 2, rsmesh.NO_MATERIAL, 5])
+    assert hits == 3
+    np.testing.assert_array_equal(ids, [1, 2, 3, rsmesh.NO_MATERIAL, 2])
+
+def test_replace_materials_without_pairs():
+    ids = np.array([1, 2], dtype=np.int32)
+    result, hits = rsmesh.replace_materials(ids, [])
+    assert hits == 0
+    np.testing.assert_array_equal(result, ids)
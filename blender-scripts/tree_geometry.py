@@ -0,0 +1,209 @@
+"""
+Branching tree geometry in NumPy (no Blender needed)
+A seeded skeleton of trunk and branch segments is grown level by level, then every
+segment becomes an open tapered tube and every branch tip a low-poly leaf cluster,
+all in one vectorized pass. Coordinates are Blender Z-up with the base at the origin.
+
+The structure is fixed by species and complexity (randomness only bends, scales and
+rotates), so the triangle count is known up front, see triangle_count():
+  segments  = TRUNK_SEGMENTS + branch_count * (1 + children + ... + children^(depth - 1))
+  clusters  = branch_count * children^(depth - 1) + 1
+  triangles = segments * 2 * sides + clusters * 20 * 4^leaf_subdivisions
+"""
+
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from primitives import icosphere
+
+TreeArrays = namedtuple('TreeArrays', ['positions', 'indices', 'material_indices'])
+
+TREE_PARAMS = {
+    'oak': {
+        'trunk_height': 2.5,
+        'trunk_radius': 0.3,
+        'crown_size': 2.0,
+        'branch_count': 8,
+        'leaf_density': 0.8,
+        'spread': 0.9,  # branch angle from the parent, radians
+        'droop': 0.0,   # downward pull on branch tips
+    },
+    'willow': {
+        'trunk_height': 3.0,
+        'trunk_radius': 0.25,
+        'crown_size': 2.5,
+        'branch_count': 12,
+        'leaf_density': 1.0,
+        'spread': 1.1,
+        'droop': 0.9,
+    },
+    'yew': {
+        'trunk_height': 4.0,
+        'trunk_radius': 0.4,
+        'crown_size': 1.5,
+        'branch_count': 6,
+        'leaf_density': 0.6,
+        'spread': 0.6,
+        'droop': 0.1,
+    },
+    'maple': {
+        'trunk_height': 3.5,
+        'trunk_radius': 0.35,
+        'crown_size': 2.2,
+        'branch_count': 10,
+        'leaf_density': 0.7,
+        'spread': 1.0,
+        'droop': 0.0,
+    },
+}
+# Tree dimensions varied per library variant
+JITTER_PARAMS = ('trunk_height', 'trunk_radius', 'crown_size')
+
+TRUNK_SEGMENTS = 3
+CHILDREN = 3
+MATERIAL_BARK, MATERIAL_LEAVES = 0, 1
+
+def structure(tree_type, complexity):
+    """Radial sides, branch depth and leaf cluster subdivisions for a complexity 1-10"""
+    complexity = min(max(int(complexity), 1), 10)
+    params = TREE_PARAMS.get(tree_type, TREE_PARAMS['oak'])
+    return {
+        'sides': 4 + complexity // 2,
+        'depth': 1 + complexity // 4,
+        'leaf_subdivisions': 0 if complexity < 6 else 1,
+        'branch_count': params['branch_count'],
+    }
+
+def triangle_count(tree_type, complexity):
+    """Exact triangle count tree_arrays() produces"""
+    s = structure(tree_type, complexity)
+    branches = sum(s['branch_count'] * CHILDREN ** level for level in range(s['depth']))
+    clusters = s['branch_count'] * CHILDREN ** (s['depth'] - 1) + 1
+    return (TRUNK_SEGMENTS + branches) * 2 * s['sides'] + clusters * 20 * 4 ** s['leaf_subdivisions']
+
+def normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+def rotate_away(direction, angle, azimuth):
+    """Tilt a unit direction by angle, around it by azimuth"""
+    direction = np.asarray(direction, dtype=np.float64)
+    helper = np.array([1.0, 0.0, 0.0]) if abs(direction[2]) > 0.9 else np.array([0.0, 0.0, 1.0])
+    u = normalize(np.cross(helper, direction))
+    v = np.cross(direction, u)
+    side = np.cos(azimuth) * u + np.sin(azimuth) * v
+    return normalize(np.cos(angle) * direction + np.sin(angle) * side)
+
+def grow_skeleton(params, depth, rng):
+    """Segments as (start, end, start radius, end radius) plus the leaf cluster centers and radii"""
+    segments = []
+    height = params['trunk_height']
+    radius = params['trunk_radius']
+
+    # Slightly wandering trunk
+    point = np.zeros(3)
+    for index in range(TRUNK_SEGMENTS):
+        step = np.array([rng.uniform(-0.05, 0.05), rng.uniform(-0.05, 0.05), 1.0]) * height / TRUNK_SEGMENTS
+        r0 = radius * (1 - 0.25 * index / TRUNK_SEGMENTS)
+        r1 = radius * (1 - 0.25 * (index + 1) / TRUNK_SEGMENTS)
+        segments.append((point, point + step, r0, r1))
+        point = point + step
+    trunk_top = point
+
+    leaves = [(trunk_top + np.array([0, 0, params['crown_size'] * 0.3]), params['crown_size'] * 0.45)]
+
+    # Level 1 branches leave the upper trunk on a golden-angle spiral
+    golden = np.pi * (3 - np.sqrt(5))
+    parents = []
+    for index in range(params['branch_count']):
+        along = 0.45 + 0.55 * (index + 0.5) / params['branch_count']
+        start = trunk_top * along
+        direction = rotate_away([0.0, 0.0, 1.0], params['spread'] * rng.uniform(0.8, 1.2),
+                                index * golden + rng.uniform(-0.3, 0.3))
+        parents.append((start, direction, params['crown_size'] * rng.uniform(0.55, 0.8), radius * 0.45))
+
+    for level in range(depth):
+        children = []
+        for start, direction, length, branch_radius in parents:
+            # Droop bends the branch down towards its tip
+            direction = normalize(direction - np.array([0.0, 0.0, params['droop'] * 0.5 * (level + 1) / depth]))
+            end = start + direction * length
+            segments.append((start, end, branch_radius, branch_radius * 0.6))
+            if level == depth - 1:
+                cluster = params['crown_size'] * params['leaf_density'] * 0.35 * (0.8 + 0.4 / depth)
+                leaves.append((end, cluster * rng.uniform(0.8, 1.2)))
+                continue
+            for child in range(CHILDREN):
+                child_start = start + (end - start) * rng.uniform(0.55, 0.95)
+                child_direction = rotate_away(direction, params['spread'] * 0.6 * rng.uniform(0.7, 1.3),
+                                              2 * np.pi * child / CHILDREN + rng.uniform(-0.4, 0.4))
+                children.append((child_start, child_direction, length * 0.6, branch_radius * 0.6))
+        parents = children
+
+    return segments, leaves
+
+def tubes(segments, sides):
+    """Open tapered tubes, one per segment: (positions (N*2*sides, 3), indices (N*2*sides, 3))"""
+    starts = np.array([s[0] for s in segments])
+    ends = np.array([s[1] for s in segments])
+    radii = np.array([[s[2], s[3]] for s in segments])
+    count = len(segments)
+
+    axis = normalize(ends - starts)
+    helper = np.where(np.abs(axis[:, 2:3]) > 0.9, [[1.0, 0.0, 0.0]], [[0.0, 0.0, 1.0]])
+    u = normalize(np.cross(helper, axis))
+    v = np.cross(axis, u)
+
+    angles = np.linspace(0, 2 * np.pi, sides, endpoint=False)
+    # (N, sides, 3) unit ring offsets, counter-clockwise around the axis
+    ring = np.cos(angles)[None, :, None] * u[:, None] + np.sin(angles)[None, :, None] * v[:, None]
+    bottom = starts[:, None] + ring * radii[:, 0, None, None]
+    top = ends[:, None] + ring * radii[:, 1, None, None]
+    positions = np.concatenate([bottom, top], axis=1).reshape(-1, 3)
+
+    i = np.arange(sides)
+    j = (i + 1) % sides
+    # Outward winding: (b_i, b_j, t_j), (b_i, t_j, t_i)
+    quad = np.concatenate([
+        np.stack([i, j, sides + j], axis=1),
+        np.stack([i, sides + j, sides + i], axis=1),
+    ])
+    indices = (np.arange(count)[:, None, None] * 2 * sides + quad[None]).reshape(-1, 3)
+    return positions, indices
+
+def clusters(leaves, subdivisions, rng):
+    """Leaf clusters: one randomly squashed icosphere per tip"""
+    sphere = icosphere(subdivisions)
+    # Y-up primitive → Z-up
+    template = np.stack([sphere.positions[:, 0], -sphere.positions[:, 2], sphere.positions[:, 1]], axis=1)
+    centers = np.array([leaf[0] for leaf in leaves])
+    scales = np.array([[leaf[1] * rng.uniform(0.9, 1.1), leaf[1] * rng.uniform(0.9, 1.1), leaf[1] * rng.uniform(0.7, 0.9)]
+                       for leaf in leaves])
+    positions = (centers[:, None] + template[None] * scales[:, None]).reshape(-1, 3)
+    offsets = np.arange(len(leaves))[:, None, None] * len(template)
+    indices = (offsets + sphere.indices.astype(np.int64)[None]).reshape(-1, 3)
+    return positions, indices
+
+def tree_arrays(tree_type, complexity, seed, jitter=0.0):
+    """
+    Full tree mesh arrays for one species
+    jitter: relative random variation of the tree dimensions (library variants)
+    """
+    rng = random.Random(seed)
+    params = dict(TREE_PARAMS.get(tree_type, TREE_PARAMS['oak']))
+    for key in JITTER_PARAMS:
+        params[key] *= 1 + rng.uniform(-jitter, jitter)
+    s = structure(tree_type, complexity)
+
+    segments, leaves = grow_skeleton(params, s['depth'], rng)
+    bark_positions, bark_indices = tubes(segments, s['sides'])
+    leaf_positions, leaf_indices = clusters(leaves, s['leaf_subdivisions'], rng)
+
+    positions = np.concatenate([bark_positions, leaf_positions]).astype(np.float32)
+    indices = np.concatenate([bark_indices, leaf_indices + len(bark_positions)]).astype(np.int32)
+    material_indices = np.concatenate([
+        np.full(len(bark_indices), MATERIAL_BARK, dtype=np.int32),
+        np.full(len(leaf_indices), MATERIAL_LEAVES, dtype=np.int32),
+    ])
+    return TreeArrays(positions, indices, material_indices)
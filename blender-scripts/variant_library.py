@@ -0,0 +1,106 @@
+"""
+Variant libraries: several seeded variants of one asset in a single GLB
+Each variant is one mesh under the "<name>_variants" empty. Optional scattered instances
+reuse those meshes under "<name>_instances", which the glTF exporter writes as
+EXT_mesh_gpu_instancing (export_gpu_instances). A JSON index next to the GLB lists each
+variant's node, mesh, seed, triangle count and bounds (glTF Y-up), so the runtime can
+place instances of a variant without loading one file per resource:
+  {"asset": "oak", "variants": [{"index": 0, "node": "Tree_oak_v0", "seed": 42,
+   "triangles": 412, "bounds": {"min": [...], "max": [...]}}, ...], "instances": 0}
+"""
+
+import os
+import json
+import math
+import random
+
+import bpy
+import numpy as np
+
+import export_profiles
+
+INDEX_SUFFIX = '.variants.json'
+
+def index_path(output_path):
+    return os.path.splitext(output_path)[0] + INDEX_SUFFIX
+
+def variant_seed(seed, index):
+    """Seed of one variant, stable for a given library seed"""
+    return seed + index * 7919
+
+def mesh_bounds(mesh):
+    """Local bounds in glTF coordinates (Y-up) as (min, max) lists"""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    co = co.reshape(-1, 3)
+    if len(co) == 0:
+        return [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]
+    # Blender (x, y, z) → glTF (x, z, -y)
+    gltf = np.stack([co[:, 0], co[:, 2], -co[:, 1]], axis=1)
+    return [round(float(v), 5) for v in gltf.min(axis=0)], [round(float(v), 5) for v in gltf.max(axis=0)]
+
+def mesh_triangles(mesh):
+    """Exported triangle count (n-gons triangulate into n - 2 triangles)"""
+    return len(mesh.loops) - 2 * len(mesh.polygons)
+
+def new_empty(name):
+    empty = bpy.data.objects.new(name, None)
+    bpy.context.scene.collection.objects.link(empty)
+    return empty
+
+def variant_record(index, obj, seed):
+    """Index record of one variant object"""
+    bounds_min, bounds_max = mesh_bounds(obj.data)
+    return {
+        'index': index,
+        'node': obj.name,
+        'mesh': obj.data.name,
+        'seed': seed,
+        'triangles': mesh_triangles(obj.data),
+        'bounds': {'min': bounds_min, 'max': bounds_max},
+    }
+
+def assemble_library(name, variants, scatter=0, radius=20.0, seed=0):
+    """
+    Parent the variant objects under one empty and optionally scatter instances
+    variants: [(object, seed), ...], each object at the origin with its own mesh
+    Returns the index records of the variants
+    """
+    root = new_empty(f"{name}_variants")
+    records = []
+    for index, (obj, obj_seed) in enumerate(variants):
+        obj.parent = root
+        records.append(variant_record(index, obj, obj_seed))
+
+    if scatter > 0:
+        # Instances share the variant meshes - children of one empty, so they export
+        # as EXT_mesh_gpu_instancing
+        instances = new_empty(f"{name}_instances")
+        rng = random.Random(seed)
+        for index in range(scatter):
+            source, _ = variants[rng.randrange(len(variants))]
+            instance = bpy.data.objects.new(f"{source.name}_i{index}", source.data)
+            bpy.context.scene.collection.objects.link(instance)
+            instance.parent = instances
+            distance = radius * math.sqrt(rng.random())
+            angle = rng.uniform(0, 2 * math.pi)
+            instance.location = (distance * math.cos(angle), distance * math.sin(angle), 0.0)
+            instance.rotation_euler = (0.0, 0.0, rng.uniform(0, 2 * math.pi))
+            instance.scale = (rng.uniform(0.85, 1.15),) * 3
+    return records
+
+def export_library(output_path, profile=export_profiles.DEFAULT_PROFILE):
+    """Export the whole library scene, shared meshes as GPU instances"""
+    export_profiles.export_gltf(output_path, profile, use_selection=False, export_gpu_instances=True)
+
+def write_index(output_path, asset, records, **extra):
+    """Write the variant index next to output_path"""
+    path = index_path(output_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'asset': asset, **extra, 'variants': records}, f, indent=2)
+    return path
+
+def remove_index(output_path):
+    """Drop the index of an earlier library export to the same path"""
+    if os.path.exists(index_path(output_path)):
+        os.remove(index_path(output_path))
@@ -76,18 +76,27 @@ const MODELS_TO_GENERATE = [
     { type: 'item' as const, id: 1933, name: 'pot_of_flour', description: 'Pot of Flour' },
 ];
 
+/**
+ * True when the exact output file is on disk. Catalog rows are not enough: a row can outlive
+ * its file, and the entity's rows also cover hybrid/ and other outputs than public/models/<name>.glb
+ */
+async function exists(outputPath: string) {
+    try {
+        await fs.access(outputPath);
+        return true;
+    } catch {
+        return false;
+    }
+}
+
 async function generateModel(config: typeof MODELS_TO_GENERATE[0], era: number = 0) {
     console.log(`\n🔨 Generating: ${config.description} (${config.name}.glb)`);
 
     const outputPath = path.join(process.cwd(), 'public', 'models', `${config.name}.glb`);
 
-    // Check if already exists
-    try {
-        await fs.access(outputPath);
+    if (await exists(outputPath)) {
         console.log(`   ✓ Already exists, skipping...`);
         return { success: true, cached: true };
-    } catch {
-        // Doesn't exist, generate it
     }
 
     try {
@@ -95,7 +104,9 @@ async function generateModel(config: typeof MODELS_TO_GENERATE[0], era: number =
             entityType: config.type,
             entityId: config.id,
             era: era,
-            outputName: config.name
+            outputName: config.name,
+            // Prebuilds yield to live requests on the shared scheduler
+            priority: 'bulk'
         });
 
         // Copy from hybrid folder to public/models
@@ -6,11 +6,20 @@
 
 // const execAsync = promisify(exec);
 
+import { blenderScheduler, JobPriority } from './blenderScheduler';
+
+// Seed of requests that do not pick one, so the same request always maps to the same cached model
+const DEFAULT_SEED = 1;
+
 interface BlenderGenerateOptions {
     type: 'tree' | 'rock' | 'npc' | 'item';
     variant: string;
     complexity?: number;
     seed?: number;
+    /** Seeded variants written into one library GLB (plus a .variants.json bounds index) */
+    variants?: number;
+    /** Scheduler class: live gameplay requests are interactive, prebuilds bulk */
+    priority?: JobPriority;
 }
 
 interface BlenderResult {
@@ -72,87 +81,137 @@ export class BlenderGenerator {
             return { modelPath: '' };
         }
 
-        const { exec } = await import('child_process');
-        const { promisify } = await import('util');
         const path = (await import('path')).default;
         const fs = (await import('fs/promises')).default;
-        const execAsync = promisify(exec);
 
-        const { type, variant, complexity = 5, seed = Date.now() } = options;
+        // Fixed default seed: identical requests hit the asset cache instead of regenerating
+        const { type, variant, complexity = 5, seed = DEFAULT_SEED, variants = 1, priority = 'interactive' } = options;
 
         console.log(`[Blender] Generating ${type}:${variant}...`);
 
         const cwd = process.cwd();
-        const scriptsPath = path.join(cwd, 'blender-scripts');
         const outputPath = path.join(cwd, 'public', 'models', 'generated');
 
         // Ensure output directory exists
         await fs.mkdir(outputPath, { recursive: true });
 
-        // Determine which Python script to use
-        const scriptName = `generate_${type}.py`;
-        const scriptPath = path.join(scriptsPath, scriptName);
-
-        // Output file name
-        const outputFileName = `${type}_${variant}_${seed}.glb`;
+        // Output file name (libraries are named by species and seed, so they are reused)
+        const outputFileName = variants > 1
+            ? `${type}_${variant}_library_${variants}_${seed}.glb`
+            : `${type}_${variant}_${seed}.glb`;
         const outputFilePath = path.join(outputPath, outputFileName);
 
-        // Build Blender command
-        const command = [
-            this.blenderPath,
-            '--background',
-            '--python', scriptPath,
-            '--',
-            '--type', variant,
-            '--complexity', complexity.toString(),
-            '--seed', seed.toString(),
-            '--output', outputFilePath
-        ].join(' ');
-
-        try {
-            const { stdout, stderr } = await execAsync(command, {
-                timeout: 30000, // 30 second timeout
-            });
-
-            if (stderr && !stderr.includes('Warning')) {
-                console.error('[Blender] Stderr:', stderr);
+        if (variants > 1) {
+            try {
+                await fs.access(outputFilePath);
+                return { modelPath: `/models/generated/${outputFileName}` };
+            } catch {
+                // Not generated yet
             }
+        }
 
-            console.log('[Blender] Generated:', outputFilePath);
-
-            return {
-                modelPath: `/models/generated/${outputFileName}`,
-            };
-        } catch (error: any) {
-            console.error('[Blender] Generation failed:', error.message);
-            throw new Error(`Blender generation failed: ${error.message}`);
+        // Queued on the shared scheduler: identical requests (same type, seed...) share one run
+        const result = await blenderScheduler.submit(`generate_${type}`, {
+            type: variant,
+            complexity,
+            seed,
+            variants: variants > 1 ? variants : undefined,
+            output: outputFilePath,
+        }, priority, this.blenderPath);
+
+        if (!result.ok) {
+            console.error('[Blender] Generation failed:', result.error);
+            throw new Error(`Blender generation failed: ${result.error}`);
         }
+
+        console.log(`[Blender] Generated: ${outputFilePath} (queued ${result.queue_time}s${result.coalesced ? ', shared' : ''})`);
+
+        return {
+            modelPath: `/models/generated/${outputFileName}`,
+        };
     }
 
     /**
-     * Generate a tree model
+     * Generate (or reuse) the variant library of a tree species
+     * One GLB holds every variant with shared meshes, spawned resources pick a variant node
      */
     async generateTree(treeType: 'oak' | 'willow' | 'yew' | 'maple'): Promise<string> {
         const result = await this.generateModel({
             type: 'tree',
             variant: treeType,
             complexity: 7,
+            seed: DEFAULT_SEED,
+            variants: 8,
         });
         return result.modelPath;
     }
 
     /**
-     * Generate a rock/ore node model
+     * Generate (or reuse) the variant library of a rock/ore node
+     * One GLB holds every variant with shared meshes, spawned nodes pick a variant node
      */
     async generateRock(rockType: 'copper' | 'iron' | 'coal' | 'gold'): Promise<string> {
         const result = await this.generateModel({
             type: 'rock',
             variant: rockType,
             complexity: 5,
+            seed: DEFAULT_SEED,
+            variants: 6,
         });
         return result.modelPath;
     }
 
+    /**
+     * Generate many NPC or item variants in one Blender launch
+     * Each entry is a template type ("goblin", "rune_sword"); every variant gets its own GLB
+     */
+    async generateBatch(type: 'npc' | 'item', variants: string[], complexity = type === 'npc' ? 8 : 4, seed = DEFAULT_SEED,
+                        priority: JobPriority = 'bulk'): Promise<string[]> {
+        if (typeof window !== 'undefined') {
+            console.warn('[Blender] Cannot generate models in browser');
+            return [];
+        }
+
+        const path = (await import('path')).default;
+        const fs = (await import('fs/promises')).default;
+        const os = (await import('os')).default;
+        const { createHash, randomUUID } = await import('crypto');
+
+        console.log(`[Blender] Generating ${variants.length} ${type} variants...`);
+
+        const cwd = process.cwd();
+        const outputPath = path.join(cwd, 'public', 'models', 'generated');
+        await fs.mkdir(outputPath, { recursive: true });
+
+        // Outputs are named by seed and variant list, so different lists never share files
+        const listHash = createHash('sha256').update(JSON.stringify(variants)).digest('hex').slice(0, 12);
+        const stem = `${type}_batch_${seed}_${listHash}`;
+        // The variant list goes through a file (one per call), no shell quoting of JSON;
+        // the cache and scheduler key it by content, not by this path
+        const batchFilePath = path.join(os.tmpdir(), `${stem}.${randomUUID()}.json`);
+        await fs.writeFile(batchFilePath, JSON.stringify(variants));
+
+        try {
+            const result = await blenderScheduler.submit(`generate_${type}`, {
+                complexity,
+                seed,
+                batch: batchFilePath,
+                separate: variants.length > 1,
+                output: path.join(outputPath, `${stem}.glb`),
+            }, priority, this.blenderPath);
+            if (!result.ok) {
+                throw new Error(result.error);
+            }
+            return variants.map((_, index) =>
+                `/models/generated/${variants.length > 1 ? `${stem}_v${index}` : stem}.glb`);
+        } catch (error: any) {
+            console.error('[Blender] Batch generation failed:', error.message);
+            throw new Error(`Blender generation failed: ${error.message}`);
+        } finally {
+            await fs.rm(batchFilePath, { force: true });
+        }
+    }
+
     /**
      * Generate an NPC model
      */
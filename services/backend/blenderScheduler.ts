@@ -0,0 +1,163 @@
+/**
+ * Client of blender-scripts/job_scheduler.py
+ *
+ * Every Blender job of the game server and of bulk scripts goes through one scheduler
+ * process (TCP, one JSON line per request), so live requests start before queued bulk
+ * work and identical requests share one run. The scheduler is started on first use
+ * when nothing listens on BLENDER_SCHEDULER (default 127.0.0.1:8766).
+ */
+
+export type JobPriority = 'interactive' | 'bulk';
+
+export interface SchedulerResult {
+    id: string;
+    ok: boolean;
+    error?: string;
+    priority: JobPriority;
+    /** Answered by another request's run */
+    coalesced: boolean;
+    /** Seconds between submit and start */
+    queue_time: number;
+    wall_time?: number;
+    cached?: boolean;
+    output?: unknown;
+    stats?: Record<string, unknown>;
+}
+
+const DEFAULT_ADDRESS = '127.0.0.1:8766';
+const START_TIMEOUT_MS = 15000;
+
+export class BlenderScheduler {
+    private address: string;
+    private blenderPath: string | undefined;
+    private connection: Promise<import('net').Socket> | null = null;
+    private pending = new Map<string, (result: SchedulerResult) => void>();
+    private counter = 0;
+    private buffer = '';
+
+    constructor(address?: string) {
+        this.address = address ||
+            (typeof process !== 'undefined' && process.env?.BLENDER_SCHEDULER) || DEFAULT_ADDRESS;
+    }
+
+    /**
+     * Run one blender-scripts job, resolves with its result record
+     * args: the script's flags as { name: value } (true for bare flags)
+     * blenderPath: Blender the scheduler runs, if this request has to start it
+     */
+    async submit(script: string, args: Record<string, unknown>, priority: JobPriority = 'interactive',
+                 blenderPath?: string): Promise<SchedulerResult> {
+        this.blenderPath = this.blenderPath || blenderPath;
+        return this.request({ script, priority, args });
+    }
+
+    /** Queue depth, running jobs and per-class queue times */
+    async stats(): Promise<Record<string, unknown>> {
+        const result = await this.request({ command: 'stats' });
+        return result.stats ?? {};
+    }
+
+    private async request(body: Record<string, unknown>): Promise<SchedulerResult> {
+        if (typeof window !== 'undefined') {
+            throw new Error('[Scheduler] Cannot run Blender jobs in the browser');
+        }
+        const socket = await this.connect();
+        const id = `${process.pid}-${++this.counter}`;
+        // The connection only keeps the process alive while requests wait
+        socket.ref();
+        return new Promise(resolve => {
+            this.pending.set(id, resolve);
+            socket.write(JSON.stringify({ id, ...body }) + '\n');
+        });
+    }
+
+    private connect(): Promise<import('net').Socket> {
+        if (!this.connection) {
+            this.connection = this.open().catch(error => {
+                this.connection = null;
+                throw error;
+            });
+        }
+        return this.connection;
+    }
+
+    private async open(): Promise<import('net').Socket> {
+        const net = await import('net');
+        const [host, port] = this.address.split(':');
+        const tryConnect = () => new Promise<import('net').Socket>((resolve, reject) => {
+            const socket = net.createConnection({ host, port: Number(port) }, () => resolve(socket));
+            socket.once('error', reject);
+        });
+
+        let socket: import('net').Socket;
+        try {
+            socket = await tryConnect();
+        } catch {
+            await this.startScheduler();
+            const deadline = Date.now() + START_TIMEOUT_MS;
+            for (;;) {
+                try {
+                    socket = await tryConnect();
+                    break;
+                } catch (error) {
+                    if (Date.now() > deadline) throw new Error(`[Scheduler] Not reachable on ${this.address}: ${error}`);
+                    await new Promise(r => setTimeout(r, 200));
+                }
+            }
+        }
+
+        socket.setEncoding('utf-8');
+        socket.on('data', (chunk: string) => {
+            this.receive(chunk);
+            if (this.pending.size === 0) socket.unref();
+        });
+        socket.on('close', () => this.fail('Scheduler connection closed'));
+        socket.on('error', error => this.fail(error.message));
+        return socket;
+    }
+
+    /** Start job_scheduler.py in the background, it outlives this process and serves every client */
+    private async startScheduler() {
+        const { spawn } = await import('child_process');
+        const path = (await import('path')).default;
+        const script = path.join(process.cwd(), 'blender-scripts', 'job_scheduler.py');
+        console.log(`[Scheduler] Starting ${script} on ${this.address}`);
+        const args = [script, '--socket', this.address, '--cache'];
+        if (this.blenderPath) args.push('--blender', this.blenderPath);
+        const child = spawn(process.env.PYTHON || 'python', args, {
+            detached: true,
+            stdio: 'ignore',
+            env: process.env,
+        });
+        child.unref();
+    }
+
+    private receive(chunk: string) {
+        this.buffer += chunk;
+        let newline;
+        while ((newline = this.buffer.indexOf('\n')) >= 0) {
+            const line = this.buffer.slice(0, newline).trim();
+            this.buffer = this.buffer.slice(newline + 1);
+            if (!line) continue;
+            const result = JSON.parse(line) as SchedulerResult;
+            const resolve = this.pending.get(String(result.id));
+            if (resolve) {
+                this.pending.delete(String(result.id));
+                resolve(result);
+            }
+        }
+    }
+
+    /** Answer every waiting request with an error, the next request reconnects */
+    private fail(message: string) {
+        this.connection = null;
+        this.buffer = '';
+        for (const [id, resolve] of this.pending) {
+            resolve({ id, ok: false, error: message, priority: 'interactive', coalesced: false, queue_time: 0 });
+        }
+        this.pending.clear();
+    }
+}
+
+// One connection per process
+export const blenderScheduler = new BlenderScheduler();
@@ -6,6 +6,8 @@
 
 // const execAsync = promisify(exec);
 
+import { blenderScheduler, JobPriority } from './blenderScheduler';
+
 // Polyfill for RSMV sqlite3 loader in Node environment
 if (typeof globalThis !== 'undefined' && typeof (globalThis as any).__non_webpack_require__ === 'undefined') {
     (globalThis as any).__non_webpack_require__ = require;
@@ -61,6 +63,9 @@ export class HybridContentGenerator {
             rescale?: number;
         };
         outputName: string;
+        keepBaseComposite?: boolean;
+        /** Scheduler class: 'interactive' (default) for live requests, 'bulk' for prebuilds */
+        priority?: JobPriority;
     }): Promise<{
         modelPath: string;
         config: RSMVEntityConfig;
@@ -86,21 +91,19 @@ export class HybridContentGenerator {
             (entityConfig.models || []).map(id => this.fetchModelFromRSMV(id))
         );
 
-        // Step 3: Composite in Blender with Jagex colors/materials
-        const compositePath = await this.compositeInBlender({
+        // Step 3+4: Composite with Jagex colors/materials and evolve in one Blender pass
+        const evolvedPath = await this.compositeAndEvolveInBlender({
             modelPaths,
             colorReplacements: entityConfig.color_replacements || [],
             materialReplacements: entityConfig.material_replacements || [],
             additionalModifications: options.modifications,
-            outputName: `${options.outputName}_base`
-        });
-
-        // Step 4: Evolution transformation
-        const evolvedPath = await this.applyEvolutionTransform(
-            compositePath,
             era,
-            options.outputName
-        );
+            assetClass: options.entityType,
+            entityId: options.entityId,
+            outputName: options.outputName,
+            baseOutputName: options.keepBaseComposite ? `${options.outputName}_base` : undefined,
+            priority: options.priority ?? 'interactive'
+        });
 
         return {
             modelPath: evolvedPath,
@@ -162,7 +165,7 @@ export class HybridContentGenerator {
     }
 
     /**
-     * Fetch single model from RSMV and export as OBJ
+     * Fetch single model from RSMV and write it as an .rsmesh (binary handoff to Blender)
      */
     private async fetchModelFromRSMV(modelId: number): Promise<string> {
         if (typeof window !== 'undefined') return '';
@@ -175,81 +178,119 @@ export class HybridContentGenerator {
         // Use the already-initialized cache
         const modelData = await this.rsmvCache.getModelData(modelId);
 
-        // Export to OBJ
-        const objContent = this.modelDataToObj(modelData, `model_${modelId}`);
-
-        const tempPath = path.join(outputPath, 'temp', `model_${modelId}.obj`);
+        const tempPath = path.join(outputPath, 'temp', `model_${modelId}.rsmesh`);
         await fs.mkdir(path.dirname(tempPath), { recursive: true });
-        await fs.writeFile(tempPath, objContent);
+        await fs.writeFile(tempPath, this.modelDataToRsmesh(modelData));
 
         return tempPath;
     }
 
     /**
-     * Convert RSMV ModelData to OBJ format string
+     * Convert RSMV ModelData to .rsmesh bytes (layout in blender-scripts/rsmesh.py):
+     * 16-byte header, then little-endian positions, normals, UVs, indices, face colors
+     * and face material ids, each 4-byte aligned. All meshes are merged into one.
      */
-    private modelDataToObj(modelData: any, objectName: string): string {
-        let obj = `# RSMV Model Export: ${objectName}\n`;
-        obj += `o ${objectName}\n`;
-
-        let vertexOffset = 1;
-
-        // Iterate through meshes
-        for (const mesh of modelData.meshes) {
-            const pos = mesh.attributes.pos;
-            const normals = mesh.attributes.normals;
-            const uvs = mesh.attributes.texuvs;
-            const indices = mesh.indices;
-
-            // Write Vertices
-            for (let i = 0; i < pos.count; i++) {
-                obj += `v ${pos.getX(i)} ${pos.getY(i)} ${pos.getZ(i)}\n`;
-            }
+    private modelDataToRsmesh(modelData: any): Uint8Array {
+        const meshes: any[] = modelData.meshes;
+        const vertexCount = meshes.reduce((n, mesh) => n + mesh.attributes.pos.count, 0);
+        const faceCount = meshes.reduce((n, mesh) => n + Math.floor(mesh.indices.count / 3), 0);
+        // Optional buffers are written only when every mesh has them
+        const hasNormals = meshes.length > 0 && meshes.every(mesh => mesh.attributes.normals);
+        const hasUvs = meshes.length > 0 && meshes.every(mesh => mesh.attributes.texuvs);
+        const hasColors = meshes.some(mesh => mesh.attributes.color);
+        const flags = (hasNormals ? 1 : 0) | (hasUvs ? 2 : 0) | (hasColors ? 4 : 0) | 8;
+
+        const align = (n: number) => (n + 3) & ~3;
+        const sizes = [
+            vertexCount * 12,
+            hasNormals ? vertexCount * 12 : 0,
+            hasUvs ? vertexCount * 8 : 0,
+            faceCount * 12,
+            hasColors ? faceCount * 4 : 0,
+            faceCount * 2,
+        ];
+        const offsets: number[] = [];
+        let size = 16;
+        for (const bytes of sizes) {
+            offsets.push(size);
+            size += align(bytes);
+        }
 
-            // Write UVs
-            if (uvs) {
-                for (let i = 0; i < uvs.count; i++) {
-                    obj += `vt ${uvs.getX(i)} ${uvs.getY(i)}\n`;
-                }
+        // Little-endian typed arrays over one buffer (every JS engine we target is little-endian)
+        const buffer = new ArrayBuffer(size);
+        const header = new DataView(buffer, 0, 16);
+        header.setUint8(0, 0x52); header.setUint8(1, 0x53); header.setUint8(2, 0x4d); header.setUint8(3, 0x53); // "RSMS"
+        header.setUint16(4, 1, true);
+        header.setUint16(6, flags, true);
+        header.setUint32(8, vertexCount, true);
+        header.setUint32(12, faceCount, true);
+
+        const positions = new Float32Array(buffer, offsets[0], vertexCount * 3);
+        const normals = hasNormals ? new Float32Array(buffer, offsets[1], vertexCount * 3) : null;
+        const uvs = hasUvs ? new Float32Array(buffer, offsets[2], vertexCount * 2) : null;
+        const indices = new Uint32Array(buffer, offsets[3], faceCount * 3);
+        const colors = hasColors ? new Uint8Array(buffer, offsets[4], faceCount * 4) : null;
+        const materials = new Uint16Array(buffer, offsets[5], faceCount);
+
+        // Plain float attributes are copied in one call, anything else component by component
+        const copyAttribute = (attribute: any, target: Float32Array, vertexOffset: number, itemSize: number) => {
+            const start = vertexOffset * itemSize;
+            if (attribute.array instanceof Float32Array && attribute.itemSize === itemSize &&
+                !attribute.isInterleavedBufferAttribute && !attribute.normalized) {
+                target.set(attribute.array.subarray(0, attribute.count * itemSize), start);
+                return;
+            }
+            for (let i = 0; i < attribute.count; i++) {
+                target[start + i * itemSize] = attribute.getX(i);
+                target[start + i * itemSize + 1] = attribute.getY(i);
+                if (itemSize === 3) target[start + i * itemSize + 2] = attribute.getZ(i);
             }
+        };
 
-            // Write Normals
-            if (normals) {
-                for (let i = 0; i < normals.count; i++) {
-                    obj += `vn ${normals.getX(i)} ${normals.getY(i)} ${normals.getZ(i)}\n`;
-                }
+        let vertexOffset = 0;
+        let faceOffset = 0;
+        for (const mesh of meshes) {
+            const { pos, normals: meshNormals, texuvs, color } = mesh.attributes;
+            copyAttribute(pos, positions, vertexOffset, 3);
+            if (normals) copyAttribute(meshNormals, normals, vertexOffset, 3);
+            if (uvs) copyAttribute(texuvs, uvs, vertexOffset, 2);
+
+            const meshFaces = Math.floor(mesh.indices.count / 3);
+            const source = mesh.indices.array;
+            for (let i = 0; i < meshFaces * 3; i++) {
+                indices[faceOffset * 3 + i] = source[i] + vertexOffset;
             }
 
-            // Write Faces
-            // OBJ indices are 1-based
-            for (let i = 0; i < indices.count; i += 3) {
-                const i1 = indices.getX(i) + vertexOffset;
-                const i2 = indices.getX(i + 1) + vertexOffset;
-                const i3 = indices.getX(i + 2) + vertexOffset;
-
-                // Format: v/vt/vn
-                // Assuming simplified export where indices match for v, vt, vn
-                if (uvs && normals) {
-                    obj += `f ${i1}/${i1}/${i1} ${i2}/${i2}/${i2} ${i3}/${i3}/${i3}\n`;
-                } else if (uvs) {
-                    obj += `f ${i1}/${i1} ${i2}/${i2} ${i3}/${i3}\n`;
-                } else if (normals) {
-                    obj += `f ${i1}//${i1} ${i2}//${i2} ${i3}//${i3}\n`;
-                } else {
-                    obj += `f ${i1} ${i2} ${i3}\n`;
+            // RSMV repeats the face color on each corner: take the first one
+            if (colors) {
+                for (let f = 0; f < meshFaces; f++) {
+                    const out = (faceOffset + f) * 4;
+                    if (!color) {
+                        colors.fill(255, out, out + 4);
+                        continue;
+                    }
+                    const corner = source[f * 3];
+                    colors[out] = Math.round(color.getX(corner) * 255);
+                    colors[out + 1] = Math.round(color.getY(corner) * 255);
+                    colors[out + 2] = Math.round(color.getZ(corner) * 255);
+                    colors[out + 3] = color.itemSize === 4 ? Math.round(color.getW(corner) * 255) : 255;
                 }
             }
+            materials.fill(mesh.materialId >= 0 ? mesh.materialId : 0xffff, faceOffset, faceOffset + meshFaces);
 
             vertexOffset += pos.count;
+            faceOffset += meshFaces;
         }
 
-        return obj;
+        return new Uint8Array(buffer);
     }
 
     /**
-     * Composite multiple models with Jagex color/material replacements
+     * Composite multiple models with Jagex color/material replacements,
+     * then apply the evolution transformation in the same Blender scene
+     * (generate_entity.py - no intermediate GLB round-trip)
      */
-    private async compositeInBlender(options: {
+    private async compositeAndEvolveInBlender(options: {
         modelPaths: string[];
         colorReplacements: [number, number][];
         materialReplacements: [number, number][];
@@ -257,15 +298,17 @@ export class HybridContentGenerator {
             additionalColorShift?: number;
             rescale?: number;
         };
+        era: number;
+        assetClass: 'npc' | 'item' | 'loc' | 'player';
+        entityId: number;
         outputName: string;
+        baseOutputName?: string;
+        priority: JobPriority;
     }): Promise<string> {
         if (typeof window !== 'undefined') return '';
 
-        const { exec } = await import('child_process');
-        const { promisify } = await import('util');
         const path = (await import('path')).default;
         const fs = (await import('fs/promises')).default;
-        const execAsync = promisify(exec);
 
         const cwd = process.cwd();
         const outputPath = path.join(cwd, 'public', 'models', 'hybrid');
@@ -273,77 +316,36 @@ export class HybridContentGenerator {
         const outputFile = path.join(outputPath, `${options.outputName}.glb`);
         await fs.mkdir(outputPath, { recursive: true });
 
-        const scriptPath = path.join(cwd, 'blender-scripts', 'composite_entity.py');
-
-        const command = [
-            this.blenderPath,
-            '--background',
-            '--python', scriptPath,
-            '--',
-            '--models', options.modelPaths.join(','),
-            '--color-replacements', JSON.stringify(options.colorReplacements),
-            '--material-replacements', JSON.stringify(options.materialReplacements),
-            '--additional-hue-shift', options.additionalModifications?.additionalColorShift || 0,
-            '--rescale', options.additionalModifications?.rescale || 1.0,
-            '--output', outputFile
-        ].join(' ');
-
-        try {
-            await execAsync(command, { timeout: 60000 });
-            return `/models/hybrid/${options.outputName}.glb`;
-        } catch (error: any) {
-            console.error('[Hybrid] Blender composite failed:', error);
-            throw error;
-        }
-    }
+        // Flags of generate_entity.py, lists are sent as JSON
+        const args: Record<string, unknown> = {
+            models: options.modelPaths.join(','),
+            'color-replacements': options.colorReplacements,
+            'material-replacements': options.materialReplacements,
+            'additional-hue-shift': options.additionalModifications?.additionalColorShift || 0,
+            rescale: options.additionalModifications?.rescale || 1.0,
+            era: options.era,
+            'asset-class': options.assetClass,
+            // Catalog row key (asset_catalog.py), lets callers look the model up by entity and era
+            'entity-id': options.entityId,
+            // Classic models are flat per-face colors: one shared vertex-color material per model
+            'vertex-colors': this.forceClassicModels,
+            output: outputFile,
+        };
 
-    /**
-     * Apply evolution transformation
-     * Smooths geometry and adds god visuals for high eras
-     */
-    private async applyEvolutionTransform(
-        baseModelPath: string,
-        era: number,
-        outputName: string
-    ): Promise<string> {
-        if (era === 0) {
-            return baseModelPath;
+        // Optional cache of the un-evolved composite
+        if (options.baseOutputName) {
+            args['base-output'] = path.join(outputPath, `${options.baseOutputName}.glb`);
         }
-        if (typeof window !== 'undefined') return baseModelPath;
 
-        const { exec } = await import('child_process');
-        const { promisify } = await import('util');
-        const path = (await import('path')).default;
-        const execAsync = promisify(exec);
-
-        const cwd = process.cwd();
-        const outputPath = path.join(cwd, 'public', 'models', 'hybrid');
-
-        const outputFile = path.join(outputPath, `${outputName}.glb`);
-        const scriptPath = path.join(cwd, 'blender-scripts', 'evolution_transformer.py');
-
-        const absoluteBasePath = path.isAbsolute(baseModelPath)
-            ? baseModelPath
-            : path.join(outputPath, baseModelPath);
-
-        const command = [
-            this.blenderPath,
-            '--background',
-            '--python', scriptPath,
-            '--',
-            '--input', absoluteBasePath,
-            '--era', era.toString(),
-            '--output', outputFile
-        ].join(' ');
-
-        try {
-            await execAsync(command, { timeout: 60000 });
-            console.log(`[Evolution] Transformed to Era ${era}: ${this.getEraName(era)}`);
-            return `/models/hybrid/${outputName}.glb`;
-        } catch (error: any) {
-            console.error('[Evolution] Transform failed:', error);
-            return baseModelPath;
+        const result = await blenderScheduler.submit('generate_entity', args, options.priority, this.blenderPath);
+        if (!result.ok) {
+            console.error('[Hybrid] Blender generation failed:', result.error);
+            throw new Error(`Blender generation failed: ${result.error}`);
+        }
+        if (options.era > 0) {
+            console.log(`[Evolution] Transformed to Era ${options.era}: ${this.getEraName(options.era)}`);
         }
+        return `/models/hybrid/${options.outputName}.glb`;
     }
 
     /**
@@ -0,0 +1,131 @@
+// src/services/assets/AssetCatalog.ts
+
+/**
+ * Build-time catalog of the generated models (public/models/catalog.json).
+ * Written by blender-scripts/asset_catalog.py as {columns, rows}: one row per GLB with
+ * its entity, era, LOD level, counts, size and bounds. Lookups never touch the filesystem.
+ */
+export interface CatalogEntry {
+    path: string;        // relative to /models
+    entity_type: string; // npc, item, loc, tree, rock, model...
+    entity_id: string;
+    era: number;
+    lod: number;
+    variant: number | null;
+    profile: string | null;
+    compression: string | null;
+    source_hash: string | null;
+    script: string | null;
+    triangles: number;
+    vertices: number;
+    materials: number;
+    bytes: number;
+    min_x: number | null; min_y: number | null; min_z: number | null;
+    max_x: number | null; max_y: number | null; max_z: number | null;
+    center_x: number | null; center_y: number | null; center_z: number | null;
+    radius: number | null;
+}
+
+export interface CatalogData {
+    version: number;
+    generated?: number;
+    columns: string[];
+    rows: unknown[][];
+}
+
+export const CATALOG_URL = '/models/catalog.json';
+
+const entityKey = (entityType: string, entityId: string | number, era: number) =>
+    `${entityType}:${entityId}:${era}`;
+
+export class AssetCatalog {
+    readonly entries: CatalogEntry[];
+    private byPath = new Map<string, CatalogEntry>();
+    // Base (LOD0) entries per entity and era, variants in index order
+    private byEntity = new Map<string, CatalogEntry[]>();
+
+    constructor(data?: CatalogData | null) {
+        const columns = data?.columns ?? [];
+        this.entries = (data?.rows ?? []).map(row => {
+            const entry: Record<string, unknown> = {};
+            columns.forEach((column, i) => { entry[column] = row[i]; });
+            return entry as unknown as CatalogEntry;
+        });
+        for (const entry of this.entries) {
+            this.byPath.set(entry.path, entry);
+            if (entry.lod !== 0) continue;
+            const key = entityKey(entry.entity_type, entry.entity_id, entry.era);
+            const list = this.byEntity.get(key) ?? [];
+            list.push(entry);
+            list.sort((a, b) => (a.variant ?? -1) - (b.variant ?? -1));
+            this.byEntity.set(key, list);
+        }
+    }
+
+    get size(): number {
+        return this.entries.length;
+    }
+
+    /** Base models of an entity at one era (several when variants were exported separately) */
+    find(entityType: string, entityId: string | number, era = 0): CatalogEntry[] {
+        return this.byEntity.get(entityKey(entityType, entityId, era)) ?? [];
+    }
+
+    /** Do we have entity X at era N? */
+    has(entityType: string, entityId: string | number, era = 0): boolean {
+        return this.find(entityType, entityId, era).length > 0;
+    }
+
+    /** Entry of a file relative to /models (e.g. "npcs/goblin.glb") */
+    get(path: string): CatalogEntry | undefined {
+        return this.byPath.get(path.replace(/^\/?models\//, '').replace(/^\//, ''));
+    }
+
+    /** Eras the entity has a model for, ascending */
+    eras(entityType: string, entityId: string | number): number[] {
+        const eras = new Set<number>();
+        for (const entry of this.entries) {
+            if (entry.lod === 0 && entry.entity_type === entityType && entry.entity_id === String(entityId)) {
+                eras.add(entry.era);
+            }
+        }
+        return [...eras].sort((a, b) => a - b);
+    }
+
+    /** LOD chain of one base model, LOD0 first */
+    lods(path: string): CatalogEntry[] {
+        const base = this.get(path);
+        if (!base) return [];
+        const stem = base.path.replace(/\.glb$/, '');
+        const levels = this.entries.filter(e => e.path.startsWith(`${stem}_lod`) && e.lod > 0);
+        return [base, ...levels.sort((a, b) => a.lod - b.lod)];
+    }
+
+    /**
+     * URLs to preload, smallest first, until maxBytes is spent
+     * filter: e.g. entry => entry.era === currentEra
+     */
+    preloadList(maxBytes: number, filter: (entry: CatalogEntry) => boolean = e => e.lod === 0): string[] {
+        const urls: string[] = [];
+        let total = 0;
+        for (const entry of this.entries.filter(filter).sort((a, b) => a.bytes - b.bytes)) {
+            if (total + entry.bytes > maxBytes) break;
+            total += entry.bytes;
+            urls.push(`/models/${entry.path}`);
+        }
+        return urls;
+    }
+}
+
+let catalogPromise: Promise<AssetCatalog> | null = null;
+
+/** Fetch the catalog once; an empty catalog when it has not been built */
+export function loadAssetCatalog(url = CATALOG_URL): Promise<AssetCatalog> {
+    if (!catalogPromise) {
+        catalogPromise = fetch(url)
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null)
+            .then(data => new AssetCatalog(data));
+    }
+    return catalogPromise;
+}